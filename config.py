@@ -46,7 +46,22 @@ VISUALIZATION_CONFIG = {
     'style': 'seaborn-v0_8',
     'color_palette': 'Set2',
     'font_size': 12,
-    'title_size': 16
+    'title_size': 16,
+    'parallel_rendering': False,  # renderizar cada gráfico em um processo próprio
+    'render_workers': None,       # None = um processo por gráfico (limitado às CPUs)
+    'max_points_per_trace': 2000, # séries maiores são reduzidas com LTTB
+    'webgl_threshold': 1000,      # traços com mais pontos usam Scattergl (WebGL)
+    'plotlyjs': 'directory',      # HTML referencia um plotly.min.js compartilhado na pasta
+    'density_threshold': 20000,   # dispersões maiores viram raster de densidade
+    'density_bins': (400, 300)    # resolução do raster (colunas, linhas)
+}
+
+# Cache de gráficos renderizados (endereçado pelo hash dos dados de entrada)
+RENDER_CACHE_CONFIG = {
+    'enabled': True,
+    'cache_dir': '.render_cache',
+    'max_bytes': 200 * 1024 * 1024,  # limite do diretório (LRU)
+    'version': 1                     # incrementar ao alterar o código dos gráficos
 }
 
 # Configurações do dashboard
@@ -54,6 +69,178 @@ DASHBOARD_CONFIG = {
     'title': 'Dashboard de Marketing Digital - Mídias Sociais',
     'theme': 'BOOTSTRAP',
     'port': 8050,
-    'debug': True
+    'debug': True,
+    'max_session_views': 500,  # sessões com a fatia filtrada mantida no servidor
+    'chart_width': 1200,  # largura (px) assumida até o navegador informar a sua
+    'min_px_per_point': 4,  # acima de largura/4 pontos o gráfico principal passa a semanal/mensal
+    'filter_mode': 'auto',  # 'server', 'client' (filtros no navegador) ou 'auto'
+    'clientside_max_rows': 20000,  # no modo 'auto', filtrar no navegador até este número de linhas
+    'live_source': None,  # CSV acrescido com novas linhas diárias (None = sem atualização ao vivo)
+    'live_interval': 60,  # segundos entre consultas à fonte ao vivo
+    'live_max_batches': 100,  # lotes recentes guardados para atualizar sessões incrementalmente
+    'metrics_enabled': True,  # histogramas de latência/tamanho por callback em /metrics
+    'metrics_local_only': True,  # /metrics responde apenas a requisições locais
+    'metrics_panel': False,  # painel de depuração com o resumo das métricas no próprio dashboard
+    'json_engine': 'auto',  # codificador das respostas: 'orjson', 'json' ou 'auto' (orjson se instalado)
+    'compression': True,  # comprimir respostas (brotli se instalado, senão gzip)
+    'compression_min_bytes': 1024,
+    'compression_level': 5,
+    'precompute_figures': True  # gráficos que dependem só da plataforma: gerar na inicialização (False = no primeiro acesso)
+}
+
+# Servidor de produção do dashboard (python src/dashboard/server.py)
+SERVING_CONFIG = {
+    'host': '0.0.0.0',
+    'port': 8050,
+    'workers': None,                          # processos (None = 2 × núcleos + 1)
+    'threads': 4,                             # threads por processo
+    'timeout': 60,                            # segundos por requisição
+    'data_dir': 'data',
+    'callback_cache_dir': '.callback_cache'   # cache de callbacks compartilhado entre os workers
+}
+
+# Cache de resultados dos callbacks do dashboard
+CALLBACK_CACHE_CONFIG = {
+    'enabled': True,
+    'max_entries': 256,                  # limite do LRU em memória
+    'ttl': 600,                          # segundos até um resultado expirar
+    'cache_dir': None,                   # pasta compartilhada entre workers (None = só memória)
+    'max_disk_bytes': 200 * 1024 * 1024
+}
+
+# Geração de relatórios em lote (python pipeline/batch_reports.py)
+REPORT_BATCH_CONFIG = {
+    'accounts_dir': 'data/accounts',  # uma pasta por conta com os CSVs de dados
+    'output_dir': 'reports/lote',
+    'max_workers': None,              # processos simultâneos (None = núcleos)
+    'timeout': 300,                   # segundos por relatório
+    'max_tasks_per_child': 50,        # relatórios por processo antes de reiniciá-lo (libera memória)
+    'max_attempts': 3                 # tentativas de um relatório cujo processo morreu (ex.: falta de memória)
+}
+
+# Configurações dos insights automáticos
+INSIGHTS_CONFIG = {
+    'parallel': False,
+    'executor': 'thread',  # 'thread' ou 'process'
+    'max_workers': None,
+    'cache_dir': None,      # pasta para persistir o cache de insights entre execuções
+    'partition_freq': 'M',  # granularidade das partições de data no cache
+    'cache_version': 2,     # incrementar ao alterar o código dos insights (invalida o cache em disco)
+    'recent_change_threshold': 20  # variação (%) do engajamento do último mês que gera insight
 }
 
+# Configurações da segmentação de público (MiniBatchKMeans)
+SEGMENTATION_CONFIG = {
+    'n_clusters': 5,
+    'chunk_size': 100_000,  # linhas lidas por bloco
+    'batch_size': 1024,     # linhas por passo do partial_fit
+    'n_epochs': 3,
+    'random_state': 42
+}
+
+# Testes de significância dos segmentos demográficos (Welch + Benjamini–Hochberg)
+SEGMENT_TESTING_CONFIG = {
+    'alpha': 0.05,      # taxa de falsas descobertas (FDR)
+    'min_count': 10,    # tamanho mínimo do segmento para ser testado
+    'dimension_sets': [
+        ['city'], ['interest'], ['age_group'], ['gender'],
+        ['city', 'interest'], ['age_group', 'gender']
+    ]
+}
+
+# Regras declarativas de insights por segmento
+# Cada regra agrega 'metric' para cada combinação de 'dimensions' da tabela
+# e gera um insight para os segmentos em que a condição é satisfeita.
+# Agregações disponíveis: sum, mean, min, max, std, count (e global_<agg>
+# para o valor da tabela inteira). Os templates recebem as dimensões do
+# segmento, {valor} (métrica) e {amostras} (registros no segmento).
+INSIGHT_RULES = [
+    {
+        'name': 'segmento_alto_engajamento',
+        'table': 'demographic_data',
+        'dimensions': ['platform', 'city', 'interest'],
+        'metric': 'mean(engagement_rate) / global_mean(engagement_rate)',
+        'operator': '>',
+        'threshold': 1.3,
+        'min_count': 8,
+        'max_matches': 2,
+        'tipo': 'Segmento',
+        'titulo': 'Segmento de Alto Engajamento: {interest} em {city} ({platform})',
+        'descricao': 'O público de {city} interessado em {interest} no {platform} engaja {valor:.2f}x acima da média ({amostras} usuários).',
+        'recomendacao': 'Crie conteúdo de {interest} direcionado para {city} no {platform}.',
+        'prioridade': 'Média'
+    },
+    {
+        'name': 'publico_maior_permanencia',
+        'table': 'demographic_data',
+        'dimensions': ['platform', 'age_group', 'gender'],
+        'metric': 'mean(time_spent_minutes) / global_mean(time_spent_minutes)',
+        'operator': '>',
+        'threshold': 1.1,
+        'min_count': 20,
+        'max_matches': 1,
+        'tipo': 'Segmento',
+        'titulo': 'Maior Tempo de Permanência: {age_group} ({gender}) no {platform}',
+        'descricao': 'O público {gender} de {age_group} anos no {platform} permanece {valor:.2f}x mais tempo que a média.',
+        'recomendacao': 'Teste formatos mais longos (vídeos, carrosséis) para o público {age_group} no {platform}.',
+        'prioridade': 'Baixa'
+    },
+    {
+        'name': 'campanha_roi_alto',
+        'table': 'campaign_data',
+        'dimensions': ['platform', 'campaign_type'],
+        'metric': 'mean(roi)',
+        'operator': '>',
+        'threshold': 3.2,
+        'min_count': 3,
+        'max_matches': 2,
+        'tipo': 'Campanha',
+        'titulo': 'ROI Alto: {campaign_type} no {platform}',
+        'descricao': 'Campanhas de {campaign_type} no {platform} têm ROI médio de {valor:.2f} ({amostras} campanhas).',
+        'recomendacao': 'Aumente o orçamento de campanhas de {campaign_type} no {platform}.',
+        'prioridade': 'Alta'
+    },
+    {
+        'name': 'campanha_custo_conversao_alto',
+        'table': 'campaign_data',
+        'dimensions': ['platform', 'campaign_type'],
+        'metric': '(sum(cost) / sum(conversions)) / (global_sum(cost) / global_sum(conversions))',
+        'operator': '>',
+        'threshold': 1.5,
+        'min_count': 3,
+        'max_matches': 2,
+        'tipo': 'Eficiência',
+        'titulo': 'Custo por Conversão Elevado: {campaign_type} no {platform}',
+        'descricao': 'O custo por conversão de {campaign_type} no {platform} está {valor:.2f}x acima da média.',
+        'recomendacao': 'Revise segmentação e criativos das campanhas de {campaign_type} no {platform}.',
+        'prioridade': 'Média'
+    },
+    {
+        'name': 'plataforma_engajamento_baixo',
+        'table': 'platform_data',
+        'dimensions': ['platform'],
+        'metric': 'sum(engagement) / sum(reach) * 100',
+        'operator': '<',
+        'threshold': 2,
+        'tipo': 'Performance',
+        'titulo': 'Taxa de Engajamento Baixa no {platform}',
+        'descricao': 'O {platform} tem taxa de engajamento de {valor:.2f}%, abaixo da média da indústria.',
+        'recomendacao': 'Revise a estratégia de conteúdo do {platform} e priorize posts interativos.',
+        'prioridade': 'Crítica'
+    },
+    {
+        # Regra sem dimensões: avaliada sobre a tabela inteira
+        'name': 'carteira_roi_baixo',
+        'table': 'campaign_data',
+        'dimensions': [],
+        'metric': 'mean(roi)',
+        'operator': '<',
+        'threshold': 1.0,
+        'min_count': 5,
+        'tipo': 'ROI',
+        'titulo': 'ROI Médio das Campanhas Abaixo do Investimento',
+        'descricao': 'O ROI médio das {amostras} campanhas é {valor:.2f}, abaixo do ponto de equilíbrio.',
+        'recomendacao': 'Reavalie o orçamento das campanhas e concentre o investimento nos tipos de maior retorno.',
+        'prioridade': 'Alta'
+    }
+]
@@ -14,6 +14,8 @@ from src.generators.data_generator import SocialMediaDataGenerator
 from src.analyzers.kpi_analyzer import KPIAnalyzer
 from src.visualizers.visualizations import SocialMediaVisualizer
 from src.analyzers.insights_generator import InsightsGenerator
+from src.analyzers.insight_cache import InsightCache
+from src.analyzers.aggregates import AggregateProvider
 from pipeline.report_generator import ReportGenerator
 from src.dashboard.dashboard import SocialMediaDashboard
 
@@ -39,12 +41,25 @@ def main():
         demographic_data = pd.read_csv('data/demographic_data.csv')
         campaign_data = pd.read_csv('data/campaign_data.csv')
     
+    # Dados de posts com horário de publicação (análise de horários)
+    if os.path.exists('data/post_data.csv'):
+        post_data = pd.read_csv('data/post_data.csv', parse_dates=['timestamp'])
+    else:
+        post_data = SocialMediaDataGenerator().generate_all_post_data()
+    
     print(f"✅ Dados carregados:")
     print(f"   - Métricas das plataformas: {len(platform_data)} registros")
     print(f"   - Dados demográficos: {len(demographic_data)} registros")
     print(f"   - Dados de campanhas: {len(campaign_data)} registros")
+    print(f"   - Dados de posts: {len(post_data)} registros")
     print()
     
+    # Cache de insights compartilhado na sessão (só recalcula famílias com dados alterados)
+    insights_cache = InsightCache()
+    
+    # Agregações compartilhadas entre visualizações, insights, relatório e dashboard
+    aggregates = AggregateProvider(platform_data, demographic_data, campaign_data)
+    
     # Menu principal
     while True:
         print("=" * 40)
@@ -91,14 +106,16 @@ def main():
             
             elif opcao == '2':
                 print("\n📊 Gerando visualizações...")
-                visualizer = SocialMediaVisualizer(platform_data, demographic_data, campaign_data)
+                visualizer = SocialMediaVisualizer(platform_data, demographic_data, campaign_data, post_data,
+                                                   aggregates=aggregates)
                 visualizer.save_all_visualizations()
                 print("✅ Visualizações salvas na pasta 'visualizations/'")
                 input("\nPressione Enter para continuar...")
             
             elif opcao == '3':
                 print("\n💡 Gerando insights automáticos...")
-                insights_generator = InsightsGenerator(platform_data, demographic_data, campaign_data)
+                insights_generator = InsightsGenerator(platform_data, demographic_data, campaign_data, post_data, insights_cache,
+                                                       aggregates=aggregates)
                 insights = insights_generator.generate_all_insights()
                 
                 print("\n=== INSIGHTS AUTOMÁTICOS ===\n")
@@ -123,7 +140,8 @@ def main():
             
             elif opcao == '4':
                 print("\n📄 Gerando relatório PDF...")
-                insights_generator = InsightsGenerator(platform_data, demographic_data, campaign_data)
+                insights_generator = InsightsGenerator(platform_data, demographic_data, campaign_data, post_data, insights_cache,
+                                                       aggregates=aggregates)
                 report_generator = ReportGenerator(platform_data, demographic_data, campaign_data, insights_generator)
                 
                 filename = f"relatorio_marketing_digital_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
@@ -137,7 +155,8 @@ def main():
                 print("Para parar o dashboard, pressione Ctrl+C no terminal.")
                 print()
                 
-                dashboard = SocialMediaDashboard(platform_data, demographic_data, campaign_data)
+                dashboard = SocialMediaDashboard(platform_data, demographic_data, campaign_data, post_data,
+                                                 aggregates=aggregates)
                 try:
                     dashboard.run()
                 except KeyboardInterrupt:
@@ -148,6 +167,7 @@ def main():
                 print("\n🔄 Regenerando dados...")
                 generator = SocialMediaDataGenerator()
                 platform_data, demographic_data, campaign_data = generator.generate_all_data()
+                post_data = generator.generate_all_post_data()
                 print("✅ Dados regenerados com sucesso!")
                 input("\nPressione Enter para continuar...")
             
@@ -0,0 +1,286 @@
+"""
+Geração de relatórios em PDF em lote (várias contas, plataformas e períodos)
+"""
+
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+import multiprocessing
+import matplotlib
+import tempfile
+import argparse
+import calendar
+import signal
+import time
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from config import REPORT_BATCH_CONFIG, PLATFORMS
+from src.analyzers.insights_generator import InsightsGenerator
+from pipeline.report_generator import ReportGenerator
+
+DATA_FILES = {
+    'platform_data': 'platform_metrics.csv',
+    'demographic_data': 'demographic_data.csv',
+    'campaign_data': 'campaign_data.csv'
+}
+
+class ReportTimeout(Exception):
+    """Relatório excedeu o tempo limite do lote"""
+
+# Fila em que cada processo do lote avisa qual relatório começou a gerar
+_started_queue = None
+
+def _raise_timeout(signum, frame):
+    raise ReportTimeout('tempo limite excedido')
+
+def _init_report_worker(started_queue):
+    """Processo de geração sem interface gráfica (backend Agg)"""
+    global _started_queue
+    matplotlib.use('Agg')
+    _started_queue = started_queue
+
+@lru_cache(maxsize=4)
+def _load_account(data_dir):
+    """CSVs de uma conta, lidos uma vez por processo (especificações da mesma conta reaproveitam)"""
+    tables = {name: pd.read_csv(os.path.join(data_dir, filename)) for name, filename in DATA_FILES.items()}
+    post_path = os.path.join(data_dir, 'post_data.csv')
+    tables['post_data'] = pd.read_csv(post_path, parse_dates=['timestamp']) if os.path.exists(post_path) else None
+    for name in ('platform_data', 'campaign_data'):
+        tables[name]['date'] = pd.to_datetime(tables[name]['date'])
+    return tables
+
+def month_period(month):
+    """Primeiro e último dia de um mês 'AAAA-MM'"""
+    year, month_number = (int(part) for part in month.split('-'))
+    last_day = calendar.monthrange(year, month_number)[1]
+    return f'{year:04d}-{month_number:02d}-01', f'{year:04d}-{month_number:02d}-{last_day:02d}'
+
+def list_accounts(accounts_dir=None):
+    """Contas com dados na pasta de contas (uma subpasta por conta)"""
+    accounts_dir = accounts_dir or REPORT_BATCH_CONFIG['accounts_dir']
+    return sorted(entry.name for entry in os.scandir(accounts_dir)
+                  if entry.is_dir() and os.path.exists(os.path.join(entry.path, DATA_FILES['platform_data'])))
+
+def month_end_specs(month, accounts=None, platforms=None, accounts_dir=None):
+    """Especificações do fechamento do mês: cada conta no consolidado e em cada plataforma"""
+    accounts = accounts or list_accounts(accounts_dir)
+    platforms = platforms or ['all'] + [platform['name'] for platform in PLATFORMS.values()]
+    start_date, end_date = month_period(month)
+    return [{'account': account, 'platform': platform, 'start_date': start_date, 'end_date': end_date}
+            for account in accounts for platform in platforms]
+
+def report_filename(spec, output_dir=None):
+    """Caminho do PDF de uma especificação (ou spec['filename'], se informado)"""
+    if spec.get('filename'):
+        return spec['filename']
+    output_dir = output_dir or REPORT_BATCH_CONFIG['output_dir']
+    parts = [spec['account'], spec.get('platform') or 'all', spec.get('start_date'), spec.get('end_date')]
+    name = '_'.join(str(part) for part in parts if part).replace(os.sep, '-')
+    return os.path.join(output_dir, f'relatorio_{name}.pdf')
+
+def filter_account_data(tables, platform=None, start_date=None, end_date=None):
+    """Recorta os dados da conta pela plataforma e pelo período (cópias, sem alterar o cache)"""
+    filtered = {}
+    for name, df in tables.items():
+        if df is None:
+            filtered[name] = None
+            continue
+        mask = pd.Series(True, index=df.index)
+        if platform and platform != 'all':
+            mask &= df['platform'] == platform
+        dates = df['date'] if 'date' in df.columns else df['timestamp'] if 'timestamp' in df.columns else None
+        if dates is not None:
+            if start_date:
+                mask &= dates >= pd.Timestamp(start_date)
+            if end_date:
+                mask &= dates < pd.Timestamp(end_date) + pd.Timedelta(days=1)
+        filtered[name] = df[mask].reset_index(drop=True)
+    return filtered
+
+def _run_report(job, spec, filename, timeout, accounts_dir):
+    """Gera um relatório dentro de um processo do lote; falhas são devolvidas no resultado"""
+    if _started_queue is not None:
+        _started_queue.put(job)
+    result = {**spec, 'file': filename, 'status': 'ok', 'error': None}
+    start = time.perf_counter()
+    
+    # Limite por relatório aplicado no próprio processo, que segue disponível para o próximo
+    use_alarm = timeout and hasattr(signal, 'SIGALRM')
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        data_dir = spec.get('data_dir') or os.path.join(accounts_dir, spec['account'])
+        tables = filter_account_data(_load_account(data_dir), spec.get('platform'),
+                                     spec.get('start_date'), spec.get('end_date'))
+        if tables['platform_data'].empty:
+            raise ValueError('sem dados para a plataforma e o período informados')
+        
+        platform = spec.get('platform') or 'all'
+        subtitle = f"Conta: {spec['account']} · Plataforma: {'Todas' if platform == 'all' else platform}"
+        if spec.get('start_date') or spec.get('end_date'):
+            subtitle += f" · Período: {spec.get('start_date') or 'início'} a {spec.get('end_date') or 'hoje'}"
+        
+        os.makedirs(os.path.dirname(filename) or '.', exist_ok=True)
+        with tempfile.TemporaryDirectory(prefix='report_') as temp_dir:
+            insights_generator = InsightsGenerator(tables['platform_data'], tables['demographic_data'],
+                                                   tables['campaign_data'], tables['post_data'])
+            report_generator = ReportGenerator(tables['platform_data'], tables['demographic_data'],
+                                               tables['campaign_data'], insights_generator, temp_dir=temp_dir)
+            report_generator.generate_report(filename, subtitle=subtitle)
+    except ReportTimeout:
+        # Mensagem fixa: o reportlab acrescenta detalhes internos às exceções que atravessam o build
+        result.update(status='timeout', error=f'tempo limite de {timeout} s excedido')
+    except Exception as e:
+        result.update(status='erro', error=f'{type(e).__name__}: {e}')
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+    
+    # Não deixar PDF incompleto de um relatório que falhou
+    if result['status'] != 'ok' and os.path.exists(filename):
+        os.remove(filename)
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+def run_batch(specs, max_workers=None, timeout=None, output_dir=None, accounts_dir=None):
+    """Gera os relatórios das especificações em paralelo
+    
+    Cada especificação é um dicionário com 'account', 'platform' ('all'
+    para todas), 'start_date' e 'end_date' e, opcionalmente, 'data_dir' e
+    'filename' (sem data_dir, os dados vêm de accounts_dir/<account>). Os
+    relatórios são gerados em até max_workers processos; cada um tem
+    timeout segundos (aplicado com SIGALRM, indisponível no Windows).
+    Erros e tempos excedidos não interrompem o lote.
+    
+    Se um processo morre (falta de memória, falha em código nativo), o
+    pool inteiro é descartado pelo concurrent.futures. Os relatórios que
+    ainda não tinham começado voltam para a fila sem custo; os que estavam
+    em geração contam uma tentativa e são repetidos depois, um por vez,
+    para que uma especificação problemática não derrube as demais. Após
+    REPORT_BATCH_CONFIG['max_attempts'] tentativas o relatório fica com
+    status 'erro'.
+    
+    Retorna um resultado por especificação, na ordem recebida, com status
+    'ok', 'erro' ou 'timeout', o arquivo gerado, a mensagem de erro e a
+    duração.
+    """
+    max_workers = max_workers or REPORT_BATCH_CONFIG['max_workers'] or os.cpu_count() or 1
+    timeout = timeout if timeout is not None else REPORT_BATCH_CONFIG['timeout']
+    accounts_dir = accounts_dir or REPORT_BATCH_CONFIG['accounts_dir']
+    filenames = [report_filename(spec, output_dir) for spec in specs]
+    results = [None] * len(specs)
+    attempts = [0] * len(specs)
+    progress = {'done': 0}
+    
+    def finish(i, result):
+        results[i] = result
+        progress['done'] += 1
+        print(f"[{progress['done']}/{len(specs)}] {result['status']:<7} {result['file']}"
+              + (f" ({result['error']})" if result['error'] else ''))
+    
+    # Fila geral com todos os processos; suspeitos de derrubar o pool, isolados
+    pending, suspects = list(range(len(specs))), []
+    while pending or suspects:
+        if pending:
+            jobs, workers, pending = pending, max_workers, []
+        else:
+            jobs, workers, suspects = suspects, 1, []
+        
+        requeued, crashed, error = _run_round(jobs, workers, specs, filenames, timeout, accounts_dir, finish)
+        pending += requeued
+        for i in crashed:
+            attempts[i] += 1
+            if attempts[i] >= REPORT_BATCH_CONFIG['max_attempts']:
+                finish(i, {**specs[i], 'file': filenames[i], 'status': 'erro', 'seconds': None,
+                           'error': f'processo interrompido em {attempts[i]} tentativas: {error}'})
+            else:
+                suspects.append(i)
+    
+    return results
+
+def _run_round(jobs, max_workers, specs, filenames, timeout, accounts_dir, finish):
+    """Executa os relatórios em um pool até terminarem ou o pool quebrar
+    
+    Retorna (não iniciados, interrompidos, erro): relatórios que não
+    chegaram a começar e os que estavam em geração quando um processo morreu.
+    """
+    context = multiprocessing.get_context('spawn')
+    started_queue = context.SimpleQueue()
+    started, unfinished, error = set(), [], None
+    
+    # max_tasks_per_child só existe a partir do Python 3.11; antes os processos vivem o lote todo
+    pool_options = {}
+    if sys.version_info >= (3, 11):
+        pool_options['max_tasks_per_child'] = REPORT_BATCH_CONFIG['max_tasks_per_child']
+    
+    # 'spawn' garante processos limpos, sem herdar figuras abertas do pyplot
+    with ProcessPoolExecutor(
+        max_workers=min(max_workers, len(jobs)),
+        mp_context=context,
+        initializer=_init_report_worker,
+        initargs=(started_queue,),
+        **pool_options
+    ) as executor:
+        futures = {executor.submit(_run_report, i, specs[i], filenames[i], timeout, accounts_dir): i
+                   for i in jobs}
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                result = future.result()
+            except BrokenProcessPool as e:
+                unfinished.append(i)
+                error = error or str(e)
+                continue
+            finish(i, result)
+    
+    while not started_queue.empty():
+        started.add(started_queue.get())
+    started_queue.close()
+    # Pool quebrado antes de qualquer relatório começar: conta para todos, evitando laço infinito
+    if not started:
+        return [], unfinished, error
+    crashed = [i for i in unfinished if i in started]
+    requeued = [i for i in unfinished if i not in started]
+    return requeued, crashed, error
+
+def summarize_batch(results):
+    """Resumo do lote: totais por status e lista das falhas"""
+    failures = [result for result in results if result['status'] != 'ok']
+    durations = [result['seconds'] for result in results if result['status'] == 'ok']
+    lines = [f"Relatórios gerados: {len(results) - len(failures)}/{len(results)}"]
+    if durations:
+        lines.append(f"Tempo médio por relatório: {sum(durations) / len(durations):.1f} s")
+    if failures:
+        lines.append(f"Falhas ({len(failures)}):")
+        for result in failures:
+            lines.append(f"  - [{result['status']}] {result['account']} / {result.get('platform') or 'all'} "
+                         f"({result.get('start_date') or '-'} a {result.get('end_date') or '-'}): {result['error']}")
+    return '\n'.join(lines)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Geração de relatórios em PDF em lote')
+    parser.add_argument('--specs', help='CSV com as colunas account, platform, start_date, end_date')
+    parser.add_argument('--month', help='fechamento do mês (AAAA-MM) para todas as contas e plataformas')
+    parser.add_argument('--accounts', nargs='*', help='contas do fechamento (padrão: todas em accounts_dir)')
+    parser.add_argument('--platforms', nargs='*', help="variantes por plataforma (padrão: 'all' e cada plataforma)")
+    parser.add_argument('--accounts-dir', help='pasta com uma subpasta de dados por conta')
+    parser.add_argument('--workers', type=int, help='processos simultâneos (padrão: núcleos)')
+    parser.add_argument('--timeout', type=float, help='segundos por relatório')
+    parser.add_argument('--output-dir', help='pasta dos PDFs')
+    args = parser.parse_args()
+    
+    if args.specs:
+        specs = pd.read_csv(args.specs, dtype=str).fillna('').to_dict('records')
+    elif args.month:
+        specs = month_end_specs(args.month, args.accounts, args.platforms, args.accounts_dir)
+    else:
+        parser.error('informe --specs ou --month')
+    
+    start = time.perf_counter()
+    results = run_batch(specs, args.workers, args.timeout, args.output_dir, args.accounts_dir)
+    print(summarize_batch(results))
+    print(f"Tempo total: {time.perf_counter() - start:.1f} s")
+    sys.exit(1 if any(result['status'] != 'ok' for result in results) else 0)
@@ -14,29 +14,52 @@ from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_JUSTIFY
 import matplotlib.pyplot as plt
 import seaborn as sns
 from io import BytesIO
+import uuid
 import os
 import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from config import VISUALIZATION_CONFIG
+from config import VISUALIZATION_CONFIG, RENDER_CACHE_CONFIG
+from src.visualizers.render_cache import RenderCache
 
 class ReportGenerator:
-    def __init__(self, platform_data, demographic_data, campaign_data, insights_generator):
+    def __init__(self, platform_data, demographic_data, campaign_data, insights_generator, render_cache=None, temp_dir=None):
         self.platform_data = platform_data
         self.demographic_data = demographic_data
         self.campaign_data = campaign_data
         self.insights_generator = insights_generator
+        self.render_cache = render_cache
+        
+        # Reaproveitar as agregações já calculadas para os insights
+        self.aggregates = insights_generator.aggregates
+        self.aggregates.sync(platform_data=platform_data, demographic_data=demographic_data, campaign_data=campaign_data)
+        if self.render_cache is None and RENDER_CACHE_CONFIG['enabled']:
+            self.render_cache = RenderCache()
         
         # Configurar matplotlib para português
         plt.rcParams['font.family'] = 'DejaVu Sans'
         plt.rcParams['figure.figsize'] = (10, 6)
         
         # Criar pasta para imagens temporárias
-        self.temp_dir = 'temp_images'
+        self.temp_dir = temp_dir or 'temp_images'
         os.makedirs(self.temp_dir, exist_ok=True)
     
     def create_summary_chart(self):
-        """Cria gráfico de resumo para o relatório"""
+        """Cria gráfico de resumo para o relatório (reaproveitado do cache se os dados não mudaram)"""
+        # Nome único: vários relatórios podem ser gerados ao mesmo tempo na mesma pasta
+        chart_path = os.path.join(self.temp_dir, f'summary_chart_{uuid.uuid4().hex}.png')
+        
+        key = None
+        if self.render_cache is not None:
+            key = self.render_cache.key(
+                'summary_chart',
+                self.platform_data[['platform', 'date', 'followers', 'engagement', 'reach']],
+                self.demographic_data[['age_group']],
+                self.campaign_data[['campaign_type', 'roi']]
+            )
+            if self.render_cache.fetch(key, chart_path):
+                return chart_path
+        
         fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(12, 10))
         
         # 1. Crescimento de seguidores
@@ -53,11 +76,7 @@ class ReportGenerator:
         ax1.grid(True, alpha=0.3)
         
         # 2. Taxa de engajamento
-        platform_engagement = self.platform_data.groupby('platform').agg({
-            'engagement': 'sum',
-            'reach': 'sum'
-        })
-        platform_engagement['engagement_rate'] = (platform_engagement['engagement'] / platform_engagement['reach']) * 100
+        platform_engagement = self.aggregates.get('platform_engagement')
         
         colors = ['#FF6B6B', '#4ECDC4']
         bars = ax2.bar(platform_engagement.index, platform_engagement['engagement_rate'], color=colors)
@@ -71,12 +90,12 @@ class ReportGenerator:
                     f'{height:.2f}%', ha='center', va='bottom')
         
         # 3. Distribuição demográfica
-        age_dist = self.demographic_data.groupby('age_group').size()
+        age_dist = self.aggregates.get('age_distribution')
         ax3.pie(age_dist.values, labels=age_dist.index, autopct='%1.1f%%', startangle=90)
         ax3.set_title('Distribuição por Faixa Etária', fontsize=14, fontweight='bold')
         
         # 4. ROI das campanhas
-        campaign_roi = self.campaign_data.groupby('campaign_type')['roi'].mean().sort_values(ascending=True)
+        campaign_roi = self.aggregates.get('roi_by_campaign_type').sort_values(ascending=True)
         ax4.barh(campaign_roi.index, campaign_roi.values, color='#96CEB4')
         ax4.set_title('ROI Médio por Tipo de Campanha', fontsize=14, fontweight='bold')
         ax4.set_xlabel('ROI')
@@ -84,10 +103,12 @@ class ReportGenerator:
         plt.tight_layout()
         
         # Salvar gráfico
-        chart_path = os.path.join(self.temp_dir, 'summary_chart.png')
         plt.savefig(chart_path, dpi=300, bbox_inches='tight')
         plt.close()
         
+        if key is not None:
+            self.render_cache.store(key, chart_path)
+        
         return chart_path
     
     def create_kpi_table(self):
@@ -107,6 +128,23 @@ class ReportGenerator:
         
         return data
     
+    def create_segmentation_table(self):
+        """Cria tabela com o perfil dos segmentos de público"""
+        profiles = self.insights_generator.get_audience_profiles()
+        
+        data = [['Segmento', 'Participação', 'Engajamento', 'Tempo Médio', 'Perfil Dominante']]
+        
+        for i, profile in enumerate(profiles.itertuples(), 1):
+            data.append([
+                f"#{i}",
+                f"{profile.share:.1f}%",
+                f"{profile.engagement_rate * 100:.2f}%",
+                f"{profile.time_spent_minutes:.1f} min",
+                f"{profile.age_group}, {profile.gender}, {profile.interest}"
+            ])
+        
+        return data
+    
     def create_insights_table(self):
         """Cria tabela de insights"""
         insights = self.insights_generator.generate_all_insights()
@@ -123,8 +161,11 @@ class ReportGenerator:
         
         return data
     
-    def generate_report(self, filename='relatorio_marketing_digital.pdf'):
-        """Gera o relatório completo em PDF"""
+    def generate_report(self, filename='relatorio_marketing_digital.pdf', subtitle=None):
+        """Gera o relatório completo em PDF
+        
+        subtitle: linha opcional abaixo do título (ex.: conta, plataforma e período)
+        """
         doc = SimpleDocTemplate(filename, pagesize=A4)
         styles = getSampleStyleSheet()
         
@@ -161,6 +202,8 @@ class ReportGenerator:
         story.append(Paragraph("Relatório de Marketing Digital", title_style))
         story.append(Paragraph("Análise e Visualização de Dados de Mídias Sociais", 
                               styles['Normal']))
+        if subtitle:
+            story.append(Paragraph(subtitle, styles['Normal']))
         story.append(Spacer(1, 20))
         
         # Data de geração
@@ -216,8 +259,8 @@ class ReportGenerator:
         story.append(Spacer(1, 12))
         
         # Top cidades e interesses
-        top_cities = self.demographic_data.groupby('city')['engagement_rate'].mean().sort_values(ascending=False).head(5)
-        top_interests = self.demographic_data.groupby('interest')['engagement_rate'].mean().sort_values(ascending=False).head(5)
+        top_cities = self.aggregates.get('city_engagement').sort_values(ascending=False).head(5)
+        top_interests = self.aggregates.get('interest_engagement').sort_values(ascending=False).head(5)
         
         story.append(Paragraph("Top 5 Cidades por Engajamento:", subheading_style))
         for city, rate in top_cities.items():
@@ -230,6 +273,24 @@ class ReportGenerator:
         
         story.append(Spacer(1, 20))
         
+        # Segmentação de Público
+        story.append(Paragraph("Segmentação de Público", heading_style))
+        segmentation_data = self.create_segmentation_table()
+        segmentation_table = Table(segmentation_data, colWidths=[0.7*inch, 1*inch, 1.1*inch, 1*inch, 2.4*inch])
+        segmentation_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 10),
+            ('FONTSIZE', (0, 1), (-1, -1), 8),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black)
+        ]))
+        story.append(segmentation_table)
+        story.append(Spacer(1, 20))
+        
         # Análise de Campanhas
         story.append(Paragraph("Análise de Campanhas", heading_style))
         
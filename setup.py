@@ -41,6 +41,11 @@ setup(
             "flake8>=3.8",
             "mypy>=0.800",
         ],
+        "production": [
+            "gunicorn>=21.0",
+            "orjson>=3.9",
+            "brotli>=1.0",
+        ],
     },
     entry_points={
         "console_scripts": [
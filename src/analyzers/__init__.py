@@ -4,6 +4,14 @@ Módulos de análise de dados
 
 from .kpi_analyzer import KPIAnalyzer
 from .insights_generator import InsightsGenerator
+from .rule_engine import InsightRule, InsightRuleEngine
+from .audience_segmentation import AudienceSegmenter
+from .insight_cache import InsightCache
+from .segment_testing import test_segments, benjamini_hochberg
+from .correlation import CovarianceAccumulator
+from .aggregates import AggregateProvider
 
-__all__ = ['KPIAnalyzer', 'InsightsGenerator']
+__all__ = ['KPIAnalyzer', 'InsightsGenerator', 'InsightRule', 'InsightRuleEngine', 'AudienceSegmenter', 'InsightCache',
+           'test_segments', 'benjamini_hochberg', 'CovarianceAccumulator',
+           'AggregateProvider']
 
@@ -0,0 +1,105 @@
+"""
+Provedor de agregações compartilhadas entre insights, visualizações, relatório e dashboard
+"""
+
+def _platform_engagement(df):
+    engagement = df.groupby('platform').agg({'engagement': 'sum', 'reach': 'sum'})
+    engagement['engagement_rate'] = (engagement['engagement'] / engagement['reach']) * 100
+    return engagement
+
+def _latest_followers(df):
+    return df.groupby('platform')['followers'].last()
+
+def _age_distribution(df):
+    return df.groupby('age_group').size()
+
+def _gender_distribution(df):
+    return df.groupby('gender').size()
+
+def _age_by_platform(df):
+    return df.groupby(['platform', 'age_group']).size().unstack(fill_value=0)
+
+def _gender_by_platform(df):
+    return df.groupby(['platform', 'gender']).size().unstack(fill_value=0)
+
+def _city_engagement(df):
+    return df.groupby('city')['engagement_rate'].mean()
+
+def _interest_engagement(df):
+    return df.groupby('interest')['engagement_rate'].mean()
+
+def _roi_by_campaign_type(df):
+    return df.groupby('campaign_type')['roi'].mean()
+
+def _roi_by_platform(df):
+    return df.groupby('platform')['roi'].mean()
+
+def _roi_by_platform_and_type(df):
+    return df.groupby(['platform', 'campaign_type'])['roi'].mean().unstack(fill_value=0)
+
+class AggregateProvider:
+    """Calcula cada agregação nomeada uma única vez por versão dos dados
+    
+    As agregações são declaradas em AGGREGATES (nome -> tabela de origem e
+    função) e guardadas em cache pela chave (nome, plataforma, versão da
+    tabela). A versão de uma tabela muda apenas quando ela é substituída com
+    update_data ou marcada como alterada com invalidate. Os resultados são
+    compartilhados entre todos os consumidores e não devem ser modificados
+    (ordenar/filtrar gera novos objetos e pode ser feito livremente).
+    """
+    
+    AGGREGATES = {
+        'platform_engagement': ('platform_data', _platform_engagement),
+        'latest_followers': ('platform_data', _latest_followers),
+        'age_distribution': ('demographic_data', _age_distribution),
+        'gender_distribution': ('demographic_data', _gender_distribution),
+        'age_by_platform': ('demographic_data', _age_by_platform),
+        'gender_by_platform': ('demographic_data', _gender_by_platform),
+        'city_engagement': ('demographic_data', _city_engagement),
+        'interest_engagement': ('demographic_data', _interest_engagement),
+        'roi_by_campaign_type': ('campaign_data', _roi_by_campaign_type),
+        'roi_by_platform': ('campaign_data', _roi_by_platform),
+        'roi_by_platform_and_type': ('campaign_data', _roi_by_platform_and_type)
+    }
+    
+    def __init__(self, platform_data, demographic_data, campaign_data):
+        self.tables = {
+            'platform_data': platform_data,
+            'demographic_data': demographic_data,
+            'campaign_data': campaign_data
+        }
+        self.versions = {table: 0 for table in self.tables}
+        self._cache = {}
+        self.stats = {'hits': 0, 'misses': 0}
+    
+    def update_data(self, **tables):
+        """Substitui tabelas (ex.: platform_data=novo_df), criando uma nova versão"""
+        for table, df in tables.items():
+            self.tables[table] = df
+            self.invalidate(table)
+    
+    def sync(self, **tables):
+        """Atualiza apenas as tabelas que foram substituídas por outro objeto"""
+        self.update_data(**{table: df for table, df in tables.items() if self.tables.get(table) is not df})
+    
+    def invalidate(self, table):
+        """Marca uma tabela como alterada, descartando suas agregações"""
+        self.versions[table] += 1
+        self._cache = {key: value for key, value in self._cache.items() if key[0] != table}
+    
+    def get(self, name, platform=None):
+        """Retorna a agregação nomeada, opcionalmente restrita a uma plataforma"""
+        table, function = self.AGGREGATES[name]
+        platform = None if platform == 'all' else platform
+        key = (table, name, platform, self.versions[table])
+        if key in self._cache:
+            self.stats['hits'] += 1
+            return self._cache[key]
+        
+        self.stats['misses'] += 1
+        df = self.tables[table]
+        if platform is not None:
+            df = df[df['platform'] == platform]
+        result = function(df)
+        self._cache[key] = result
+        return result
@@ -0,0 +1,164 @@
+"""
+Segmentação de público com MiniBatchKMeans sobre features esparsas
+"""
+
+import pandas as pd
+import numpy as np
+from scipy import sparse
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.preprocessing import StandardScaler
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from config import SEGMENTATION_CONFIG
+
+class AudienceSegmenter:
+    """Agrupa o público em clusters processando os dados em blocos
+    
+    A fonte de dados pode ser um DataFrame, o caminho de um CSV ou uma função
+    que retorna um iterador de DataFrames (ex.: lambda: pd.read_csv(..., chunksize=...)).
+    Apenas um bloco fica em memória por vez, então o uso de memória é limitado
+    pelo chunk_size e não pelo tamanho total do público.
+    """
+    
+    CATEGORICAL_FEATURES = ['platform', 'age_group', 'gender', 'city', 'interest']
+    NUMERIC_FEATURES = ['engagement_rate', 'time_spent_minutes']
+    
+    def __init__(self, n_clusters=None, chunk_size=None, batch_size=None, n_epochs=None, random_state=None):
+        self.n_clusters = n_clusters or SEGMENTATION_CONFIG['n_clusters']
+        self.chunk_size = chunk_size or SEGMENTATION_CONFIG['chunk_size']
+        self.batch_size = max(batch_size or SEGMENTATION_CONFIG['batch_size'], self.n_clusters)
+        self.n_epochs = n_epochs or SEGMENTATION_CONFIG['n_epochs']
+        self.random_state = SEGMENTATION_CONFIG['random_state'] if random_state is None else random_state
+        
+        self.categories = {feature: [] for feature in self.CATEGORICAL_FEATURES}
+        self.scaler = StandardScaler()
+        self.model = None
+        self.profiles = None
+    
+    def _iter_chunks(self, source):
+        """Itera sobre a fonte de dados em blocos"""
+        columns = self.CATEGORICAL_FEATURES + self.NUMERIC_FEATURES
+        if isinstance(source, pd.DataFrame):
+            for start in range(0, len(source), self.chunk_size):
+                yield source.iloc[start:start + self.chunk_size]
+        elif isinstance(source, (str, os.PathLike)):
+            yield from pd.read_csv(source, usecols=columns, chunksize=self.chunk_size)
+        else:
+            yield from source()
+    
+    def _learn_vocabulary(self, source):
+        """Primeira passada: categorias de cada feature e estatísticas do scaler"""
+        seen = {feature: set() for feature in self.CATEGORICAL_FEATURES}
+        for chunk in self._iter_chunks(source):
+            for feature in self.CATEGORICAL_FEATURES:
+                seen[feature].update(chunk[feature].dropna().unique())
+            self.scaler.partial_fit(chunk[self.NUMERIC_FEATURES].to_numpy(dtype=float))
+        
+        self.categories = {feature: sorted(values) for feature, values in seen.items()}
+        self._offsets = np.cumsum([0] + [len(self.categories[f]) for f in self.CATEGORICAL_FEATURES])
+    
+    def _encode(self, chunk):
+        """Códigos das categorias de um bloco (-1 para valores desconhecidos)"""
+        return np.column_stack([
+            pd.Categorical(chunk[feature], categories=self.categories[feature]).codes
+            for feature in self.CATEGORICAL_FEATURES
+        ])
+    
+    def _transform(self, chunk, codes=None):
+        """Monta a matriz esparsa: one-hot das categorias + numéricas padronizadas"""
+        if codes is None:
+            codes = self._encode(chunk)
+        n_rows = len(chunk)
+        n_categorical = self._offsets[-1]
+        
+        valid = codes >= 0
+        rows = np.broadcast_to(np.arange(n_rows)[:, None], codes.shape)[valid]
+        columns = (codes + self._offsets[:-1])[valid]
+        one_hot = sparse.csr_matrix(
+            (np.ones(len(rows)), (rows, columns)), shape=(n_rows, n_categorical)
+        )
+        
+        numeric = self.scaler.transform(chunk[self.NUMERIC_FEATURES].to_numpy(dtype=float))
+        return sparse.hstack([one_hot, sparse.csr_matrix(numeric)], format='csr')
+    
+    def fit(self, source):
+        """Treina o modelo incrementalmente e calcula o perfil de cada cluster"""
+        self._learn_vocabulary(source)
+        
+        self.model = MiniBatchKMeans(
+            n_clusters=self.n_clusters,
+            batch_size=self.batch_size,
+            random_state=self.random_state,
+            n_init=3
+        )
+        
+        # Segunda passada: partial_fit por mini-lote
+        pending = None
+        for _ in range(self.n_epochs):
+            for chunk in self._iter_chunks(source):
+                features = self._transform(chunk)
+                if pending is not None:
+                    features = sparse.vstack([pending, features], format='csr')
+                    pending = None
+                for start in range(0, features.shape[0], self.batch_size):
+                    batch = features[start:start + self.batch_size]
+                    # O primeiro lote precisa de amostras suficientes para inicializar os centros
+                    if not hasattr(self.model, 'cluster_centers_') and batch.shape[0] < self.n_clusters:
+                        pending = batch
+                        break
+                    self.model.partial_fit(batch)
+        
+        if not hasattr(self.model, 'cluster_centers_'):
+            raise ValueError(f"São necessários ao menos {self.n_clusters} registros para a segmentação")
+        
+        # Terceira passada: atribuir clusters e acumular perfis
+        self.profiles = self._build_profiles(source)
+        return self
+    
+    def _build_profiles(self, source):
+        """Acumula contagens e somas por cluster sem manter os rótulos em memória"""
+        n_categorical = self._offsets[-1]
+        sizes = np.zeros(self.n_clusters)
+        numeric_sums = np.zeros((self.n_clusters, len(self.NUMERIC_FEATURES)))
+        category_counts = np.zeros((self.n_clusters, n_categorical))
+        
+        for chunk in self._iter_chunks(source):
+            codes = self._encode(chunk)
+            labels = self.model.predict(self._transform(chunk, codes))
+            sizes += np.bincount(labels, minlength=self.n_clusters)
+            
+            for j, feature in enumerate(self.NUMERIC_FEATURES):
+                values = chunk[feature].to_numpy(dtype=float)
+                numeric_sums[:, j] += np.bincount(labels, weights=values, minlength=self.n_clusters)
+            
+            valid = codes >= 0
+            keys = (labels[:, None] * n_categorical + codes + self._offsets[:-1])[valid]
+            category_counts += np.bincount(keys, minlength=self.n_clusters * n_categorical).reshape(
+                self.n_clusters, n_categorical
+            )
+        
+        profiles = []
+        total = sizes.sum()
+        for cluster in range(self.n_clusters):
+            if sizes[cluster] == 0:
+                continue
+            profile = {
+                'cluster': cluster,
+                'size': int(sizes[cluster]),
+                'share': sizes[cluster] / total * 100
+            }
+            for j, feature in enumerate(self.NUMERIC_FEATURES):
+                profile[feature] = numeric_sums[cluster, j] / sizes[cluster]
+            for i, feature in enumerate(self.CATEGORICAL_FEATURES):
+                counts = category_counts[cluster, self._offsets[i]:self._offsets[i + 1]]
+                top = int(np.argmax(counts))
+                profile[feature] = self.categories[feature][top]
+                profile[f'{feature}_share'] = counts[top] / sizes[cluster] * 100
+            profiles.append(profile)
+        
+        return pd.DataFrame(profiles).sort_values('engagement_rate', ascending=False).reset_index(drop=True)
+    
+    def predict(self, chunk):
+        """Retorna o cluster de cada linha de um bloco"""
+        return self.model.predict(self._transform(chunk))
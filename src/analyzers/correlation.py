@@ -0,0 +1,97 @@
+"""
+Matrizes de correlação calculadas com acumuladores de covariância incrementais
+"""
+
+import pandas as pd
+import numpy as np
+
+CORRELATION_COLUMNS = ['followers', 'impressions', 'reach', 'engagement', 'likes', 'comments', 'shares']
+
+class CovarianceAccumulator:
+    """Acumula contagem, médias e co-momentos de um conjunto de colunas
+    
+    Cada lote de linhas é resumido em (n, média, matriz de co-momentos) e
+    combinado com o estado atual pela fórmula de Chan, numericamente estável.
+    Acumuladores de lotes (ou de arquivos) diferentes podem ser combinados,
+    de modo que a correlação de dados maiores que a memória é obtida em
+    blocos e atualizada em O(novas linhas). Linhas com valores ausentes em
+    qualquer coluna são ignoradas.
+    """
+    
+    def __init__(self, columns=None):
+        self.columns = list(columns or CORRELATION_COLUMNS)
+        k = len(self.columns)
+        self.count = 0
+        self.mean = np.zeros(k)
+        self.comoment = np.zeros((k, k))
+    
+    def _combine(self, count, mean, comoment):
+        if count == 0:
+            return self
+        total = self.count + count
+        delta = mean - self.mean
+        self.comoment = self.comoment + comoment + np.outer(delta, delta) * (self.count * count / total)
+        self.mean = self.mean + delta * (count / total)
+        self.count = total
+        return self
+    
+    def update(self, df):
+        """Adiciona um lote de linhas (DataFrame com as colunas acumuladas)"""
+        values = df[self.columns].to_numpy(dtype=np.float64)
+        values = values[np.isfinite(values).all(axis=1)]
+        if len(values) == 0:
+            return self
+        
+        mean = values.mean(axis=0)
+        centered = values - mean
+        return self._combine(len(values), mean, centered.T @ centered)
+    
+    def merge(self, other):
+        """Combina os acumuladores de outro objeto (mesmas colunas) neste"""
+        if other.columns != self.columns:
+            raise ValueError("Acumuladores com colunas diferentes não podem ser combinados")
+        return self._combine(other.count, other.mean, other.comoment)
+    
+    @classmethod
+    def from_frame(cls, df, columns=None, chunk_size=1_000_000):
+        """Cria o acumulador a partir de um DataFrame, processando em blocos"""
+        accumulator = cls(columns)
+        for start in range(0, len(df), chunk_size):
+            accumulator.update(df.iloc[start:start + chunk_size])
+        return accumulator
+    
+    def covariance(self):
+        """Matriz de covariância amostral"""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            covariance = self.comoment / (self.count - 1)
+        return pd.DataFrame(covariance, index=self.columns, columns=self.columns)
+    
+    def correlation(self):
+        """Matriz de correlação de Pearson (NaN para colunas sem variância)"""
+        std = np.sqrt(np.diag(self.comoment))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            correlation = self.comoment / np.outer(std, std)
+        correlation = np.clip(correlation, -1.0, 1.0)
+        return pd.DataFrame(correlation, index=self.columns, columns=self.columns)
+
+def build_correlation_accumulators(chunks, columns=None, group_column='platform'):
+    """Cria um acumulador por plataforma a partir de um DataFrame ou de blocos
+    
+    chunks pode ser um DataFrame ou um iterável de DataFrames (por exemplo,
+    pd.read_csv(..., chunksize=...)) para dados que não cabem na memória.
+    """
+    if isinstance(chunks, pd.DataFrame):
+        chunks = [chunks]
+    
+    accumulators = {}
+    for chunk in chunks:
+        update_correlation_accumulators(accumulators, chunk, columns, group_column)
+    return accumulators
+
+def update_correlation_accumulators(accumulators, new_rows, columns=None, group_column='platform'):
+    """Incorpora novas linhas aos acumuladores por plataforma (criando os que faltam)"""
+    for group, rows in new_rows.groupby(group_column, sort=False):
+        if group not in accumulators:
+            accumulators[group] = CovarianceAccumulator(columns)
+        accumulators[group].update(rows)
+    return accumulators
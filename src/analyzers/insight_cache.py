@@ -0,0 +1,214 @@
+"""
+Cache de insights por família, indexado pelo fingerprint das partições de dados
+"""
+
+import hashlib
+import pickle
+import weakref
+import pandas as pd
+import numpy as np
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from config import INSIGHTS_CONFIG
+
+# Coluna de data usada para particionar cada tabela (None = tabela sem partições)
+TABLE_PARTITIONS = {
+    'platform_data': 'date',
+    'campaign_data': 'date',
+    'post_data': 'timestamp',
+    'demographic_data': None
+}
+
+def _digest(*parts):
+    hasher = hashlib.sha1()
+    for part in parts:
+        hasher.update(part if isinstance(part, bytes) else repr(part).encode('utf-8'))
+    return hasher.hexdigest()
+
+def partition_fingerprints(df, date_column=None, freq=None):
+    """Calcula um fingerprint por partição (mês) de uma tabela
+    
+    Retorna um dicionário {partição: hash}. Tabelas sem coluna de data
+    formam uma única partição '*'. O esquema (colunas e tipos) entra como
+    a partição especial '__schema__'.
+    """
+    if df is None:
+        return {}
+    
+    freq = freq or INSIGHTS_CONFIG['partition_freq']
+    fingerprints = {'__schema__': _digest(list(df.columns), [str(dtype) for dtype in df.dtypes])}
+    row_hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    
+    if date_column is None or date_column not in df.columns:
+        fingerprints['*'] = _digest(row_hashes.tobytes())
+        return fingerprints
+    
+    periods = pd.to_datetime(df[date_column]).dt.to_period(freq)
+    codes, uniques = pd.factorize(periods, sort=True)
+    order = np.argsort(codes, kind='stable')
+    bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+    
+    for i, period in enumerate(uniques):
+        fingerprints[str(period)] = _digest(row_hashes[order[bounds[i]:bounds[i + 1]]].tobytes())
+    
+    missing = codes < 0
+    if missing.any():
+        fingerprints['sem_data'] = _digest(row_hashes[missing].tobytes())
+    
+    return fingerprints
+
+def recent_partitions(fingerprints, count):
+    """Fingerprints do esquema e das `count` partições de data mais recentes"""
+    periods = sorted(partition for partition in fingerprints if partition not in ('__schema__', '*', 'sem_data'))
+    selected = ['__schema__'] + periods[-count:]
+    return {partition: fingerprints[partition] for partition in selected if partition in fingerprints}
+
+def recent_partition_mask(dates, count, freq=None):
+    """Linhas nas `count` partições de data mais recentes (as mesmas de recent_partitions)"""
+    periods = pd.to_datetime(dates).dt.to_period(freq or INSIGHTS_CONFIG['partition_freq'])
+    selected = sorted(periods.dropna().unique())[-count:]
+    return periods.isin(selected)
+
+def table_checksum(df):
+    """Resumo barato do conteúdo de uma tabela: forma, esquema e somas por coluna
+    
+    Soma e contagem de nulos das colunas numéricas e de data (cerca de 10x
+    mais rápido que os fingerprints). Detecta a maioria das alterações
+    feitas no próprio DataFrame, mas não as que só mudam colunas de texto ou
+    preservam as somas.
+    """
+    if df is None:
+        return None
+    parts = [df.shape, list(df.columns), [str(dtype) for dtype in df.dtypes]]
+    for column in df.columns:
+        values = df[column]
+        if pd.api.types.is_datetime64_any_dtype(values):
+            valid = values.dropna().to_numpy(dtype='datetime64[ns]').astype(np.int64)
+            parts.append((int(valid.sum()), len(values) - len(valid)))
+        elif pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+            array = values.to_numpy(dtype=np.float64, na_value=np.nan)
+            parts.append((float(np.nansum(array)), int(np.isnan(array).sum())))
+    return _digest(parts)
+
+class InsightCache:
+    """Guarda os insights de cada família junto com a chave dos dados lidos
+    
+    A chave de uma família combina os fingerprints das partições que ela
+    lê, a configuração da qual depende e a versão do código dos insights
+    (INSIGHTS_CONFIG['cache_version']). Uma família lê a tabela inteira ou
+    apenas as N partições de data mais recentes (recent_partitions); uma
+    partição alterada recalcula só as famílias que a leem, e cache_report
+    indica as partições que mudaram. Com cache_dir definido, o cache é
+    persistido em disco e pode ser reaproveitado entre execuções.
+    """
+    
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir if cache_dir is not None else INSIGHTS_CONFIG['cache_dir']
+        self._entries = {}
+        self._fingerprints = {}
+        # Tabela (objeto) e versão já calculadas, para não refazer o hash de dados inalterados
+        self._sources = {}
+        self._checksums = {}
+        
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            stored = self._load('fingerprints')
+            if stored is not None:
+                self._fingerprints = stored
+    
+    def __getstate__(self):
+        # Referências fracas não são serializáveis (executor 'process' envia o gerador aos processos)
+        state = self.__dict__.copy()
+        state['_sources'] = {}
+        return state
+    
+    def _path(self, name):
+        return os.path.join(self.cache_dir, f'{name}.pkl')
+    
+    def _load(self, name):
+        try:
+            with open(self._path(name), 'rb') as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+    
+    def _store(self, name, value):
+        # Escrita atômica para não deixar arquivos corrompidos entre execuções concorrentes
+        tmp_path = f'{self._path(name)}.{os.getpid()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self._path(name))
+    
+    def update_fingerprints(self, tables, versions=None):
+        """Calcula os fingerprints das tabelas e retorna as partições alteradas por tabela
+        
+        versions: versões das tabelas (ex.: AggregateProvider.versions). Uma
+        tabela que é o mesmo objeto, na mesma versão registrada com
+        remember_sources e com o mesmo table_checksum, não tem o hash
+        refeito. O checksum não enxerga alterações feitas no próprio
+        DataFrame que só mudam colunas de texto ou preservam as somas; essas
+        devem ser sinalizadas com uma nova versão (AggregateProvider.invalidate).
+        """
+        versions = versions or {}
+        changed = {}
+        for name, df in tables.items():
+            checksum = table_checksum(df)
+            source = self._sources.get(name)
+            if (df is not None and name in versions and source is not None
+                    and source[0]() is df and source[1] == versions[name]
+                    and self._checksums.get(name) == checksum):
+                changed[name] = []
+                continue
+            self._checksums[name] = checksum
+            
+            fingerprints = partition_fingerprints(df, TABLE_PARTITIONS.get(name))
+            previous = self._fingerprints.get(name, {})
+            changed[name] = sorted(
+                partition for partition in set(fingerprints) | set(previous)
+                if fingerprints.get(partition) != previous.get(partition)
+            )
+            self._fingerprints[name] = fingerprints
+        
+        if self.cache_dir:
+            self._store('fingerprints', self._fingerprints)
+        return changed
+    
+    def remember_sources(self, tables, versions):
+        """Registra as tabelas e versões cujos fingerprints estão atualizados"""
+        for name, df in tables.items():
+            if df is not None and name in versions:
+                self._sources[name] = (weakref.ref(df), versions[name])
+    
+    def family_key(self, tables, dependencies=(), partitions=None):
+        """Chave de uma família a partir das partições lidas e da configuração usada
+        
+        partitions: {tabela: N} para tabelas das quais a família lê apenas
+        as N partições de data mais recentes; as demais entram inteiras.
+        """
+        partitions = partitions or {}
+        parts = []
+        for name in sorted(tables):
+            fingerprints = self._fingerprints.get(name, {})
+            if name in partitions:
+                fingerprints = recent_partitions(fingerprints, partitions[name])
+            parts.append((name, partitions.get(name), sorted(fingerprints.items())))
+        return _digest(INSIGHTS_CONFIG['cache_version'], parts, list(dependencies))
+    
+    def get(self, family, key):
+        """Retorna os insights em cache da família se a chave ainda for válida"""
+        entry = self._entries.get(family)
+        if entry is None and self.cache_dir:
+            entry = self._load(f'insights_{family}')
+            if entry is not None:
+                self._entries[family] = entry
+        if entry is not None and entry['key'] == key:
+            return entry['insights']
+        return None
+    
+    def put(self, family, key, insights):
+        """Armazena os insights calculados de uma família"""
+        entry = {'key': key, 'insights': insights}
+        self._entries[family] = entry
+        if self.cache_dir:
+            self._store(f'insights_{family}', entry)
@@ -5,18 +5,73 @@ Gerador de insights automáticos para dados de mídias sociais
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from sklearn.cluster import KMeans
-from sklearn.preprocessing import StandardScaler
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import time
 import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
-from config import PLATFORMS
+from config import PLATFORMS, INSIGHTS_CONFIG, INSIGHT_RULES, SEGMENTATION_CONFIG, SEGMENT_TESTING_CONFIG
+from src.analyzers.rule_engine import InsightRuleEngine
+from src.analyzers.audience_segmentation import AudienceSegmenter
+from src.analyzers.posting_time import PostingTimeMatrix
+from src.analyzers.segment_testing import test_segments, significant_winners
+from src.analyzers.aggregates import AggregateProvider
+from src.analyzers.insight_cache import recent_partition_mask
+
+# Ordem de prioridade usada para ordenar os insights
+PRIORITY_ORDER = {'Crítica': 1, 'Alta': 2, 'Média': 3, 'Baixa': 4}
+
+def _run_insight_family(generator, family):
+    """Executa uma família de insights e mede seu tempo (usado pelos pools)"""
+    start = time.perf_counter()
+    insights = getattr(generator, InsightsGenerator.INSIGHT_FAMILIES[family]['method'])()
+    return insights, time.perf_counter() - start
 
 class InsightsGenerator:
-    def __init__(self, platform_data, demographic_data, campaign_data):
+    # Famílias de insights na ordem em que são combinadas, com as tabelas que
+    # cada uma lê e a configuração da qual depende (usadas pelo cache incremental).
+    # 'partitions' limita a leitura às N partições de data mais recentes de uma
+    # tabela; as demais famílias leem as tabelas inteiras (totais, primeiro/último
+    # valor, médias mensais) e são recalculadas com qualquer partição alterada.
+    INSIGHT_FAMILIES = {
+        'performance': {'method': 'generate_performance_insights', 'tables': ['platform_data']},
+        'demographic': {'method': 'generate_demographic_insights', 'tables': ['demographic_data'],
+                        'config': SEGMENT_TESTING_CONFIG},
+        'campaign': {'method': 'generate_campaign_insights', 'tables': ['campaign_data']},
+        'trend': {'method': 'generate_trend_insights', 'tables': ['platform_data']},
+        'recent': {'method': 'generate_recent_insights', 'tables': ['platform_data'],
+                   'partitions': {'platform_data': 2}, 'config': INSIGHTS_CONFIG['recent_change_threshold']},
+        'content': {'method': 'generate_content_insights', 'tables': ['platform_data', 'post_data']},
+        'audience': {'method': 'generate_audience_insights', 'tables': ['demographic_data'],
+                     'config': SEGMENTATION_CONFIG},
+        'rules': {'method': 'generate_rule_insights',
+                  'tables': ['platform_data', 'demographic_data', 'campaign_data'],
+                  'config': INSIGHT_RULES}
+    }
+    
+    # Resultados intermediários guardados na instância, por tabela de origem
+    TABLE_MEMOS = {
+        'demographic_data': ['_audience_profiles'],
+        'post_data': ['_posting_time_matrix']
+    }
+    
+    def __init__(self, platform_data, demographic_data, campaign_data, post_data=None, cache=None, aggregates=None):
         self.platform_data = platform_data
         self.demographic_data = demographic_data
         self.campaign_data = campaign_data
+        self.post_data = post_data
+        
+        # Agregações compartilhadas com visualizações, relatório e dashboard
+        self.aggregates = aggregates or AggregateProvider(platform_data, demographic_data, campaign_data)
+        
+        # Cache incremental de insights (InsightCache); None recalcula tudo
+        self.cache = cache
+        self.cache_report = {}
+        
+        # Tempo de execução (segundos) de cada família na última geração
+        self.insight_timings = {}
+        self._audience_profiles = None
+        self._posting_time_matrix = None
         
         # Converter colunas de data
         self.platform_data['date'] = pd.to_datetime(self.platform_data['date'])
@@ -27,7 +82,7 @@ class InsightsGenerator:
         insights = []
         
         # Calcular métricas principais
-        total_followers = self.platform_data.groupby('platform')['followers'].last().sum()
+        total_followers = self.aggregates.get('latest_followers').sum()
         total_engagement = self.platform_data['engagement'].sum()
         total_reach = self.platform_data['reach'].sum()
         avg_engagement_rate = (total_engagement / total_reach * 100) if total_reach > 0 else 0
@@ -83,7 +138,7 @@ class InsightsGenerator:
         insights = []
         
         # Insight 1: Faixa etária dominante
-        age_distribution = self.demographic_data.groupby('age_group').size().sort_values(ascending=False)
+        age_distribution = self.aggregates.get('age_distribution').sort_values(ascending=False)
         dominant_age = age_distribution.index[0]
         age_percentage = (age_distribution.iloc[0] / age_distribution.sum()) * 100
         
@@ -96,7 +151,7 @@ class InsightsGenerator:
         })
         
         # Insight 2: Gênero predominante
-        gender_distribution = self.demographic_data.groupby('gender').size().sort_values(ascending=False)
+        gender_distribution = self.aggregates.get('gender_distribution').sort_values(ascending=False)
         dominant_gender = gender_distribution.index[0]
         gender_percentage = (gender_distribution.iloc[0] / gender_distribution.sum()) * 100
         
@@ -108,31 +163,53 @@ class InsightsGenerator:
             'prioridade': 'Média'
         })
         
-        # Insight 3: Cidades com maior engajamento
-        city_engagement = self.demographic_data.groupby('city')['engagement_rate'].mean().sort_values(ascending=False)
-        top_city = city_engagement.index[0]
-        top_city_rate = city_engagement.iloc[0]
+        # Insights 3 e 4: apenas segmentos com engajamento significativamente
+        # acima do restante do público (Welch + correção de Benjamini–Hochberg)
+        segment_tests = test_segments(self.demographic_data)
         
-        insights.append({
-            'tipo': 'Geográfico',
-            'titulo': f'{top_city} - Cidade com Maior Engajamento',
-            'descricao': f'{top_city} apresenta a maior taxa de engajamento ({top_city_rate:.2f}%).',
-            'recomendacao': f'Considere eventos presenciais em {top_city} e campanhas geo-direcionadas.',
-            'prioridade': 'Média'
-        })
+        city_winners = significant_winners(segment_tests, ['city'])
+        if len(city_winners) > 0:
+            top_city = city_winners.iloc[0]
+            insights.append({
+                'tipo': 'Geográfico',
+                'titulo': f'{top_city["city"]} - Cidade com Maior Engajamento',
+                'descricao': (f'{top_city["city"]} apresenta taxa de engajamento de {top_city["mean"] * 100:.2f}% contra '
+                              f'{top_city["rest_mean"] * 100:.2f}% no restante do público '
+                              f'({top_city["n"]} usuários, q = {top_city["q_value"]:.3f}).'),
+                'recomendacao': f'Considere eventos presenciais em {top_city["city"]} e campanhas geo-direcionadas.',
+                'prioridade': 'Média'
+            })
         
-        # Insight 4: Interesses mais populares
-        interest_engagement = self.demographic_data.groupby('interest')['engagement_rate'].mean().sort_values(ascending=False)
-        top_interest = interest_engagement.index[0]
-        top_interest_rate = interest_engagement.iloc[0]
+        interest_winners = significant_winners(segment_tests, ['interest'])
+        if len(interest_winners) > 0:
+            top_interest = interest_winners.iloc[0]
+            insights.append({
+                'tipo': 'Conteúdo',
+                'titulo': f'Interesse Principal: {top_interest["interest"]}',
+                'descricao': (f'O interesse em {top_interest["interest"]} gera taxa de engajamento de '
+                              f'{top_interest["mean"] * 100:.2f}% contra {top_interest["rest_mean"] * 100:.2f}% '
+                              f'nos demais interesses ({top_interest["n"]} usuários, q = {top_interest["q_value"]:.3f}).'),
+                'recomendacao': f'Aumente a produção de conteúdo relacionado a {top_interest["interest"]}.',
+                'prioridade': 'Alta'
+            })
         
-        insights.append({
-            'tipo': 'Conteúdo',
-            'titulo': f'Interesse Principal: {top_interest}',
-            'descricao': f'O interesse em {top_interest} gera a maior taxa de engajamento ({top_interest_rate:.2f}%).',
-            'recomendacao': f'Aumente a produção de conteúdo relacionado a {top_interest}.',
-            'prioridade': 'Alta'
-        })
+        # Insight 5: Combinação de segmentos com engajamento significativamente maior
+        for dimensions in SEGMENT_TESTING_CONFIG['dimension_sets']:
+            if len(dimensions) < 2:
+                continue
+            winners = significant_winners(segment_tests, dimensions)
+            if len(winners) > 0:
+                top_segment = winners.iloc[0]
+                insights.append({
+                    'tipo': 'Demográfico',
+                    'titulo': f'Segmento de Destaque: {top_segment["segment"]}',
+                    'descricao': (f'O segmento {top_segment["segment"]} ({top_segment["dimensions"]}) tem taxa de '
+                                  f'engajamento de {top_segment["mean"] * 100:.2f}% contra '
+                                  f'{top_segment["rest_mean"] * 100:.2f}% no restante do público '
+                                  f'({top_segment["n"]} usuários, q = {top_segment["q_value"]:.3f}).'),
+                    'recomendacao': f'Crie campanhas segmentadas para {top_segment["segment"]}.',
+                    'prioridade': 'Média'
+                })
         
         return insights
     
@@ -141,7 +218,7 @@ class InsightsGenerator:
         insights = []
         
         # Insight 1: Tipo de campanha mais eficaz
-        campaign_roi = self.campaign_data.groupby('campaign_type')['roi'].mean().sort_values(ascending=False)
+        campaign_roi = self.aggregates.get('roi_by_campaign_type').sort_values(ascending=False)
         best_campaign_type = campaign_roi.index[0]
         best_roi = campaign_roi.iloc[0]
         
@@ -154,7 +231,7 @@ class InsightsGenerator:
         })
         
         # Insight 2: Plataforma com melhor ROI
-        platform_roi = self.campaign_data.groupby('platform')['roi'].mean().sort_values(ascending=False)
+        platform_roi = self.aggregates.get('roi_by_platform').sort_values(ascending=False)
         best_platform = platform_roi.index[0]
         best_platform_roi = platform_roi.iloc[0]
         
@@ -167,8 +244,9 @@ class InsightsGenerator:
         })
         
         # Insight 3: Análise de custo-benefício
-        self.campaign_data['cost_per_conversion'] = self.campaign_data['cost'] / self.campaign_data['conversions']
-        cost_efficiency = self.campaign_data.groupby('platform')['cost_per_conversion'].mean().sort_values()
+        # (calculado sem alterar self.campaign_data, que pode ser lido em paralelo)
+        cost_per_conversion = self.campaign_data['cost'] / self.campaign_data['conversions']
+        cost_efficiency = cost_per_conversion.groupby(self.campaign_data['platform']).mean().sort_values()
         most_efficient = cost_efficiency.index[0]
         lowest_cost = cost_efficiency.iloc[0]
         
@@ -239,25 +317,70 @@ class InsightsGenerator:
         
         return insights
     
+    def generate_recent_insights(self):
+        """Gera insights sobre a variação do mês mais recente em relação ao anterior
+        
+        Lê apenas as duas partições de data mais recentes de platform_data,
+        de modo que alterações em meses anteriores não invalidam esta família.
+        """
+        insights = []
+        
+        count = self.INSIGHT_FAMILIES['recent']['partitions']['platform_data']
+        recent = self.platform_data[recent_partition_mask(self.platform_data['date'], count)]
+        periods = recent['date'].dt.to_period(INSIGHTS_CONFIG['partition_freq'])
+        if periods.nunique() < 2:
+            return insights
+        
+        previous, latest = sorted(periods.unique())[-2:]
+        mean_engagement = recent.groupby(['platform', periods])['engagement'].mean().unstack()
+        threshold = INSIGHTS_CONFIG['recent_change_threshold']
+        
+        for platform, engagement in mean_engagement.iterrows():
+            if not engagement[previous] > 0 or pd.isna(engagement[latest]):
+                continue
+            change = (engagement[latest] / engagement[previous] - 1) * 100
+            
+            if change >= threshold:
+                insights.append({
+                    'tipo': 'Tendência',
+                    'titulo': f'Engajamento em Alta no {platform}',
+                    'descricao': (f'O engajamento médio diário no {platform} em {latest.strftime("%m/%Y")} '
+                                  f'foi {change:.1f}% maior que em {previous.strftime("%m/%Y")}.'),
+                    'recomendacao': 'Identifique os conteúdos do último mês com melhor desempenho e repita os formatos.',
+                    'prioridade': 'Média'
+                })
+            elif change <= -threshold:
+                insights.append({
+                    'tipo': 'Tendência',
+                    'titulo': f'Queda Recente de Engajamento no {platform}',
+                    'descricao': (f'O engajamento médio diário no {platform} em {latest.strftime("%m/%Y")} '
+                                  f'foi {-change:.1f}% menor que em {previous.strftime("%m/%Y")}.'),
+                    'recomendacao': 'Compare os posts do último mês com os do mês anterior e revise frequência e formatos.',
+                    'prioridade': 'Alta'
+                })
+        
+        return insights
+    
     def generate_content_insights(self):
         """Gera insights sobre conteúdo"""
         insights = []
         
-        # Insight 1: Melhor horário para posts (simulado)
-        # Como não temos dados de horário, vamos simular baseado no engajamento
-        platform_data_with_hour = self.platform_data.copy()
-        platform_data_with_hour['hour'] = np.random.randint(6, 23, len(platform_data_with_hour))
+        # Insight 1: Melhor horário para posts (requer dados de posts com horário)
+        matrix = self.get_posting_time_matrix()
+        best_slot = matrix.best_slot(min_posts=3) if matrix is not None else None
         
-        hourly_engagement = platform_data_with_hour.groupby('hour')['engagement'].mean()
-        best_hour = hourly_engagement.idxmax()
-        
-        insights.append({
-            'tipo': 'Conteúdo',
-            'titulo': f'Melhor Horário: {best_hour}h',
-            'descricao': f'O horário das {best_hour}h apresenta o maior engajamento médio.',
-            'recomendacao': f'Agende posts principais para as {best_hour}h para maximizar o alcance.',
-            'prioridade': 'Média'
-        })
+        if best_slot is not None:
+            best_day, best_hour, best_slot_engagement = best_slot
+            overall_hour, _ = matrix.best_hour()
+            
+            insights.append({
+                'tipo': 'Conteúdo',
+                'titulo': f'Melhor Horário: {best_day} às {best_hour}h',
+                'descricao': (f'Posts publicados {best_day.lower()} às {best_hour}h têm o maior engajamento médio '
+                              f'({best_slot_engagement:,.0f}); considerando todos os dias, o melhor horário é {overall_hour}h.'),
+                'recomendacao': f'Agende posts principais para as {overall_hour}h e reserve conteúdos de destaque para {best_day.lower()} às {best_hour}h.',
+                'prioridade': 'Média'
+            })
         
         # Insight 2: Tipo de interação mais comum
         total_likes = self.platform_data['likes'].sum()
@@ -283,19 +406,141 @@ class InsightsGenerator:
         
         return insights
     
-    def generate_all_insights(self):
-        """Gera todos os insights"""
-        all_insights = []
+    def get_posting_time_matrix(self):
+        """Retorna a matriz dia da semana × hora dos posts (None sem dados de posts)"""
+        if self.post_data is None:
+            return None
+        if self._posting_time_matrix is None:
+            self._posting_time_matrix = PostingTimeMatrix.from_frame(self.post_data)
+        return self._posting_time_matrix
+    
+    def get_audience_profiles(self):
+        """Retorna o perfil dos clusters de público (calculado uma única vez)"""
+        if self._audience_profiles is None:
+            self._audience_profiles = AudienceSegmenter().fit(self.demographic_data).profiles
+        return self._audience_profiles
+    
+    def generate_audience_insights(self):
+        """Gera insights a partir da segmentação de público"""
+        insights = []
+        profiles = self.get_audience_profiles()
+        
+        # Insight 1: Segmento mais engajado (perfis já ordenados por engajamento)
+        top_segment = profiles.iloc[0]
+        insights.append({
+            'tipo': 'Segmentação',
+            'titulo': f'Segmento Mais Engajado: {top_segment["age_group"]} - {top_segment["interest"]}',
+            'descricao': (f'O segmento de público {top_segment["age_group"]} ({top_segment["gender"]}), '
+                          f'concentrado em {top_segment["city"]} e interessado em {top_segment["interest"]}, '
+                          f'representa {top_segment["share"]:.1f}% da audiência com engajamento médio de '
+                          f'{top_segment["engagement_rate"] * 100:.2f}%.'),
+            'recomendacao': f'Crie campanhas específicas de {top_segment["interest"]} para o público {top_segment["age_group"]} no {top_segment["platform"]}.',
+            'prioridade': 'Alta'
+        })
         
-        all_insights.extend(self.generate_performance_insights())
-        all_insights.extend(self.generate_demographic_insights())
-        all_insights.extend(self.generate_campaign_insights())
-        all_insights.extend(self.generate_trend_insights())
-        all_insights.extend(self.generate_content_insights())
+        # Insight 2: Maior segmento de público
+        largest_segment = profiles.loc[profiles['size'].idxmax()]
+        if largest_segment['cluster'] != top_segment['cluster']:
+            insights.append({
+                'tipo': 'Segmentação',
+                'titulo': f'Maior Segmento: {largest_segment["age_group"]} - {largest_segment["interest"]}',
+                'descricao': (f'O maior segmento de público ({largest_segment["share"]:.1f}% da audiência) é '
+                              f'formado principalmente por {largest_segment["age_group"]} ({largest_segment["gender"]}) '
+                              f'com engajamento médio de {largest_segment["engagement_rate"] * 100:.2f}%.'),
+                'recomendacao': f'Mantenha conteúdo recorrente de {largest_segment["interest"]} para sustentar o maior segmento.',
+                'prioridade': 'Média'
+            })
+        
+        return insights
+    
+    def generate_rule_insights(self, rules=None):
+        """Gera insights a partir das regras declarativas (INSIGHT_RULES)"""
+        engine = InsightRuleEngine({
+            'platform_data': self.platform_data,
+            'demographic_data': self.demographic_data,
+            'campaign_data': self.campaign_data
+        }, rules)
+        return engine.evaluate()
+    
+    def generate_all_insights(self, parallel=None, max_workers=None):
+        """Gera todos os insights
+        
+        Com parallel=True as famílias de insights são executadas em um pool
+        (threads ou processos, conforme INSIGHTS_CONFIG['executor']). O tempo
+        de cada família fica registrado em self.insight_timings.
+        
+        Com um cache configurado, apenas as famílias cujas tabelas/partições
+        mudaram desde a última geração são recalculadas.
+        """
+        if parallel is None:
+            parallel = INSIGHTS_CONFIG['parallel']
+        
+        # Tabelas substituídas desde a última geração invalidam suas agregações
+        self.aggregates.sync(platform_data=self.platform_data, demographic_data=self.demographic_data,
+                             campaign_data=self.campaign_data)
+        
+        families = list(self.INSIGHT_FAMILIES)
+        results = {}
+        keys = {}
+        
+        if self.cache is not None:
+            tables = {
+                'platform_data': self.platform_data,
+                'demographic_data': self.demographic_data,
+                'campaign_data': self.campaign_data,
+                'post_data': self.post_data
+            }
+            changed = self.cache.update_fingerprints(tables, versions=self.aggregates.versions)
+            
+            # Descartar resultados intermediários de tabelas alteradas
+            for table, partitions in changed.items():
+                if partitions:
+                    for memo in self.TABLE_MEMOS.get(table, []):
+                        setattr(self, memo, None)
+                    if table in self.aggregates.versions:
+                        self.aggregates.invalidate(table)
+            self.cache.remember_sources(tables, self.aggregates.versions)
+            
+            for family in families:
+                declaration = self.INSIGHT_FAMILIES[family]
+                keys[family] = self.cache.family_key(declaration['tables'], [declaration.get('config')],
+                                                     declaration.get('partitions'))
+                cached = self.cache.get(family, keys[family])
+                if cached is not None:
+                    results[family] = (cached, 0.0)
+            
+            self.cache_report = {
+                'changed_partitions': {table: partitions for table, partitions in changed.items() if partitions},
+                'reused': [family for family in families if family in results],
+                'recomputed': [family for family in families if family not in results]
+            }
+        
+        pending = [family for family in families if family not in results]
+        
+        if parallel and len(pending) > 1:
+            if max_workers is None:
+                max_workers = INSIGHTS_CONFIG['max_workers'] or len(pending)
+            executor_class = ProcessPoolExecutor if INSIGHTS_CONFIG['executor'] == 'process' else ThreadPoolExecutor
+            with executor_class(max_workers=max_workers) as executor:
+                futures = {family: executor.submit(_run_insight_family, self, family) for family in pending}
+                results.update({family: future.result() for family, future in futures.items()})
+        else:
+            results.update({family: _run_insight_family(self, family) for family in pending})
+        
+        if self.cache is not None:
+            for family in pending:
+                self.cache.put(family, keys[family], results[family][0])
+        
+        # Combinar na ordem fixa das famílias, independente da ordem de término
+        all_insights = []
+        self.insight_timings = {}
+        for family in families:
+            insights, elapsed = results[family]
+            all_insights.extend(insights)
+            self.insight_timings[family] = elapsed
         
-        # Ordenar por prioridade
-        priority_order = {'Crítica': 1, 'Alta': 2, 'Média': 3, 'Baixa': 4}
-        all_insights.sort(key=lambda x: priority_order.get(x['prioridade'], 5))
+        # Ordenar por prioridade (ordenação estável mantém a ordem das famílias)
+        all_insights.sort(key=lambda x: PRIORITY_ORDER.get(x['prioridade'], 5))
         
         return all_insights
     
@@ -445,9 +690,10 @@ if __name__ == "__main__":
     platform_data = pd.read_csv('data/platform_metrics.csv')
     demographic_data = pd.read_csv('data/demographic_data.csv')
     campaign_data = pd.read_csv('data/campaign_data.csv')
+    post_data = pd.read_csv('data/post_data.csv', parse_dates=['timestamp']) if os.path.exists('data/post_data.csv') else None
     
     # Criar gerador de insights
-    insights_generator = InsightsGenerator(platform_data, demographic_data, campaign_data)
+    insights_generator = InsightsGenerator(platform_data, demographic_data, campaign_data, post_data)
     
     # Gerar insights
     print("=== INSIGHTS AUTOMÁTICOS ===\n")
@@ -0,0 +1,114 @@
+"""
+Análise de horários de postagem (matriz dia da semana × hora)
+"""
+
+import pandas as pd
+import numpy as np
+
+DAY_NAMES = ['Segunda', 'Terça', 'Quarta', 'Quinta', 'Sexta', 'Sábado', 'Domingo']
+
+N_SLOTS = 7 * 24
+
+class PostingTimeMatrix:
+    """Acumula engajamento por dia da semana × hora com binning inteiro
+    
+    Cada evento é convertido em uma chave (dia_da_semana * 24 + hora) usando
+    apenas aritmética inteira sobre o timestamp, e contagens/somas são
+    acumuladas com np.bincount. A matriz pode ser atualizada incrementalmente
+    com novos lotes de eventos ou combinada com outra matriz.
+    """
+    
+    def __init__(self):
+        self.counts = np.zeros(N_SLOTS, dtype=np.int64)
+        self.sums = np.zeros(N_SLOTS, dtype=np.float64)
+    
+    @staticmethod
+    def to_datetime64(timestamps):
+        """Timestamps como datetime64[s] no horário local; datas inválidas viram NaT"""
+        if isinstance(timestamps, pd.Series):
+            if not pd.api.types.is_datetime64_any_dtype(timestamps):
+                timestamps = pd.to_datetime(timestamps, errors='coerce')
+            if timestamps.dt.tz is not None:
+                # Usar o horário local (de parede) de cada post
+                timestamps = timestamps.dt.tz_localize(None)
+        return np.asarray(timestamps, dtype='datetime64[s]')
+    
+    @classmethod
+    def slot_keys(cls, timestamps):
+        """Converte timestamps em chaves dia_da_semana * 24 + hora (segunda = 0)
+        
+        Não aceita NaT (a chave resultante seria inválida); update remove
+        essas linhas antes de calcular as chaves.
+        """
+        seconds = cls.to_datetime64(timestamps).astype(np.int64)
+        hours = np.floor_divide(seconds, 3600)
+        # 01/01/1970 foi uma quinta-feira (dia 3 com segunda = 0)
+        day_of_week = (np.floor_divide(hours, 24) + 3) % 7
+        return day_of_week * 24 + hours % 24
+    
+    def update(self, timestamps, values):
+        """Adiciona um lote de eventos (timestamps e engajamento de cada um)
+        
+        Eventos sem data (NaT, inclusive datas que não puderam ser lidas) ou
+        sem engajamento são ignorados, como no groupby(...).mean().
+        """
+        timestamps = self.to_datetime64(timestamps)
+        values = np.asarray(values, dtype=np.float64)
+        valid = ~np.isnat(timestamps) & ~np.isnan(values)
+        if not valid.all():
+            timestamps, values = timestamps[valid], values[valid]
+        keys = self.slot_keys(timestamps)
+        self.counts += np.bincount(keys, minlength=N_SLOTS)
+        self.sums += np.bincount(keys, weights=values, minlength=N_SLOTS)
+        return self
+    
+    def merge(self, other):
+        """Combina os acumuladores de outra matriz nesta"""
+        self.counts += other.counts
+        self.sums += other.sums
+        return self
+    
+    @classmethod
+    def from_frame(cls, df, time_column='timestamp', value_column='engagement', chunk_size=10_000_000):
+        """Cria a matriz a partir de um DataFrame, processando em blocos"""
+        matrix = cls()
+        for start in range(0, len(df), chunk_size):
+            chunk = df.iloc[start:start + chunk_size]
+            matrix.update(chunk[time_column], chunk[value_column])
+        return matrix
+    
+    def mean_matrix(self):
+        """Engajamento médio por slot (7 × 24, NaN onde não há posts)"""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            means = np.where(self.counts > 0, self.sums / self.counts, np.nan)
+        return means.reshape(7, 24)
+    
+    def to_frame(self):
+        """Matriz de engajamento médio com dias nas linhas e horas nas colunas"""
+        return pd.DataFrame(self.mean_matrix(), index=DAY_NAMES, columns=range(24))
+    
+    def best_slot(self, min_posts=1):
+        """Retorna (dia, hora, engajamento médio) do melhor slot com ao menos min_posts"""
+        means = np.where(self.counts >= min_posts, self.mean_matrix().ravel(), np.nan)
+        if np.all(np.isnan(means)):
+            return None
+        key = int(np.nanargmax(means))
+        return DAY_NAMES[key // 24], key % 24, means[key]
+    
+    def best_hour(self):
+        """Retorna (hora, engajamento médio) considerando todos os dias"""
+        counts = self.counts.reshape(7, 24).sum(axis=0)
+        if counts.sum() == 0:
+            return None
+        with np.errstate(divide='ignore', invalid='ignore'):
+            means = np.where(counts > 0, self.sums.reshape(7, 24).sum(axis=0) / counts, np.nan)
+        hour = int(np.nanargmax(means))
+        return hour, means[hour]
+
+def build_posting_matrices(post_data, time_column='timestamp', value_column='engagement'):
+    """Cria uma matriz por plataforma e uma combinada ('all')"""
+    matrices = {'all': PostingTimeMatrix()}
+    for platform, platform_posts in post_data.groupby('platform', sort=False):
+        matrices[platform] = PostingTimeMatrix().update(platform_posts[time_column], platform_posts[value_column])
+        matrices['all'].merge(matrices[platform])
+    return matrices
@@ -0,0 +1,261 @@
+"""
+Motor de regras declarativas para geração de insights por segmento
+"""
+
+import ast
+import operator
+import string
+import pandas as pd
+import numpy as np
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from config import INSIGHT_RULES
+
+# Agregações permitidas nas expressões de métrica
+AGGREGATIONS = ('sum', 'mean', 'min', 'max', 'std', 'count')
+
+# Funções numéricas permitidas nas expressões de métrica
+FUNCTIONS = {'abs': np.abs, 'log': np.log, 'sqrt': np.sqrt}
+
+OPERATORS = {
+    '>': operator.gt,
+    '>=': operator.ge,
+    '<': operator.lt,
+    '<=': operator.le
+}
+
+_ALLOWED_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.Name, ast.Constant, ast.Load,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow, ast.USub, ast.UAdd, ast.Call
+)
+
+class _MetricCompiler(ast.NodeTransformer):
+    """Troca chamadas como sum(engagement) por nomes de colunas agregadas"""
+    
+    def __init__(self):
+        self.aggregates = set()
+        self.global_aggregates = set()
+    
+    def visit_Call(self, node):
+        if not isinstance(node.func, ast.Name):
+            raise ValueError("Expressão de métrica inválida: chamada não suportada")
+        
+        name = node.func.id
+        if name in FUNCTIONS:
+            node.args = [self.visit(arg) for arg in node.args]
+            return node
+        
+        is_global = name.startswith('global_')
+        aggregation = name[len('global_'):] if is_global else name
+        if aggregation not in AGGREGATIONS:
+            raise ValueError(f"Agregação desconhecida na expressão de métrica: {name}")
+        
+        if aggregation == 'count':
+            column = None
+        elif len(node.args) == 1 and isinstance(node.args[0], ast.Name):
+            column = node.args[0].id
+        else:
+            raise ValueError(f"{name}() espera exatamente uma coluna")
+        
+        key = (aggregation, column)
+        (self.global_aggregates if is_global else self.aggregates).add(key)
+        alias = _alias(key, is_global)
+        return ast.copy_location(ast.Name(id=alias, ctx=ast.Load()), node)
+    
+    def visit_Name(self, node):
+        if node.id not in FUNCTIONS:
+            raise ValueError(
+                f"Coluna '{node.id}' usada fora de uma agregação na expressão de métrica"
+            )
+        return node
+
+def _alias(key, is_global=False):
+    aggregation, column = key
+    prefix = 'global__' if is_global else ''
+    return f"{prefix}{aggregation}__{column or 'rows'}"
+
+def compile_metric(expression):
+    """Compila uma expressão de métrica e retorna (código, agregações, agregações globais)"""
+    tree = ast.parse(expression, mode='eval')
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_NODES):
+            raise ValueError(f"Construção não permitida na expressão de métrica: {expression}")
+    
+    compiler = _MetricCompiler()
+    tree = ast.fix_missing_locations(compiler.visit(tree))
+    code = compile(tree, f'<metrica: {expression}>', 'eval')
+    return code, compiler.aggregates, compiler.global_aggregates
+
+class InsightRule:
+    """Regra declarativa de insight avaliada sobre todos os segmentos de uma tabela"""
+    
+    def __init__(self, definition):
+        self.name = definition['name']
+        self.table = definition['table']
+        self.dimensions = list(definition.get('dimensions', []))
+        self.metric = definition['metric']
+        self.operator = definition.get('operator', '>')
+        self.threshold = definition['threshold']
+        self.min_count = definition.get('min_count', 1)
+        self.max_matches = definition.get('max_matches', 3)
+        self.priority = definition.get('prioridade', 'Média')
+        self.templates = {
+            'tipo': definition.get('tipo', 'Segmento'),
+            'titulo': definition['titulo'],
+            'descricao': definition['descricao'],
+            'recomendacao': definition['recomendacao']
+        }
+        
+        if self.operator not in OPERATORS:
+            raise ValueError(f"Operador inválido na regra '{self.name}': {self.operator}")
+        
+        # Os templates só podem usar as dimensões do segmento, {valor} e {amostras}
+        fields = set(self.dimensions) | {'valor', 'amostras'}
+        for template in self.templates.values():
+            for _, field, _, _ in string.Formatter().parse(template):
+                if field is not None and field.split('.')[0].split('[')[0] not in fields:
+                    raise ValueError(f"Campo '{{{field}}}' desconhecido no template da regra '{self.name}'")
+        
+        self.code, self.aggregates, self.global_aggregates = compile_metric(self.metric)
+    
+    def evaluate(self, namespace):
+        """Avalia a métrica de forma vetorizada e retorna (valores, máscara de match)"""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            values = np.asarray(eval(self.code, {'__builtins__': {}}, namespace), dtype=float)
+            values = np.broadcast_to(values, namespace['count__rows'].shape)
+            mask = OPERATORS[self.operator](values, self.threshold)
+        mask &= np.isfinite(values) & (namespace['count__rows'] >= self.min_count)
+        return values, mask
+
+class InsightRuleEngine:
+    """Avalia regras de insight em lote, uma agregação por tabela e conjunto de dimensões"""
+    
+    def __init__(self, tables, rules=None):
+        self.tables = tables
+        definitions = INSIGHT_RULES if rules is None else rules
+        self.rules = [rule if isinstance(rule, InsightRule) else InsightRule(rule)
+                      for rule in definitions]
+        self._codes = {}
+    
+    def _factorize(self, table, column):
+        """Códigos inteiros de uma dimensão (calculados uma vez por tabela)"""
+        key = (table, column)
+        if key not in self._codes:
+            self._codes[key] = pd.factorize(self.tables[table][column], sort=True)
+        return self._codes[key]
+    
+    def _aggregate(self, table, dimensions, aggregates):
+        """Calcula todas as agregações necessárias em uma única passada
+        
+        As dimensões são convertidas em uma chave inteira combinada e as
+        somas/contagens de cada segmento são obtidas com np.bincount.
+        """
+        df = self.tables[table]
+        
+        if dimensions:
+            factorized = [self._factorize(table, dimension) for dimension in dimensions]
+            shape = tuple(len(uniques) for _, uniques in factorized)
+            codes = [codes for codes, _ in factorized]
+            # Linhas com dimensão nula (código -1) não pertencem a nenhum segmento
+            valid = np.logical_and.reduce([code >= 0 for code in codes])
+            if not valid.all():
+                codes = [code[valid] for code in codes]
+                df = df[valid]
+            keys = np.ravel_multi_index(codes, shape)
+            size = int(np.prod(shape))
+        else:
+            keys = np.zeros(len(df), dtype=np.intp)
+            shape, size = (), 1
+        
+        counts = np.bincount(keys, minlength=size)
+        present = np.flatnonzero(counts)
+        
+        result = {}
+        if dimensions:
+            for dimension, index in zip(dimensions, np.unravel_index(present, shape)):
+                result[dimension] = factorized[dimensions.index(dimension)][1][index]
+        # Sem dimensões, a única linha é o total da tabela
+        result['count__rows'] = counts[present]
+        
+        for aggregation, column in aggregates:
+            if aggregation == 'count':
+                continue
+            values = df[column].to_numpy(dtype=float)
+            if aggregation in ('sum', 'mean', 'std'):
+                sums = np.bincount(keys, weights=values, minlength=size)[present]
+                n = counts[present]
+                if aggregation == 'sum':
+                    aggregated = sums
+                elif aggregation == 'mean':
+                    aggregated = sums / n
+                else:
+                    squares = np.bincount(keys, weights=values * values, minlength=size)[present]
+                    with np.errstate(divide='ignore', invalid='ignore'):
+                        aggregated = np.sqrt(np.maximum(squares - sums * sums / n, 0) / (n - 1))
+            else:
+                aggregated = pd.Series(values).groupby(keys).agg(aggregation).to_numpy()
+            result[_alias((aggregation, column))] = aggregated
+        
+        return pd.DataFrame(result)
+    
+    def _global_namespace(self, table, global_aggregates):
+        df = self.tables[table]
+        namespace = {}
+        for aggregation, column in global_aggregates:
+            value = len(df) if aggregation == 'count' else df[column].agg(aggregation)
+            namespace[_alias((aggregation, column), True)] = value
+        return namespace
+    
+    def evaluate(self):
+        """Avalia todas as regras e retorna a lista de insights gerados"""
+        # Agrupar regras que compartilham tabela e dimensões para agregar uma única vez
+        groups = {}
+        for rule in self.rules:
+            groups.setdefault((rule.table, tuple(rule.dimensions)), []).append(rule)
+        
+        matches = {}
+        for (table, dimensions), rules in groups.items():
+            aggregates = set().union(*(rule.aggregates for rule in rules))
+            global_aggregates = set().union(*(rule.global_aggregates for rule in rules))
+            
+            segments = self._aggregate(table, list(dimensions), aggregates)
+            namespace = {column: segments[column].to_numpy() for column in segments.columns
+                         if column not in dimensions}
+            namespace.update(FUNCTIONS)
+            namespace.update(self._global_namespace(table, global_aggregates))
+            
+            for rule in rules:
+                values, mask = rule.evaluate(namespace)
+                matches[rule.name] = self._build_insights(rule, segments, values, mask)
+        
+        # Manter a ordem de definição das regras
+        insights = []
+        for rule in self.rules:
+            insights.extend(matches[rule.name])
+        return insights
+    
+    def _build_insights(self, rule, segments, values, mask):
+        """Formata os templates para os segmentos que satisfazem a regra"""
+        indices = np.flatnonzero(mask)
+        if len(indices) == 0:
+            return []
+        
+        # Segmentos mais extremos primeiro
+        order = np.argsort(values[indices], kind='stable')
+        if rule.operator in ('>', '>='):
+            order = order[::-1]
+        indices = indices[order][:rule.max_matches]
+        
+        insights = []
+        for index in indices:
+            context = {dimension: segments[dimension].iat[index] for dimension in rule.dimensions}
+            context['valor'] = values[index]
+            context['amostras'] = int(segments['count__rows'].iat[index])
+            
+            insight = {key: template.format(**context) for key, template in rule.templates.items()}
+            insight['prioridade'] = rule.priority
+            insight['regra'] = rule.name
+            insights.append(insight)
+        
+        return insights
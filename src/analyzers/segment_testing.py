@@ -0,0 +1,144 @@
+"""
+Testes de significância vetorizados para segmentos de público
+"""
+
+import pandas as pd
+import numpy as np
+from scipy import stats
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from config import SEGMENT_TESTING_CONFIG
+
+def segment_statistics(df, dimensions, metric):
+    """Calcula contagem, soma e soma dos quadrados da métrica por segmento
+    
+    As dimensões são combinadas em uma chave inteira e os acumuladores de
+    todos os segmentos são obtidos com np.bincount em uma única passada.
+    Os valores são centralizados na média global para estabilidade numérica.
+    """
+    factorized = [pd.factorize(df[dimension], sort=True) for dimension in dimensions]
+    codes = [code for code, _ in factorized]
+    shape = tuple(len(uniques) for _, uniques in factorized)
+    
+    valid = np.logical_and.reduce([code >= 0 for code in codes])
+    values = df[metric].to_numpy(dtype=float)
+    valid &= np.isfinite(values)
+    keys = np.ravel_multi_index([code[valid] for code in codes], shape)
+    values = values[valid]
+    
+    center = values.mean() if len(values) else 0.0
+    shifted = values - center
+    size = int(np.prod(shape))
+    
+    counts = np.bincount(keys, minlength=size)
+    present = np.flatnonzero(counts)
+    
+    segments = {}
+    for i, index in enumerate(np.unravel_index(present, shape)):
+        segments[dimensions[i]] = factorized[i][1][index]
+    segments = pd.DataFrame(segments)
+    
+    sums = np.bincount(keys, weights=shifted, minlength=size)[present]
+    squares = np.bincount(keys, weights=shifted * shifted, minlength=size)[present]
+    totals = (len(values), shifted.sum(), (shifted * shifted).sum())
+    
+    return segments, counts[present], sums, squares, totals, center
+
+def _segment_labels(segments):
+    """Rótulos legíveis dos segmentos (ex.: 'Recife / Moda')"""
+    columns = [segments[column].astype(str) for column in segments.columns]
+    labels = columns[0]
+    for column in columns[1:]:
+        labels = labels + ' / ' + column
+    return labels.to_numpy()
+
+def benjamini_hochberg(p_values):
+    """Corrige p-valores pelo método de Benjamini–Hochberg (retorna q-valores)"""
+    p_values = np.asarray(p_values, dtype=float)
+    n = len(p_values)
+    if n == 0:
+        return p_values
+    
+    order = np.argsort(p_values)
+    ranked = p_values[order] * n / np.arange(1, n + 1)
+    # Garantir monotonicidade a partir do maior p-valor
+    ranked = np.minimum.accumulate(ranked[::-1])[::-1]
+    
+    q_values = np.empty(n)
+    q_values[order] = np.minimum(ranked, 1.0)
+    return q_values
+
+def welch_test(counts, sums, squares, totals, center=0.0):
+    """Teste t de Welch de cada segmento contra o restante dos dados
+    
+    Recebe os acumuladores dos segmentos (centralizados) e os totais da
+    tabela; retorna médias, diferença, estatística t, graus de liberdade e
+    p-valor bilateral, todos como arrays.
+    """
+    n_total, sum_total, squares_total = totals
+    n1 = counts.astype(float)
+    n2 = n_total - n1
+    sum2 = sum_total - sums
+    squares2 = squares_total - squares
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean1 = sums / n1
+        mean2 = sum2 / n2
+        var1 = np.maximum(squares - sums * mean1, 0) / (n1 - 1)
+        var2 = np.maximum(squares2 - sum2 * mean2, 0) / (n2 - 1)
+        
+        se1 = var1 / n1
+        se2 = var2 / n2
+        standard_error = np.sqrt(se1 + se2)
+        t_statistic = (mean1 - mean2) / standard_error
+        dof = (se1 + se2) ** 2 / (se1 ** 2 / (n1 - 1) + se2 ** 2 / (n2 - 1))
+    
+    p_values = 2 * stats.t.sf(np.abs(t_statistic), dof)
+    return {
+        'mean': mean1 + center,
+        'rest_mean': mean2 + center,
+        'diff': mean1 - mean2,
+        't': t_statistic,
+        'dof': dof,
+        'p_value': p_values
+    }
+
+def test_segments(df, dimension_sets=None, metric='engagement_rate', alpha=None, min_count=None):
+    """Testa todos os segmentos de cada conjunto de dimensões contra o restante
+    
+    Todos os testes (de todos os conjuntos de dimensões) formam uma única
+    família para a correção de Benjamini–Hochberg. Retorna um DataFrame com
+    uma linha por segmento, ordenado pela diferença de média.
+    """
+    dimension_sets = dimension_sets or SEGMENT_TESTING_CONFIG['dimension_sets']
+    alpha = SEGMENT_TESTING_CONFIG['alpha'] if alpha is None else alpha
+    min_count = SEGMENT_TESTING_CONFIG['min_count'] if min_count is None else min_count
+    
+    results = []
+    for dimensions in dimension_sets:
+        segments, counts, sums, squares, totals, center = segment_statistics(df, list(dimensions), metric)
+        tested = welch_test(counts, sums, squares, totals, center)
+        
+        result = pd.DataFrame({
+            'dimensions': ' × '.join(dimensions),
+            'segment': _segment_labels(segments),
+            'n': counts,
+            **tested
+        })
+        result = pd.concat([segments, result], axis=1)
+        results.append(result[(result['n'] >= min_count) & (result['n'] <= totals[0] - 2)])
+    
+    results = pd.concat(results, ignore_index=True)
+    testable = results['p_value'].notna()
+    results['q_value'] = np.nan
+    results.loc[testable, 'q_value'] = benjamini_hochberg(results.loc[testable, 'p_value'].to_numpy())
+    results['significant'] = results['q_value'] < alpha
+    
+    return results.sort_values('diff', ascending=False).reset_index(drop=True)
+
+def significant_winners(results, dimensions):
+    """Segmentos significativamente acima da média para um conjunto de dimensões"""
+    label = ' × '.join(dimensions)
+    winners = results[(results['dimensions'] == label) & results['significant'] & (results['diff'] > 0)]
+    return winners.sort_values(['q_value', 'diff'], ascending=[True, False])
@@ -0,0 +1,169 @@
+/*
+ * Callbacks do modo de filtragem no navegador (DASHBOARD_CONFIG['filter_mode'] = 'client')
+ *
+ * Os dados chegam uma única vez no Store 'client-data' como arrays colunares
+ * por plataforma, ordenados por data (milissegundos desde 1970, UTC). Os
+ * filtros localizam o intervalo com busca binária e os KPIs, gráficos e a
+ * tabela são calculados aqui, sem requisições ao servidor.
+ */
+(function() {
+    var BREAKDOWN_COLORS = ['#FF6B6B', '#4ECDC4', '#45B7D1'];
+    var BREAKDOWN_TYPES = ['likes', 'comments', 'shares'];
+
+    function toMs(date) {
+        // 'AAAA-MM-DD' ou 'AAAA-MM-DDTHH:MM:SS' -> meia-noite UTC do dia
+        return date ? Date.parse(String(date).slice(0, 10)) : null;
+    }
+
+    function lowerBound(values, target, lo, hi) {
+        while (lo < hi) {
+            var mid = (lo + hi) >>> 1;
+            if (values[mid] < target) { lo = mid + 1; } else { hi = mid; }
+        }
+        return lo;
+    }
+
+    function upperBound(values, target, lo, hi) {
+        while (lo < hi) {
+            var mid = (lo + hi) >>> 1;
+            if (values[mid] <= target) { lo = mid + 1; } else { hi = mid; }
+        }
+        return lo;
+    }
+
+    function formatDate(ms) {
+        // dd/mm/aaaa, como o strftime('%d/%m/%Y') da tabela no servidor
+        var iso = new Date(ms).toISOString();
+        return iso.slice(8, 10) + '/' + iso.slice(5, 7) + '/' + iso.slice(0, 4);
+    }
+
+    function title(text) {
+        return text.charAt(0).toUpperCase() + text.slice(1);
+    }
+
+    function formatNumber(value) {
+        return Math.round(value).toLocaleString('en-US');
+    }
+
+    function sum(values, lo, hi) {
+        var total = 0;
+        for (var i = lo; i < hi; i++) {
+            if (values[i] !== null) { total += values[i]; }
+        }
+        return total;
+    }
+
+    // Fatias [lo, hi) de cada plataforma selecionada que têm linhas no intervalo
+    function slices(filters, clientData) {
+        var names = filters.platform && filters.platform !== 'all'
+            ? [filters.platform] : Object.keys(clientData.platforms);
+        var start = toMs(filters.start_date);
+        var end = toMs(filters.end_date);
+        if (end !== null && clientData.live_end !== null && end >= clientData.live_end) {
+            // Período até o dia mais recente acompanha as linhas recebidas ao vivo
+            end = null;
+        }
+        var result = [];
+        names.forEach(function(name) {
+            var platform = clientData.platforms[name];
+            if (!platform) { return; }
+            var dates = platform.date;
+            var lo = start === null ? 0 : lowerBound(dates, start, 0, dates.length);
+            var hi = end === null ? dates.length : upperBound(dates, end, lo, dates.length);
+            if (hi > lo) {
+                result.push({name: name, platform: platform, lo: lo, hi: hi});
+            }
+        });
+        return result;
+    }
+
+    window.dash_clientside = Object.assign({}, window.dash_clientside, {
+        dashboard: {
+            filter_state: function(platform, startDate, endDate) {
+                return {platform: platform, start_date: startDate, end_date: endDate};
+            },
+
+            kpi_cards: function(filters, clientData) {
+                if (!filters || !clientData) { return window.dash_clientside.no_update; }
+                var followers = 0, engagement = 0, reach = 0;
+                slices(filters, clientData).forEach(function(slice) {
+                    var values = slice.platform.followers;
+                    // Último valor não nulo de seguidores no intervalo
+                    for (var i = slice.hi - 1; i >= slice.lo; i--) {
+                        if (values[i] !== null) { followers += values[i]; break; }
+                    }
+                    engagement += sum(slice.platform.engagement, slice.lo, slice.hi);
+                    reach += sum(slice.platform.reach, slice.lo, slice.hi);
+                });
+                var rate = reach > 0 ? engagement / reach * 100 : 0;
+                return [formatNumber(followers), formatNumber(engagement), rate.toFixed(2) + '%', formatNumber(reach)];
+            },
+
+            main_chart: function(filters, metric, clientData) {
+                if (!filters || !clientData) { return window.dash_clientside.no_update; }
+                var traces = slices(filters, clientData).map(function(slice) {
+                    var size = slice.hi - slice.lo;
+                    return {
+                        type: 'scatter',
+                        x: slice.platform.date.slice(slice.lo, slice.hi),
+                        y: slice.platform[metric].slice(slice.lo, slice.hi),
+                        mode: size <= clientData.max_points ? 'lines+markers' : 'lines',
+                        name: slice.name,
+                        line: {color: slice.platform.color, width: 3},
+                        marker: {size: 6}
+                    };
+                });
+                return {
+                    data: traces,
+                    layout: {
+                        title: {text: 'Evolução de ' + title(metric) + ' por Plataforma (diário)'},
+                        xaxis: {title: {text: 'Data'}, type: 'date'},
+                        yaxis: {title: {text: title(metric)}},
+                        hovermode: 'x unified',
+                        height: 400
+                    }
+                };
+            },
+
+            engagement_breakdown: function(filters, clientData) {
+                if (!filters || !clientData) { return window.dash_clientside.no_update; }
+                // Plataformas em ordem alfabética, como KpiAccumulator.breakdown no servidor
+                var selected = slices(filters, clientData).sort(function(a, b) {
+                    return a.name < b.name ? -1 : (a.name > b.name ? 1 : 0);
+                });
+                var traces = BREAKDOWN_TYPES.map(function(type, i) {
+                    return {
+                        type: 'bar',
+                        x: selected.map(function(slice) { return slice.name; }),
+                        y: selected.map(function(slice) { return sum(slice.platform[type], slice.lo, slice.hi); }),
+                        name: title(type),
+                        marker: {color: BREAKDOWN_COLORS[i]}
+                    };
+                });
+                return {
+                    data: traces,
+                    layout: {title: {text: 'Breakdown de Engajamento'}, barmode: 'stack', height: 400}
+                };
+            },
+
+            data_table: function(filters, clientData) {
+                if (!filters || !clientData) { return window.dash_clientside.no_update; }
+                var records = [];
+                slices(filters, clientData).forEach(function(slice) {
+                    var platform = slice.platform;
+                    for (var i = slice.lo; i < slice.hi; i++) {
+                        records.push({
+                            date: formatDate(platform.date[i]),
+                            platform: slice.name,
+                            followers: platform.followers[i],
+                            impressions: platform.impressions[i],
+                            reach: platform.reach[i],
+                            engagement: platform.engagement[i]
+                        });
+                    }
+                });
+                return records;
+            }
+        }
+    });
+})();
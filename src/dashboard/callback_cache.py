@@ -0,0 +1,153 @@
+"""
+Cache de resultados dos callbacks do dashboard (LRU em memória + disco opcional)
+"""
+
+import functools
+import hashlib
+import pickle
+import threading
+import time
+from collections import OrderedDict
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from config import CALLBACK_CACHE_CONFIG
+
+class CallbackCache:
+    """Memoriza o retorno dos callbacks pela combinação de entradas e versão dos dados
+    
+    O nível em memória é um LRU limitado a max_entries com expiração por
+    ttl segundos. Com cache_dir definido, os resultados também são gravados
+    em disco (pickle, escrita atômica) e podem ser reaproveitados por outros
+    processos/workers que sirvam os mesmos dados; o diretório é limitado a
+    max_disk_bytes, removendo primeiro os arquivos mais antigos.
+    """
+    
+    def __init__(self, max_entries=None, ttl=None, cache_dir=None, max_disk_bytes=None):
+        self.max_entries = max_entries or CALLBACK_CACHE_CONFIG['max_entries']
+        self.ttl = ttl if ttl is not None else CALLBACK_CACHE_CONFIG['ttl']
+        self.cache_dir = cache_dir if cache_dir is not None else CALLBACK_CACHE_CONFIG['cache_dir']
+        self.max_disk_bytes = max_disk_bytes or CALLBACK_CACHE_CONFIG['max_disk_bytes']
+        
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'disk_hits': 0, 'misses': 0}
+        
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+    
+    @staticmethod
+    def make_key(name, version, args, kwargs=None):
+        """Chave estável (hash) para o callback, a versão dos dados e as entradas"""
+        payload = pickle.dumps((name, version, args, sorted((kwargs or {}).items())), protocol=4)
+        return hashlib.sha1(payload).hexdigest()
+    
+    def _disk_path(self, key):
+        return os.path.join(self.cache_dir, f'{key}.pkl')
+    
+    def get(self, key):
+        """Retorna (True, valor) se houver resultado válido; senão (False, None)"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, value = entry
+                if now - stored_at <= self.ttl:
+                    self._entries.move_to_end(key)
+                    self.stats['hits'] += 1
+                    return True, value
+                del self._entries[key]
+        
+        if self.cache_dir:
+            path = self._disk_path(key)
+            try:
+                if now - os.path.getmtime(path) <= self.ttl:
+                    with open(path, 'rb') as f:
+                        value = pickle.load(f)
+                    self._remember(key, value, os.path.getmtime(path))
+                    with self._lock:
+                        self.stats['disk_hits'] += 1
+                    return True, value
+            except (OSError, pickle.UnpicklingError, EOFError):
+                pass
+        
+        with self._lock:
+            self.stats['misses'] += 1
+        return False, None
+    
+    def _remember(self, key, value, stored_at):
+        with self._lock:
+            self._entries[key] = (stored_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def set(self, key, value):
+        """Armazena um resultado em memória (e em disco, se configurado)"""
+        # Figuras são guardadas como dicionários: recriar go.Figure ao ler do disco revalida tudo
+        if isinstance(value, tuple):
+            value = tuple(item.to_plotly_json() if hasattr(item, 'to_plotly_json') else item for item in value)
+        elif hasattr(value, 'to_plotly_json'):
+            value = value.to_plotly_json()
+        self._remember(key, value, time.time())
+        
+        if self.cache_dir:
+            tmp_path = f'{self._disk_path(key)}.{os.getpid()}.{threading.get_ident()}.tmp'
+            try:
+                with open(tmp_path, 'wb') as f:
+                    pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, self._disk_path(key))
+                self._evict_disk()
+            except (OSError, pickle.PicklingError):
+                pass
+    
+    def _evict_disk(self):
+        entries = []
+        now = time.time()
+        for entry in os.scandir(self.cache_dir):
+            if not entry.is_file() or entry.name.endswith('.tmp'):
+                continue
+            stat = entry.stat()
+            if now - stat.st_mtime > self.ttl:
+                self._remove(entry.path)
+            else:
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_disk_bytes:
+                break
+            self._remove(path)
+            total -= size
+    
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+    
+    def clear(self):
+        """Descarta os resultados em memória"""
+        with self._lock:
+            self._entries.clear()
+    
+    def memoize(self, name, version, key_args=None):
+        """Decorador para callbacks: version() retorna a versão atual dos dados
+        
+        Com key_args, apenas os primeiros key_args argumentos posicionais
+        entram na chave (ex.: para ignorar o identificador da sessão).
+        """
+        def decorator(function):
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                key_values = args if key_args is None else args[:key_args]
+                key = self.make_key(name, version(), key_values, kwargs)
+                found, value = self.get(key)
+                if found:
+                    return value
+                value = function(*args, **kwargs)
+                self.set(key, value)
+                return value
+            return wrapper
+        return decorator
@@ -3,7 +3,9 @@ Dashboard interativo para análise de dados de mídias sociais usando Dash
 """
 
 import dash
-from dash import dcc, html, Input, Output, dash_table
+from flask import jsonify
+from dash import dcc, html, Input, Output, State, ClientsideFunction, Patch, dash_table
+from dash.exceptions import PreventUpdate
 import plotly.graph_objects as go
 import plotly.express as px
 from plotly.subplots import make_subplots
@@ -11,29 +13,132 @@ import pandas as pd
 import numpy as np
 import dash_bootstrap_components as dbc
 from datetime import datetime, timedelta
+import uuid
+import threading
+import time
+from collections import deque
 import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
-from config import DASHBOARD_CONFIG, PLATFORMS
+from config import DASHBOARD_CONFIG, PLATFORMS, CALLBACK_CACHE_CONFIG, VISUALIZATION_CONFIG
+from src.analyzers.posting_time import DAY_NAMES, build_posting_matrices
+from src.analyzers.aggregates import AggregateProvider
+from src.dashboard.date_index import PlatformDateIndex
+from src.dashboard.callback_cache import CallbackCache
+from src.dashboard.session_store import FilteredView, SessionViewStore
+from src.dashboard.table_query import query_table
+from src.dashboard.rollups import GRAINS, TimeRollups, choose_grain
+from src.dashboard.live import CsvTailSource, KpiAccumulator
+from src.dashboard.metrics import CallbackMetrics
+from src.dashboard.serialization import configure_json_engine, init_compression
+from src.visualizers.render_cache import hash_inputs
+from src.visualizers.downsampling import downsample_frame, line_mode
+from src.visualizers.visualizations import date_values
+
+# Colunas enviadas ao navegador no modo de filtragem no cliente
+CLIENT_COLUMNS = ['followers', 'impressions', 'reach', 'engagement', 'likes', 'comments', 'shares']
+
+# Opções do filtro de plataforma
+PLATFORM_OPTIONS = [
+    {'label': 'Todas as Plataformas', 'value': 'all'},
+    {'label': 'Instagram', 'value': 'Instagram'},
+    {'label': 'Facebook', 'value': 'Facebook'}
+]
 
 class SocialMediaDashboard:
-    def __init__(self, platform_data, demographic_data, campaign_data):
+    def __init__(self, platform_data, demographic_data, campaign_data, post_data=None, aggregates=None,
+                 callback_cache=None, filter_mode=None, live_source=None):
         self.platform_data = platform_data
         self.demographic_data = demographic_data
         self.campaign_data = campaign_data
+        self.post_data = post_data
+        
+        # Agregações compartilhadas, calculadas uma vez por plataforma selecionada
+        self.aggregates = aggregates or AggregateProvider(platform_data, demographic_data, campaign_data)
+        self.aggregates.sync(platform_data=platform_data, demographic_data=demographic_data, campaign_data=campaign_data)
         
         # Converter colunas de data
         self.platform_data['date'] = pd.to_datetime(self.platform_data['date'])
         self.campaign_data['date'] = pd.to_datetime(self.campaign_data['date'])
         
+        # Linhas ordenadas por plataforma e data para os filtros do dashboard
+        self.platform_index = PlatformDateIndex(self.platform_data)
+        self.rollups = TimeRollups(self.platform_index)
+        
+        # Atualização ao vivo: fonte consultada periodicamente e lotes recentes de linhas novas
+        live_source = live_source or DASHBOARD_CONFIG['live_source']
+        self.live_source = CsvTailSource(live_source) if isinstance(live_source, str) else live_source
+        self.live_rows = 0
+        self.live_batches = deque(maxlen=DASHBOARD_CONFIG['live_max_batches'])
+        self._live_lock = threading.RLock()
+        self._last_poll = time.time()
+        
+        # Modo de filtragem: no navegador para dados pequenos, no servidor para grandes
+        filter_mode = filter_mode or DASHBOARD_CONFIG['filter_mode']
+        if filter_mode == 'auto':
+            filter_mode = 'client' if len(self.platform_data) <= DASHBOARD_CONFIG['clientside_max_rows'] else 'server'
+        self.clientside = filter_mode == 'client'
+        self.client_data = self.client_payload() if self.clientside else None
+        
+        # Fatia filtrada de cada sessão, mantida no servidor
+        self.session_views = SessionViewStore(DASHBOARD_CONFIG['max_session_views'])
+        
+        # Matrizes dia da semana × hora por plataforma (atualizáveis incrementalmente)
+        self.posting_matrices = build_posting_matrices(post_data) if post_data is not None else None
+        
+        # Cache dos callbacks, indexado pelas entradas e pela versão (conteúdo) dos dados
+        self.data_version = hash_inputs(platform_data, demographic_data, campaign_data, post_data)
+        self.callback_cache = callback_cache
+        if self.callback_cache is None and CALLBACK_CACHE_CONFIG['enabled']:
+            self.callback_cache = CallbackCache()
+        
+        # Latência e tamanho das respostas por callback
+        self.metrics = CallbackMetrics()
+        
+        # Figuras que dependem só da plataforma: (gráfico, plataforma) -> figura serializável
+        self.platform_figures = {}
+        self._figures_lock = threading.Lock()
+        if DASHBOARD_CONFIG['precompute_figures']:
+            self.precompute_platform_figures()
+        
+        # Codificador JSON rápido (orjson) para as figuras e tabelas das respostas
+        configure_json_engine()
+        
         # Criar app Dash
+        self.ready = False
         self.app = dash.Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP])
         self.setup_layout()
         self.setup_callbacks()
+        self.setup_health_routes()
+        if DASHBOARD_CONFIG['metrics_enabled']:
+            self.metrics.init_app(self.app.server, DASHBOARD_CONFIG['metrics_local_only'], self.metric_counters)
+        if DASHBOARD_CONFIG['compression']:
+            # Registrada depois das métricas: /metrics registra o tamanho já comprimido
+            init_compression(self.app.server)
+        self.ready = True
     
     def setup_layout(self):
-        """Configura o layout do dashboard"""
-        self.app.layout = dbc.Container([
+        """Configura o layout do dashboard (gerado a cada carregamento da página)"""
+        self.app.layout = self.serve_layout
+    
+    def serve_layout(self):
+        """Layout do dashboard com um identificador de sessão novo"""
+        with self._live_lock:
+            client_data, live_rows = self.client_data, self.live_rows
+        
+        return dbc.Container([
+            # Sessão do navegador e parâmetros do filtro atual (a fatia fica no servidor)
+            dcc.Store(id='session-id', storage_type='session', data=str(uuid.uuid4())),
+            dcc.Store(id='filter-state'),
+            # Largura do gráfico principal no navegador (define a granularidade da série)
+            dcc.Store(id='chart-width'),
+            # Dados colunares para filtrar no navegador (apenas no modo cliente)
+            dcc.Store(id='client-data', data=client_data),
+            # Linhas recebidas ao vivo já exibidas pela sessão
+            dcc.Store(id='live-state', data={'rows': live_rows}),
+            dcc.Interval(id='live-interval', interval=DASHBOARD_CONFIG['live_interval'] * 1000,
+                         disabled=self.live_source is None),
+            
             # Cabeçalho
             dbc.Row([
                 dbc.Col([
@@ -50,11 +155,7 @@ class SocialMediaDashboard:
                     html.Label("Selecionar Plataforma:"),
                     dcc.Dropdown(
                         id='platform-dropdown',
-                        options=[
-                            {'label': 'Todas as Plataformas', 'value': 'all'},
-                            {'label': 'Instagram', 'value': 'Instagram'},
-                            {'label': 'Facebook', 'value': 'Facebook'}
-                        ],
+                        options=PLATFORM_OPTIONS,
                         value='all',
                         clearable=False
                     )
@@ -63,8 +164,8 @@ class SocialMediaDashboard:
                     html.Label("Período:"),
                     dcc.DatePickerRange(
                         id='date-range',
-                        start_date=self.platform_data['date'].min(),
-                        end_date=self.platform_data['date'].max(),
+                        start_date=self.platform_index.earliest_date(),
+                        end_date=self.platform_index.latest_date(),
                         display_format='DD/MM/YYYY'
                     )
                 ], width=4),
@@ -139,6 +240,13 @@ class SocialMediaDashboard:
                 ], width=6)
             ], className="mb-4"),
             
+            # Horários de postagem (apenas com dados de posts)
+            dbc.Row([
+                dbc.Col([
+                    dcc.Graph(id='posting-time-heatmap')
+                ])
+            ], className="mb-4", style={} if self.posting_matrices is not None else {'display': 'none'}),
+            
             # Tabela de dados
             dbc.Row([
                 dbc.Col([
@@ -148,101 +256,247 @@ class SocialMediaDashboard:
                         columns=[
                             {"name": "Data", "id": "date"},
                             {"name": "Plataforma", "id": "platform"},
-                            {"name": "Seguidores", "id": "followers"},
-                            {"name": "Impressões", "id": "impressions"},
-                            {"name": "Alcance", "id": "reach"},
-                            {"name": "Engajamento", "id": "engagement"}
+                            {"name": "Seguidores", "id": "followers", "type": "numeric"},
+                            {"name": "Impressões", "id": "impressions", "type": "numeric"},
+                            {"name": "Alcance", "id": "reach", "type": "numeric"},
+                            {"name": "Engajamento", "id": "engagement", "type": "numeric"}
                         ],
+                        page_current=0,
                         page_size=10,
+                        sort_mode='multi',
+                        sort_by=[],
+                        filter_query='',
+                        **self.table_actions(),
                         style_cell={'textAlign': 'left'},
                         style_header={'backgroundColor': 'rgb(230, 230, 230)', 'fontWeight': 'bold'}
                     )
                 ])
-            ])
+            ]),
+            
+            # Painel de depuração: latência e tamanho das respostas por callback
+            *self.metrics_panel()
             
         ], fluid=True)
     
     def setup_callbacks(self):
         """Configura os callbacks do dashboard"""
         
+        # Medida no navegador ao carregar a página
+        self.app.clientside_callback(
+            """
+            function(sessionId) {
+                var chart = document.getElementById('main-metric-chart');
+                return (chart && chart.offsetWidth) || window.innerWidth;
+            }
+            """,
+            Output('chart-width', 'data'),
+            Input('session-id', 'data')
+        )
+        
+        # Callbacks que dependem do filtro de plataforma/período
+        if self.clientside:
+            self.setup_clientside_callbacks()
+        else:
+            self.setup_server_callbacks()
+        if self.live_source is not None:
+            self.setup_live_callbacks()
+        
+        if self.metrics_panel():
+            @self.app.callback(
+                Output('metrics-panel', 'children'),
+                Input('metrics-interval', 'n_intervals')
+            )
+            def update_metrics_panel(n_intervals):
+                summary = self.metrics.summary()
+                if not summary:
+                    return html.P("Nenhum callback executado ainda.", className="text-muted")
+                return dbc.Table.from_dataframe(pd.DataFrame(summary), striped=True, bordered=True, size='sm')
+        
+        @self.app.callback(
+            Output('demographic-chart', 'figure'),
+            [Input('platform-dropdown', 'value')]
+        )
+        @self._instrument('update_demographic_chart')
+        def update_demographic_chart(platform):
+            return self.platform_figure('demographic', platform)
+        
+        @self.app.callback(
+            Output('campaign-performance', 'figure'),
+            [Input('platform-dropdown', 'value')]
+        )
+        @self._instrument('update_campaign_chart')
+        def update_campaign_chart(platform):
+            return self.platform_figure('campaign', platform)
+        
+        @self.app.callback(
+            Output('posting-time-heatmap', 'figure'),
+            [Input('platform-dropdown', 'value')]
+        )
+        @self._instrument('update_posting_time_heatmap')
+        def update_posting_time_heatmap(platform):
+            return self.platform_figure('posting_heatmap', platform)
+    
+    def demographic_figure(self, platform):
+        """Distribuição por faixa etária"""
+        age_dist = self.aggregates.get('age_distribution', platform).reset_index(name='count')
+        
+        return px.pie(age_dist, values='count', names='age_group', 
+                      title='Distribuição por Faixa Etária')
+    
+    def campaign_figure(self, platform):
+        """ROI por tipo de campanha"""
+        roi_data = self.aggregates.get('roi_by_campaign_type', platform).reset_index()
+        
+        return px.bar(roi_data, x='campaign_type', y='roi',
+                      title='ROI Médio por Tipo de Campanha',
+                      color='roi', color_continuous_scale='Viridis')
+    
+    def posting_heatmap_figure(self, platform):
+        """Engajamento médio por dia da semana e horário"""
+        if self.posting_matrices is None:
+            return go.Figure()
+        
+        matrix = self.posting_matrices.get(platform)
+        if matrix is None:
+            return go.Figure()
+        
+        fig = go.Figure(go.Heatmap(
+            z=matrix.mean_matrix(),
+            x=[f'{hour}h' for hour in range(24)],
+            y=DAY_NAMES,
+            colorscale='YlOrRd',
+            colorbar=dict(title='Engajamento')
+        ))
+        
+        fig.update_layout(
+            title='Engajamento Médio por Dia da Semana e Horário',
+            yaxis=dict(autorange='reversed'),
+            height=350
+        )
+        
+        return fig
+    
+    def platform_figure(self, name, platform):
+        """Figura de um gráfico que depende só da plataforma, gerada uma vez
+        
+        Esses gráficos usam dados demográficos, de campanhas e de posts, que
+        não mudam com a atualização ao vivo; cada combinação é construída no
+        máximo uma vez e reaproveitada por todas as sessões já como dicionário,
+        sem refazer a agregação nem a validação da figura do Plotly.
+        """
+        key = (name, platform)
+        figure = self.platform_figures.get(key)
+        if figure is None:
+            builder = {
+                'demographic': self.demographic_figure,
+                'campaign': self.campaign_figure,
+                'posting_heatmap': self.posting_heatmap_figure
+            }[name]
+            with self.metrics.phase():
+                figure = builder(platform).to_plotly_json()
+            with self._figures_lock:
+                figure = self.platform_figures.setdefault(key, figure)
+        return figure
+    
+    def precompute_platform_figures(self):
+        """Gera na inicialização os gráficos de todas as opções do filtro de plataforma"""
+        for option in PLATFORM_OPTIONS:
+            for name in ('demographic', 'campaign', 'posting_heatmap'):
+                self.platform_figure(name, option['value'])
+    
+    def setup_server_callbacks(self):
+        """Filtros calculados no servidor: uma view por interação, mantida por sessão"""
+        
+        @self.app.callback(
+            Output('filter-state', 'data'),
+            [Input('platform-dropdown', 'value'),
+             Input('date-range', 'start_date'),
+             Input('date-range', 'end_date')],
+            State('session-id', 'data')
+        )
+        @self._instrument('update_filter_state')
+        def update_filter_state(platform, start_date, end_date, session_id):
+            # Só normaliza os filtros: a view é criada no primeiro callback que não
+            # for servido do cache (get_view), e uma interação atendida inteira pelo
+            # cache não filtra nem agrega nada
+            filters = {'platform': platform, 'start_date': start_date, 'end_date': end_date}
+            if self.live_source is not None and end_date and pd.Timestamp(end_date) >= self.latest_date():
+                # Período até o dia mais recente acompanha os dados que chegarem
+                filters['end_date'] = None
+            return filters
+        
         @self.app.callback(
             [Output('total-followers', 'children'),
              Output('total-engagement', 'children'),
              Output('avg-engagement-rate', 'children'),
              Output('total-reach', 'children')],
-            [Input('platform-dropdown', 'value'),
-             Input('date-range', 'start_date'),
-             Input('date-range', 'end_date')]
+            Input('filter-state', 'data'),
+            State('session-id', 'data')
         )
-        def update_kpi_cards(platform, start_date, end_date):
-            # Filtrar dados
-            filtered_data = self.filter_data(platform, start_date, end_date)
-            
-            # Calcular KPIs
-            total_followers = filtered_data.groupby('platform')['followers'].last().sum()
-            total_engagement = filtered_data['engagement'].sum()
-            total_reach = filtered_data['reach'].sum()
-            avg_engagement_rate = (total_engagement / total_reach * 100) if total_reach > 0 else 0
-            
-            return (
-                f"{total_followers:,.0f}",
-                f"{total_engagement:,.0f}",
-                f"{avg_engagement_rate:.2f}%",
-                f"{total_reach:,.0f}"
-            )
+        @self._instrument('update_kpi_cards')
+        @self._memoize('update_kpi_cards', key_args=1)
+        def update_kpi_cards(filters, session_id):
+            return self.format_kpis(self.get_view(session_id, filters).kpis)
         
         @self.app.callback(
-            Output('main-metric-chart', 'figure'),
-            [Input('platform-dropdown', 'value'),
-             Input('date-range', 'start_date'),
-             Input('date-range', 'end_date'),
-             Input('metric-dropdown', 'value')]
+            [Output('main-metric-chart', 'figure'),
+             Output('live-state', 'data')],
+            [Input('filter-state', 'data'),
+             Input('metric-dropdown', 'value'),
+             Input('chart-width', 'data')],
+            State('session-id', 'data')
         )
-        def update_main_chart(platform, start_date, end_date, metric):
-            filtered_data = self.filter_data(platform, start_date, end_date)
+        @self._instrument('update_main_chart')
+        @self._memoize('update_main_chart', key_args=3)
+        def update_main_chart(filters, metric, chart_width, session_id):
+            view = self.get_view(session_id, filters)
+            grain = self.chart_grain(view, chart_width)
             
             fig = go.Figure()
             
-            for platform_name in filtered_data['platform'].unique():
-                platform_data = filtered_data[filtered_data['platform'] == platform_name]
-                platform_data = platform_data.sort_values('date')
+            for platform_name, platform_data in view.series.items():
+                if grain != 'D':
+                    # Séries semanais/mensais lidas das agregações pré-calculadas
+                    with self.metrics.phase():
+                        platform_data = self.rollups.series(platform_name, metric, grain, filters['start_date'], filters['end_date'])
+                mode = line_mode(len(platform_data))
+                platform_data = downsample_frame(platform_data, 'date', metric)
                 
                 color = PLATFORMS[platform_name.lower()]['color']
                 
+                # Datas em ms (float64) seguem como typed array, menores que texto ISO
                 fig.add_trace(go.Scatter(
-                    x=platform_data['date'],
+                    x=date_values(platform_data['date']),
                     y=platform_data[metric],
-                    mode='lines+markers',
+                    mode=mode,
                     name=platform_name,
                     line=dict(color=color, width=3),
                     marker=dict(size=6)
                 ))
             
             fig.update_layout(
-                title=f'Evolução de {metric.title()} por Plataforma',
+                title=f'Evolução de {metric.title()} por Plataforma ({GRAINS[grain]["label"]})',
                 xaxis_title='Data',
+                xaxis_type='date',
                 yaxis_title=metric.title(),
                 hovermode='x unified',
                 height=400
             )
             
-            return fig
+            # O gráfico define a partir de quais linhas a atualização ao vivo continua
+            live_state = self.live_state(view) if self.live_source is not None else dash.no_update
+            return fig, live_state
         
         @self.app.callback(
             Output('engagement-breakdown', 'figure'),
-            [Input('platform-dropdown', 'value'),
-             Input('date-range', 'start_date'),
-             Input('date-range', 'end_date')]
+            Input('filter-state', 'data'),
+            State('session-id', 'data')
         )
-        def update_engagement_breakdown(platform, start_date, end_date):
-            filtered_data = self.filter_data(platform, start_date, end_date)
-            
-            # Calcular breakdown de engajamento
-            engagement_breakdown = filtered_data.groupby('platform').agg({
-                'likes': 'sum',
-                'comments': 'sum',
-                'shares': 'sum'
-            }).reset_index()
+        @self._instrument('update_engagement_breakdown')
+        @self._memoize('update_engagement_breakdown', key_args=1)
+        def update_engagement_breakdown(filters, session_id):
+            # Breakdown de engajamento já agregado na view
+            engagement_breakdown = self.get_view(session_id, filters).breakdown
             
             fig = go.Figure()
             
@@ -266,72 +520,425 @@ class SocialMediaDashboard:
             return fig
         
         @self.app.callback(
-            Output('demographic-chart', 'figure'),
-            [Input('platform-dropdown', 'value')]
+            [Output('data-table', 'data'),
+             Output('data-table', 'page_count'),
+             Output('data-table', 'page_current')],
+            [Input('filter-state', 'data'),
+             Input('data-table', 'page_current'),
+             Input('data-table', 'page_size'),
+             Input('data-table', 'sort_by'),
+             Input('data-table', 'filter_query')],
+            State('session-id', 'data')
         )
-        def update_demographic_chart(platform):
-            if platform == 'all':
-                demo_data = self.demographic_data
-            else:
-                demo_data = self.demographic_data[self.demographic_data['platform'] == platform]
-            
-            # Distribuição por faixa etária
-            age_dist = demo_data.groupby('age_group').size().reset_index(name='count')
-            
-            fig = px.pie(age_dist, values='count', names='age_group', 
-                        title='Distribuição por Faixa Etária')
+        @self._instrument('update_data_table')
+        @self._memoize('update_data_table', key_args=5)
+        def update_data_table(filters, page_current, page_size, sort_by, filter_query, session_id):
+            filtered_data = self.get_view(session_id, filters).data
+            columns = ['date', 'platform', 'followers', 'impressions', 'reach', 'engagement']
             
-            return fig
-        
-        @self.app.callback(
-            Output('campaign-performance', 'figure'),
-            [Input('platform-dropdown', 'value')]
-        )
-        def update_campaign_chart(platform):
-            if platform == 'all':
-                campaign_data = self.campaign_data
-            else:
-                campaign_data = self.campaign_data[self.campaign_data['platform'] == platform]
+            page_size = page_size or 10
+            with self.metrics.phase():
+                page, total = query_table(filtered_data[columns], page_current, page_size, sort_by, filter_query)
             
-            # ROI por tipo de campanha
-            roi_data = campaign_data.groupby('campaign_type')['roi'].mean().reset_index()
+            # Manter a página dentro do total após mudanças de filtro
+            page_count = max(-(-total // page_size), 1)
+            if (page_current or 0) >= page_count:
+                page_current = page_count - 1
+                with self.metrics.phase():
+                    page, total = query_table(filtered_data[columns], page_current, page_size, sort_by, filter_query)
             
-            fig = px.bar(roi_data, x='campaign_type', y='roi',
-                        title='ROI Médio por Tipo de Campanha',
-                        color='roi', color_continuous_scale='Viridis')
+            # Formatar apenas as linhas da página
+            table_data = page.copy()
+            table_data['date'] = table_data['date'].dt.strftime('%d/%m/%Y')
             
-            return fig
+            return table_data.to_dict('records'), page_count, page_current or 0
+    
+    def setup_clientside_callbacks(self):
+        """Filtros calculados no navegador (assets/clientside.js) sobre o Store client-data
         
-        @self.app.callback(
-            Output('data-table', 'data'),
+        Os callbacks também rodam quando client-data recebe linhas novas (modo ao vivo).
+        """
+        
+        self.app.clientside_callback(
+            ClientsideFunction(namespace='dashboard', function_name='filter_state'),
+            Output('filter-state', 'data'),
             [Input('platform-dropdown', 'value'),
              Input('date-range', 'start_date'),
              Input('date-range', 'end_date')]
         )
-        def update_data_table(platform, start_date, end_date):
-            filtered_data = self.filter_data(platform, start_date, end_date)
+        
+        self.app.clientside_callback(
+            ClientsideFunction(namespace='dashboard', function_name='kpi_cards'),
+            [Output('total-followers', 'children'),
+             Output('total-engagement', 'children'),
+             Output('avg-engagement-rate', 'children'),
+             Output('total-reach', 'children')],
+            [Input('filter-state', 'data'),
+             Input('client-data', 'data')]
+        )
+        
+        self.app.clientside_callback(
+            ClientsideFunction(namespace='dashboard', function_name='main_chart'),
+            Output('main-metric-chart', 'figure'),
+            [Input('filter-state', 'data'),
+             Input('metric-dropdown', 'value'),
+             Input('client-data', 'data')]
+        )
+        
+        self.app.clientside_callback(
+            ClientsideFunction(namespace='dashboard', function_name='engagement_breakdown'),
+            Output('engagement-breakdown', 'figure'),
+            [Input('filter-state', 'data'),
+             Input('client-data', 'data')]
+        )
+        
+        self.app.clientside_callback(
+            ClientsideFunction(namespace='dashboard', function_name='data_table'),
+            Output('data-table', 'data'),
+            [Input('filter-state', 'data'),
+             Input('client-data', 'data')]
+        )
+    
+    def table_actions(self):
+        """Paginação, ordenação e filtro da tabela: no navegador ou no servidor (só a página visível)"""
+        action = 'native' if self.clientside else 'custom'
+        return {'page_action': action, 'sort_action': action, 'filter_action': action}
+    
+    def client_payload(self):
+        """Arrays colunares por plataforma (datas em ms, ordenadas) para o modo no navegador"""
+        # live_end: períodos que terminam no dia mais recente acompanham as linhas recebidas ao vivo
+        payload = {
+            'max_points': VISUALIZATION_CONFIG['max_points_per_trace'],
+            'live_end': int(self.latest_date().value // 10**6) if self.live_source is not None else None,
+            'platforms': {}
+        }
+        for platform in self.platform_index.platforms:
+            start, _, valid_end = self.platform_index.ranges[platform]
+            columns = self.client_columns(self.platform_index.data.iloc[start:valid_end])
+            payload['platforms'][platform] = {'color': PLATFORMS[platform.lower()]['color'], **columns}
+        return payload
+    
+    def extend_client_payload(self, new_rows):
+        """Estende os arrays do modo cliente com linhas posteriores às existentes"""
+        for platform, rows in new_rows.groupby('platform', sort=False):
+            columns = self.client_columns(rows)
+            if platform not in self.client_data['platforms']:
+                self.client_data['platforms'][platform] = {'color': PLATFORMS[platform.lower()]['color'], **columns}
+                continue
+            for column, values in columns.items():
+                self.client_data['platforms'][platform][column].extend(values)
+        if self.client_data['live_end'] is not None:
+            self.client_data['live_end'] = int(self.latest_date().value // 10**6)
+    
+    @staticmethod
+    def client_columns(rows):
+        """Colunas de linhas ordenadas por data no formato do Store client-data"""
+        columns = {'date': rows['date'].to_numpy(dtype='datetime64[ms]').astype('int64').tolist()}
+        for column in CLIENT_COLUMNS:
+            values = rows[column]
+            columns[column] = values.astype(object).where(values.notna(), None).tolist()
+        return columns
+    
+    def setup_live_callbacks(self):
+        """Atualização ao vivo: a cada intervalo a sessão recebe apenas as linhas novas"""
+        
+        if self.clientside:
+            @self.app.callback(
+                [Output('client-data', 'data', allow_duplicate=True),
+                 Output('live-state', 'data', allow_duplicate=True)],
+                Input('live-interval', 'n_intervals'),
+                State('live-state', 'data'),
+                prevent_initial_call=True
+            )
+            @self._instrument('update_live_client_data')
+            def update_live_client_data(n_intervals, live_state):
+                with self.metrics.phase():
+                    self.poll_live_source()
+                with self._live_lock:
+                    live_rows, client_data = self.live_rows, self.client_data
+                    new_rows = self.new_rows_since(live_state['rows'])
+                if live_state['rows'] >= live_rows:
+                    raise PreventUpdate
+                if new_rows is None or not set(new_rows['platform']) <= set(client_data['platforms']):
+                    return client_data, {'rows': live_rows}
+                
+                # Só as linhas novas trafegam; os callbacks do navegador refazem os gráficos
+                patch = Patch()
+                for platform, rows in new_rows.groupby('platform', sort=False):
+                    for column, values in self.client_columns(rows).items():
+                        patch['platforms'][platform][column].extend(values)
+                return patch, {'rows': live_rows}
+            return
+        
+        @self.app.callback(
+            [Output('main-metric-chart', 'extendData'),
+             Output('total-followers', 'children', allow_duplicate=True),
+             Output('total-engagement', 'children', allow_duplicate=True),
+             Output('avg-engagement-rate', 'children', allow_duplicate=True),
+             Output('total-reach', 'children', allow_duplicate=True),
+             Output('engagement-breakdown', 'figure', allow_duplicate=True),
+             Output('live-state', 'data', allow_duplicate=True),
+             Output('filter-state', 'data', allow_duplicate=True)],
+            Input('live-interval', 'n_intervals'),
+            [State('filter-state', 'data'),
+             State('metric-dropdown', 'value'),
+             State('chart-width', 'data'),
+             State('live-state', 'data')],
+            prevent_initial_call=True
+        )
+        @self._instrument('update_live')
+        def update_live(n_intervals, filters, metric, chart_width, live_state):
+            with self.metrics.phase():
+                self.poll_live_source()
+            if filters is None or 'totals' not in live_state:
+                raise PreventUpdate
+            with self._live_lock:
+                live_rows = self.live_rows
+                new_rows = self.new_rows_since(live_state['rows'])
+            if live_state['rows'] >= live_rows:
+                raise PreventUpdate
             
-            # Formatar dados para a tabela
-            table_data = filtered_data[['date', 'platform', 'followers', 'impressions', 'reach', 'engagement']].copy()
-            table_data['date'] = table_data['date'].dt.strftime('%d/%m/%Y')
+            no_update = dash.no_update
+            if new_rows is not None:
+                new_rows = self.filter_rows(new_rows, filters)
+                if new_rows.empty:
+                    return [no_update] * 6 + [dict(live_state, rows=live_rows), no_update]
+            
+            max_points = (chart_width or DASHBOARD_CONFIG['chart_width']) / DASHBOARD_CONFIG['min_px_per_point']
+            incremental = (
+                new_rows is not None
+                and set(new_rows['platform']) <= set(live_state['traces'])
+                and choose_grain(live_state['first_date'] or new_rows['date'].min(), new_rows['date'].max(), max_points) == 'D'
+            )
+            if not incremental:
+                # Série semanal/mensal, plataforma nova ou lotes antigos: recalcular os callbacks do filtro
+                return [no_update] * 7 + [dict(filters)]
+            
+            # Pontos novos anexados aos traços existentes
+            extend = {'x': [], 'y': []}
+            trace_indices = []
+            for platform, rows in new_rows.groupby('platform', sort=False):
+                trace_indices.append(live_state['traces'].index(platform))
+                extend['x'].append(date_values(rows['date']).tolist())
+                extend['y'].append(rows[metric].astype(object).where(rows[metric].notna(), None).tolist())
             
-            return table_data.to_dict('records')
+            # KPIs e breakdown a partir dos totais acumulados da sessão
+            totals = KpiAccumulator(live_state['totals']).update(new_rows)
+            breakdown = totals.breakdown()
+            breakdown_patch = Patch()
+            for i, engagement_type in enumerate(['likes', 'comments', 'shares']):
+                breakdown_patch['data'][i]['x'] = breakdown['platform'].tolist()
+                breakdown_patch['data'][i]['y'] = breakdown[engagement_type].tolist()
+            
+            live_state = dict(live_state, rows=live_rows, totals=totals.to_dict())
+            return [[extend, trace_indices], *self.format_kpis(totals.kpis()), breakdown_patch, live_state, no_update]
     
-    def filter_data(self, platform, start_date, end_date):
-        """Filtra dados baseado nos parâmetros selecionados"""
-        filtered_data = self.platform_data.copy()
+    def poll_live_source(self):
+        """Consulta a fonte ao vivo, no máximo uma vez por intervalo entre todas as sessões"""
+        if self.live_source is None or time.time() - self._last_poll < DASHBOARD_CONFIG['live_interval']:
+            return
+        if not self._live_lock.acquire(blocking=False):
+            return
+        try:
+            self._last_poll = time.time()
+            new_rows = self.live_source.poll()
+            if new_rows is not None and len(new_rows):
+                self.append_platform_data(new_rows)
+        finally:
+            self._live_lock.release()
+    
+    def append_platform_data(self, new_rows):
+        """Incorpora novas linhas de métricas (ex.: o dia mais recente)
+        
+        Linhas com datas posteriores às já existentes de cada plataforma (o
+        caso normal da atualização ao vivo) são anexadas: o índice recebe as
+        linhas no fim do bloco de cada plataforma, as somas acumuladas só
+        acumulam as linhas novas e os arrays do modo cliente são estendidos.
+        Não há ordenação, conversão de datas nem tolist da tabela inteira;
+        resta uma cópia linear das colunas para o novo índice (pd.concat).
+        Lotes com datas antigas ou sem data refazem índice, somas e dados do
+        modo cliente a partir da tabela inteira (custo proporcional a ela).
+        
+        A versão dos dados é derivada da anterior e das linhas novas, sem
+        recalcular o hash das tabelas inteiras. As linhas ficam guardadas em
+        lotes para que cada sessão receba só o que ainda não viu.
+        """
+        new_rows = new_rows.copy()
+        new_rows['date'] = pd.to_datetime(new_rows['date'])
+        new_rows = new_rows.sort_values('date', kind='stable').reset_index(drop=True)
         
-        # Filtrar por plataforma
-        if platform != 'all':
-            filtered_data = filtered_data[filtered_data['platform'] == platform]
+        with self._live_lock:
+            # Lote que só acrescenta dias após os já existentes pode ser anexado aos gráficos
+            appended = self.platform_index.append(new_rows)
+            if appended is not None:
+                self.platform_index, insertions = appended
+                self.rollups = self.rollups.append(self.platform_index, insertions)
+                # A tabela passa a ser a do índice (ordenada por plataforma e data)
+                self.platform_data = self.platform_index.data
+                if self.clientside:
+                    self.extend_client_payload(new_rows)
+            else:
+                self.platform_data = pd.concat([self.platform_data, new_rows], ignore_index=True)
+                self.platform_index = PlatformDateIndex(self.platform_data)
+                self.rollups = TimeRollups(self.platform_index)
+                if self.clientside:
+                    self.client_data = self.client_payload()
+            # Agregações da tabela são recalculadas só quando alguém as pedir
+            self.aggregates.update_data(platform_data=self.platform_data)
+            
+            self.data_version = hash_inputs(self.data_version, new_rows)
+            self.live_batches.append((self.live_rows, new_rows, appended is not None))
+            self.live_rows += len(new_rows)
+            self.session_views.clear()
+    
+    def new_rows_since(self, live_rows):
+        """Linhas recebidas após as primeiras live_rows
         
-        # Filtrar por data
-        if start_date:
-            filtered_data = filtered_data[filtered_data['date'] >= start_date]
-        if end_date:
-            filtered_data = filtered_data[filtered_data['date'] <= end_date]
+        Retorna None quando a sessão precisa ser recalculada por inteiro
+        (lotes já descartados ou linhas com datas anteriores às existentes).
+        A contagem de linhas é a mesma em todos os workers que leem a mesma
+        fonte, por isso serve de cursor mesmo entre processos diferentes.
+        """
+        pieces = []
+        if self.live_batches and live_rows < self.live_batches[0][0]:
+            return None
+        for start, rows, appended in self.live_batches:
+            if start + len(rows) <= live_rows:
+                continue
+            if not appended:
+                return None
+            pieces.append(rows.iloc[max(live_rows - start, 0):])
+        if not pieces:
+            return self.platform_data.iloc[0:0]
+        return pd.concat(pieces, ignore_index=True)
+    
+    @staticmethod
+    def filter_rows(rows, filters):
+        """Linhas que atendem aos filtros de plataforma e período"""
+        mask = pd.Series(True, index=rows.index)
+        if filters['platform'] not in (None, 'all'):
+            mask &= rows['platform'] == filters['platform']
+        if filters['start_date']:
+            mask &= rows['date'] >= pd.Timestamp(filters['start_date'])
+        if filters['end_date']:
+            mask &= rows['date'] <= pd.Timestamp(filters['end_date'])
+        return rows[mask]
+    
+    def live_state(self, view):
+        """Estado ao vivo da sessão: linhas já exibidas, traços do gráfico e totais dos KPIs"""
+        first_dates = [series['date'].iloc[0] for series in view.series.values()]
+        return {
+            'rows': view.version,
+            'traces': list(view.series),
+            'first_date': min(first_dates).isoformat() if first_dates else None,
+            'totals': view.totals.to_dict()
+        }
+    
+    def latest_date(self):
+        """Data mais recente das métricas das plataformas"""
+        return self.platform_index.latest_date()
+    
+    @staticmethod
+    def format_kpis(kpis):
+        """Textos dos cards de KPIs"""
+        return (
+            f"{kpis['total_followers']:,.0f}",
+            f"{kpis['total_engagement']:,.0f}",
+            f"{kpis['avg_engagement_rate']:.2f}%",
+            f"{kpis['total_reach']:,.0f}"
+        )
+    
+    def metrics_panel(self):
+        """Componentes do painel de métricas (vazio se DASHBOARD_CONFIG['metrics_panel'] for False)"""
+        if not (DASHBOARD_CONFIG['metrics_enabled'] and DASHBOARD_CONFIG['metrics_panel']):
+            return []
+        return [
+            dbc.Row([
+                dbc.Col([
+                    html.Details([
+                        html.Summary("Métricas dos callbacks"),
+                        html.Div(id='metrics-panel'),
+                        dcc.Interval(id='metrics-interval', interval=5000)
+                    ])
+                ])
+            ], className="mt-4")
+        ]
+    
+    def metric_counters(self):
+        """Contadores adicionais expostos em /metrics"""
+        counters = {
+            'dashboard_live_rows_total': ('Linhas recebidas pela atualização ao vivo', self.live_rows),
+            'dashboard_aggregate_cache_hits_total': ('Agregações servidas do cache', self.aggregates.stats['hits']),
+            'dashboard_aggregate_cache_misses_total': ('Agregações calculadas', self.aggregates.stats['misses'])
+        }
+        if self.callback_cache is not None:
+            stats = self.callback_cache.stats
+            counters['dashboard_callback_cache_hits_total'] = ('Callbacks servidos do cache em memória', stats['hits'])
+            counters['dashboard_callback_cache_disk_hits_total'] = ('Callbacks servidos do cache em disco', stats['disk_hits'])
+            counters['dashboard_callback_cache_misses_total'] = ('Callbacks calculados', stats['misses'])
+        return counters
+    
+    def setup_health_routes(self):
+        """Endpoints de verificação para o servidor/orquestrador
+        
+        /health indica que o processo responde; /ready, que os dados estão
+        carregados e indexados e o dashboard pode receber tráfego.
+        """
+        server = self.app.server
+        
+        @server.route('/health')
+        def health():
+            return jsonify(status='ok')
+        
+        @server.route('/ready')
+        def ready():
+            if not self.ready:
+                return jsonify(status='loading'), 503
+            return jsonify(status='ready', data_version=self.data_version, rows=len(self.platform_index.data))
+    
+    def _instrument(self, name):
+        """Decorador que registra latência e tempo em pandas do callback (ver /metrics)"""
+        if not DASHBOARD_CONFIG['metrics_enabled']:
+            return lambda function: function
+        return self.metrics.instrument(name)
+    
+    def _memoize(self, name, key_args=None):
+        """Decorador que serve o callback do cache quando entradas e dados se repetem"""
+        if self.callback_cache is None:
+            return lambda function: function
+        return self.callback_cache.memoize(name, lambda: self.data_version, key_args)
+    
+    def chart_grain(self, view, chart_width=None):
+        """Granularidade do gráfico principal pelo intervalo da view e largura do gráfico"""
+        dates = [series['date'] for series in view.series.values()]
+        if not dates:
+            return 'D'
+        start = min(date.iloc[0] for date in dates)
+        end = max(date.iloc[-1] for date in dates)
+        max_points = (chart_width or DASHBOARD_CONFIG['chart_width']) / DASHBOARD_CONFIG['min_px_per_point']
+        return choose_grain(start, end, max_points)
+    
+    def create_view(self, platform, start_date, end_date):
+        """Filtra os dados e calcula as agregações de uma interação"""
+        with self._live_lock:
+            index, live_rows = self.platform_index, self.live_rows
+        return FilteredView(index, platform, start_date, end_date, version=live_rows)
+    
+    def get_view(self, session_id, filters):
+        """View da sessão para os filtros atuais (recalculada se não estiver no servidor)"""
+        if filters is None:
+            # Filtro ainda não calculado (carregamento inicial da página)
+            raise PreventUpdate
+        with self.metrics.phase():
+            return self.session_views.get(session_id, filters, self.create_view)
+    
+    def filter_data(self, platform, start_date, end_date):
+        """Filtra dados baseado nos parâmetros selecionados
         
-        return filtered_data
+        Usa busca binária no índice por plataforma e data; o resultado é uma
+        fatia somente leitura (os callbacks copiam antes de alterar).
+        """
+        return self.platform_index.slice(platform, start_date, end_date)
     
     def run(self):
         """Executa o dashboard"""
@@ -346,7 +953,8 @@ if __name__ == "__main__":
     platform_data = pd.read_csv('data/platform_metrics.csv')
     demographic_data = pd.read_csv('data/demographic_data.csv')
     campaign_data = pd.read_csv('data/campaign_data.csv')
+    post_data = pd.read_csv('data/post_data.csv', parse_dates=['timestamp']) if os.path.exists('data/post_data.csv') else None
     
     # Criar e executar dashboard
-    dashboard = SocialMediaDashboard(platform_data, demographic_data, campaign_data)
+    dashboard = SocialMediaDashboard(platform_data, demographic_data, campaign_data, post_data)
     dashboard.run()
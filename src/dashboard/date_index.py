@@ -0,0 +1,144 @@
+"""
+Índice por plataforma e data para filtrar o dashboard com busca binária
+"""
+
+import pandas as pd
+import numpy as np
+
+class PlatformDateIndex:
+    """Mantém as linhas ordenadas por (plataforma, data) para recortes rápidos
+    
+    As linhas de cada plataforma ficam contíguas e ordenadas por data, de
+    modo que um intervalo de datas é localizado com np.searchsorted e
+    devolvido como uma fatia (iloc) das linhas ordenadas, sem máscaras
+    booleanas sobre a tabela inteira. O custo de um filtro é
+    O(log n + tamanho do resultado). As plataformas mantêm a ordem em que
+    aparecem nos dados originais.
+    """
+    
+    def __init__(self, df, date_column='date', platform_column='platform'):
+        self.date_column = date_column
+        self.platform_column = platform_column
+        
+        codes, platforms = pd.factorize(df[platform_column])
+        dates = pd.to_datetime(df[date_column]).to_numpy(dtype='datetime64[ns]')
+        order = np.lexsort((dates, codes))
+        
+        self.data = df.iloc[order]
+        self.dates = dates[order]
+        
+        # Limites [início, fim) de cada plataforma e fim das datas válidas (NaT ficam no final)
+        bounds = np.searchsorted(codes[order], np.arange(len(platforms) + 1))
+        self.ranges = {}
+        for i, platform in enumerate(platforms):
+            start, end = int(bounds[i]), int(bounds[i + 1])
+            valid_end = start + int(np.count_nonzero(~np.isnat(self.dates[start:end])))
+            self.ranges[platform] = (start, end, valid_end)
+    
+    @property
+    def platforms(self):
+        return list(self.ranges)
+    
+    def latest_date(self):
+        """Data mais recente entre todas as plataformas (última data válida de cada uma)"""
+        last_dates = [self.dates[valid_end - 1] for start, _, valid_end in self.ranges.values() if valid_end > start]
+        return pd.Timestamp(max(last_dates)) if last_dates else pd.NaT
+    
+    def earliest_date(self):
+        """Data mais antiga entre todas as plataformas"""
+        first_dates = [self.dates[start] for start, _, valid_end in self.ranges.values() if valid_end > start]
+        return pd.Timestamp(min(first_dates)) if first_dates else pd.NaT
+    
+    def append(self, rows):
+        """Novo índice com linhas posteriores às existentes, sem reordenar a tabela
+        
+        Cada plataforma recebe suas linhas novas no fim do seu bloco (ou um
+        bloco novo no fim); as posições e limites são ajustados por
+        deslocamento e as colunas são apenas copiadas para o novo índice,
+        sem factorize, lexsort ou conversão de datas das linhas existentes.
+        Retorna (índice, inserções), com inserções = [(posição no índice
+        atual, linhas)] usadas por TimeRollups.append, ou None se alguma
+        linha não tiver data, for anterior ao fim da sua plataforma ou a
+        plataforma tiver linhas sem data (nesses casos reconstrua o índice).
+        """
+        dates = pd.to_datetime(rows[self.date_column]).to_numpy(dtype='datetime64[ns]')
+        if np.isnat(dates).any():
+            return None
+        order = np.argsort(dates, kind='stable')
+        rows, dates = rows.iloc[order], dates[order]
+        
+        new_blocks = {}
+        platforms_column = rows[self.platform_column].to_numpy()
+        for platform in pd.unique(platforms_column):
+            mask = platforms_column == platform
+            if platform in self.ranges:
+                start, end, valid_end = self.ranges[platform]
+                if valid_end != end or (end > start and dates[mask][0] <= self.dates[end - 1]):
+                    return None
+            new_blocks[platform] = (rows[mask], dates[mask])
+        
+        data_pieces, date_pieces, insertions = [], [], []
+        ranges, offset = {}, 0
+        for platform, (start, end, _) in self.ranges.items():
+            data_pieces.append(self.data.iloc[start:end])
+            date_pieces.append(self.dates[start:end])
+            added = 0
+            if platform in new_blocks:
+                block, block_dates = new_blocks.pop(platform)
+                data_pieces.append(block)
+                date_pieces.append(block_dates)
+                insertions.append((end, block))
+                added = len(block)
+            ranges[platform] = (start + offset, end + offset + added, end + offset + added)
+            offset += added
+        
+        # Plataformas novas formam blocos no fim, na ordem em que aparecem
+        position = len(self.data) + offset
+        for platform, (block, block_dates) in new_blocks.items():
+            data_pieces.append(block)
+            date_pieces.append(block_dates)
+            insertions.append((len(self.data), block))
+            ranges[platform] = (position, position + len(block), position + len(block))
+            position += len(block)
+        
+        index = object.__new__(PlatformDateIndex)
+        index.date_column = self.date_column
+        index.platform_column = self.platform_column
+        index.data = pd.concat(data_pieces)
+        index.dates = np.concatenate(date_pieces)
+        index.ranges = ranges
+        return index, insertions
+    
+    def row_bounds(self, platform, start_date=None, end_date=None):
+        """Posições [início, fim) das linhas da plataforma no intervalo de datas (inclusivo)"""
+        start, end, valid_end = self.ranges[platform]
+        if start_date is None and end_date is None:
+            return start, end
+        
+        dates = self.dates[start:valid_end]
+        first = start + int(np.searchsorted(dates, np.datetime64(pd.Timestamp(start_date)), side='left')) if start_date else start
+        last = start + int(np.searchsorted(dates, np.datetime64(pd.Timestamp(end_date)), side='right')) if end_date else valid_end
+        return first, max(first, last)
+    
+    def slice(self, platform='all', start_date=None, end_date=None):
+        """Linhas da plataforma ('all' = todas) no intervalo de datas
+        
+        Para uma única plataforma o resultado é uma fatia das linhas
+        ordenadas (sem cópia); para 'all' as fatias de cada plataforma são
+        concatenadas. Não modifique o DataFrame retornado.
+        """
+        if platform in (None, 'all'):
+            platforms = self.platforms
+        else:
+            platforms = [platform] if platform in self.ranges else []
+        
+        pieces = []
+        for name in platforms:
+            first, last = self.row_bounds(name, start_date or None, end_date or None)
+            pieces.append(self.data.iloc[first:last])
+        
+        if not pieces:
+            return self.data.iloc[0:0]
+        if len(pieces) == 1:
+            return pieces[0]
+        return pd.concat(pieces)
@@ -0,0 +1,119 @@
+"""
+Atualização ao vivo do dashboard: leitura incremental da fonte e acumuladores dos KPIs
+"""
+
+import io
+import threading
+import pandas as pd
+import os
+
+class CsvTailSource:
+    """Lê apenas as linhas acrescentadas a um CSV desde a última consulta
+    
+    Guarda a posição (em bytes) já lida; cada poll() verifica o tamanho do
+    arquivo e, havendo crescimento, lê somente o trecho novo, até a última
+    linha completa. O arquivo deve apenas receber linhas no final; se ele
+    for truncado ou substituído, a leitura recomeça a partir do seu fim
+    atual (as linhas existentes não são reprocessadas).
+    """
+    
+    def __init__(self, path, from_end=True):
+        self.path = path
+        self.header = None
+        self.offset = None
+        self._lock = threading.Lock()
+        if from_end:
+            self._skip_existing()
+    
+    def _skip_existing(self):
+        with open(self.path, 'rb') as f:
+            self.header = f.readline()
+            f.seek(0, os.SEEK_END)
+            self.offset = f.tell()
+    
+    def poll(self):
+        """Novas linhas completas desde a última consulta (None se não houver)"""
+        with self._lock:
+            try:
+                size = os.path.getsize(self.path)
+            except OSError:
+                return None
+            
+            if self.offset is not None and size < self.offset:
+                self._skip_existing()
+                return None
+            if self.offset == size:
+                return None
+            
+            with open(self.path, 'rb') as f:
+                if self.offset is None:
+                    self.header = f.readline()
+                    self.offset = f.tell()
+                f.seek(self.offset)
+                chunk = f.read(size - self.offset)
+            
+            # Linha ainda sendo escrita fica para a próxima consulta
+            end = chunk.rfind(b'\n') + 1
+            if end == 0:
+                return None
+            self.offset += end
+        
+        return pd.read_csv(io.BytesIO(self.header + chunk[:end]))
+
+class KpiAccumulator:
+    """Totais por plataforma dos KPIs e do breakdown, atualizáveis em O(novas linhas)
+    
+    Para cada plataforma guarda as somas de engajamento, alcance, curtidas,
+    comentários e compartilhamentos e o último número de seguidores. O
+    estado é um dicionário simples (to_dict), que pode viajar no Store da
+    sessão e ser atualizado apenas com as linhas novas.
+    """
+    
+    SUM_COLUMNS = ['engagement', 'reach', 'likes', 'comments', 'shares']
+    
+    def __init__(self, totals=None):
+        self.totals = {platform: dict(values) for platform, values in (totals or {}).items()}
+    
+    @classmethod
+    def from_frame(cls, df):
+        """Acumulador a partir de linhas ordenadas por data em cada plataforma"""
+        return cls().update(df)
+    
+    def update(self, rows):
+        """Soma as novas linhas (ordenadas por data) aos totais"""
+        if rows is None or rows.empty:
+            return self
+        
+        grouped = rows.groupby('platform', sort=False)
+        sums = grouped[self.SUM_COLUMNS].sum()
+        last_followers = grouped['followers'].last()
+        for platform in sums.index:
+            totals = self.totals.setdefault(platform, {'followers': None, **{column: 0 for column in self.SUM_COLUMNS}})
+            for column in self.SUM_COLUMNS:
+                totals[column] += sums.at[platform, column].item()
+            if pd.notna(last_followers[platform]):
+                totals['followers'] = last_followers[platform].item()
+        return self
+    
+    def kpis(self):
+        """KPIs no mesmo formato de FilteredView.kpis"""
+        total_engagement = sum(totals['engagement'] for totals in self.totals.values())
+        total_reach = sum(totals['reach'] for totals in self.totals.values())
+        return {
+            'total_followers': sum(totals['followers'] or 0 for totals in self.totals.values()),
+            'total_engagement': total_engagement,
+            'total_reach': total_reach,
+            'avg_engagement_rate': (total_engagement / total_reach * 100) if total_reach > 0 else 0
+        }
+    
+    def breakdown(self):
+        """Curtidas, comentários e compartilhamentos por plataforma (ordem alfabética)"""
+        platforms = sorted(self.totals)
+        return pd.DataFrame({
+            'platform': platforms,
+            **{column: [self.totals[platform][column] for platform in platforms]
+               for column in ['likes', 'comments', 'shares']}
+        })
+    
+    def to_dict(self):
+        return {platform: dict(values) for platform, values in self.totals.items()}
@@ -0,0 +1,187 @@
+"""
+Métricas de latência e tamanho das respostas dos callbacks do dashboard
+"""
+
+import bisect
+import contextlib
+import functools
+import threading
+import time
+from flask import Response, g, has_request_context, request
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+# Histogramas por callback: nome -> (descrição, limites dos buckets)
+METRICS = {
+    'dashboard_callback_seconds': ('Tempo total da requisição do callback (s)', LATENCY_BUCKETS),
+    'dashboard_callback_compute_seconds': ('Tempo dentro da função do callback (s)', LATENCY_BUCKETS),
+    'dashboard_callback_pandas_seconds': ('Tempo de filtragem e agregação com pandas (s)', LATENCY_BUCKETS),
+    'dashboard_callback_serialization_seconds': ('Tempo de serialização da resposta pelo Dash (s)', LATENCY_BUCKETS),
+    'dashboard_callback_response_bytes': ('Tamanho da resposta do callback (bytes)', SIZE_BUCKETS)
+}
+
+UPDATE_PATH = '/_dash-update-component'
+
+class Histogram:
+    """Histograma com buckets fixos, no formato do Prometheus"""
+    
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+    
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+    
+    def quantile(self, q):
+        """Quantil aproximado por interpolação linear dentro do bucket"""
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        cumulative = 0
+        for i, count in enumerate(self.counts):
+            if count and cumulative + count >= rank:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.buckets[-1]
+                return lower + (upper - lower) * (rank - cumulative) / count
+            cumulative += count
+        return self.buckets[-1]
+
+class CallbackMetrics:
+    """Histogramas de latência e tamanho de resposta por callback
+    
+    instrument() mede o tempo dentro da função do callback e, com phase(),
+    o tempo gasto em pandas. Os ganchos do Flask (init_app) medem a
+    requisição inteira em /_dash-update-component: a diferença para o tempo
+    do callback é a serialização da resposta e o despacho do Dash. Cada
+    processo mantém seus próprios histogramas (com vários workers, cada
+    coleta de /metrics reflete o worker que respondeu).
+    """
+    
+    def __init__(self):
+        self._histograms = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+    
+    def observe(self, metric, callback, value):
+        with self._lock:
+            histogram = self._histograms.get((metric, callback))
+            if histogram is None:
+                histogram = self._histograms[(metric, callback)] = Histogram(METRICS[metric][1])
+            histogram.observe(value)
+    
+    def instrument(self, name):
+        """Decorador para callbacks: registra tempo total e tempo em pandas"""
+        def decorator(function):
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                self._local.phases = {'pandas': 0.0, 'depth': 0}
+                start = time.perf_counter()
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    elapsed = time.perf_counter() - start
+                    pandas_seconds = self._local.phases['pandas']
+                    self._local.phases = None
+                    self.observe('dashboard_callback_compute_seconds', name, elapsed)
+                    self.observe('dashboard_callback_pandas_seconds', name, pandas_seconds)
+                    if has_request_context():
+                        g.dashboard_callback = (name, elapsed)
+            return wrapper
+        return decorator
+    
+    @contextlib.contextmanager
+    def phase(self, name='pandas'):
+        """Soma o tempo do bloco à fase do callback em execução (blocos aninhados contam uma vez)"""
+        phases = getattr(self._local, 'phases', None)
+        if phases is None or phases['depth']:
+            yield
+            return
+        phases['depth'] += 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            phases[name] += time.perf_counter() - start
+            phases['depth'] -= 1
+    
+    def init_app(self, server, local_only=True, counters=None):
+        """Registra a medição das requisições e o endpoint /metrics
+        
+        counters: função opcional que retorna {nome: (descrição, valor)}
+        com contadores adicionais (ex.: acertos do cache de callbacks).
+        """
+        @server.before_request
+        def start_callback_timer():
+            if request.path.endswith(UPDATE_PATH):
+                g.dashboard_request_start = time.perf_counter()
+        
+        @server.after_request
+        def record_callback_response(response):
+            callback = g.get('dashboard_callback')
+            start = g.get('dashboard_request_start')
+            if callback is not None and start is not None:
+                name, compute_seconds = callback
+                total = time.perf_counter() - start
+                self.observe('dashboard_callback_seconds', name, total)
+                self.observe('dashboard_callback_serialization_seconds', name, max(total - compute_seconds, 0.0))
+                self.observe('dashboard_callback_response_bytes', name, response.calculate_content_length() or 0)
+            return response
+        
+        @server.route('/metrics')
+        def metrics():
+            if local_only and request.remote_addr not in ('127.0.0.1', '::1'):
+                return Response('forbidden\n', status=403, mimetype='text/plain')
+            return Response(self.render(counters() if counters else None),
+                            mimetype='text/plain; version=0.0.4')
+    
+    def render(self, counters=None):
+        """Texto no formato de exposição do Prometheus"""
+        with self._lock:
+            histograms = {key: (list(h.counts), h.sum, h.count) for key, h in self._histograms.items()}
+        
+        lines = []
+        for metric, (description, buckets) in METRICS.items():
+            lines.append(f'# HELP {metric} {description}')
+            lines.append(f'# TYPE {metric} histogram')
+            for (name, callback), (counts, total, count) in sorted(histograms.items()):
+                if name != metric:
+                    continue
+                cumulative = 0
+                for bound, bucket_count in zip(list(buckets) + ['+Inf'], counts):
+                    cumulative += bucket_count
+                    lines.append(f'{metric}_bucket{{callback="{callback}",le="{bound}"}} {cumulative}')
+                lines.append(f'{metric}_sum{{callback="{callback}"}} {total}')
+                lines.append(f'{metric}_count{{callback="{callback}"}} {count}')
+        
+        for name, (description, value) in (counters or {}).items():
+            lines.append(f'# HELP {name} {description}')
+            lines.append(f'# TYPE {name} counter')
+            lines.append(f'{name} {value}')
+        return '\n'.join(lines) + '\n'
+    
+    def summary(self):
+        """Resumo por callback para o painel de depuração"""
+        with self._lock:
+            histograms = dict(self._histograms)
+            rows = []
+            for callback in sorted({callback for _, callback in histograms}):
+                compute = histograms[('dashboard_callback_compute_seconds', callback)]
+                total = histograms.get(('dashboard_callback_seconds', callback), compute)
+                pandas_time = histograms[('dashboard_callback_pandas_seconds', callback)]
+                serialization = histograms.get(('dashboard_callback_serialization_seconds', callback))
+                size = histograms.get(('dashboard_callback_response_bytes', callback))
+                rows.append({
+                    'callback': callback,
+                    'chamadas': compute.count,
+                    'p50 (ms)': round(total.quantile(0.5) * 1000, 1),
+                    'p95 (ms)': round(total.quantile(0.95) * 1000, 1),
+                    'pandas (ms)': round(pandas_time.sum / pandas_time.count * 1000, 1),
+                    'serialização (ms)': round(serialization.sum / serialization.count * 1000, 1) if serialization else None,
+                    'resposta (KB)': round(size.sum / size.count / 1024, 1) if size else None
+                })
+        return rows
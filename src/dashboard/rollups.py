@@ -0,0 +1,108 @@
+"""
+Agregações temporais (diária, semanal, mensal) para o gráfico principal do dashboard
+"""
+
+import pandas as pd
+import numpy as np
+
+# Granularidades: frequência dos períodos, dias aproximados por ponto e rótulo
+GRAINS = {
+    'D': {'freq': 'D', 'days': 1, 'label': 'diário'},
+    'W': {'freq': 'W-MON', 'days': 7, 'label': 'semanal'},
+    'M': {'freq': 'MS', 'days': 30.44, 'label': 'mensal'}
+}
+
+# Métricas de estoque usam o último valor do período; as demais são somadas
+LAST_VALUE_METRICS = {'followers'}
+
+def choose_grain(start_date, end_date, max_points):
+    """Menor granularidade cujo número de pontos no intervalo cabe em max_points"""
+    days = (pd.Timestamp(end_date) - pd.Timestamp(start_date)).days + 1
+    for grain, settings in GRAINS.items():
+        if days / settings['days'] <= max_points:
+            return grain
+    return 'M'
+
+class TimeRollups:
+    """Séries semanais e mensais por plataforma sem reagregar as linhas diárias
+    
+    Sobre as linhas ordenadas do PlatformDateIndex são pré-calculadas somas
+    acumuladas de cada métrica; a soma de um período qualquer é a diferença
+    entre duas posições, localizadas com busca binária. Assim uma série de
+    P períodos custa O(P log n), independentemente de quantos dias o
+    intervalo cobre, e os períodos parciais nas bordas do intervalo são
+    exatos. Para métricas de estoque (seguidores) é usado o último valor.
+    """
+    
+    def __init__(self, index, metrics=('followers', 'impressions', 'reach', 'engagement')):
+        self.index = index
+        self.metrics = metrics
+        self.values = {}
+        self.cumulative = {}
+        for metric in metrics:
+            values = index.data[metric].to_numpy(dtype=float)
+            self.values[metric] = values
+            # cumulative[i] = soma das linhas [0, i)
+            self.cumulative[metric] = np.concatenate(([0.0], np.cumsum(np.nan_to_num(values))))
+    
+    def append(self, index, insertions):
+        """Novas somas acumuladas após PlatformDateIndex.append, sem refazer o cumsum
+        
+        Só as linhas inseridas são acumuladas; os trechos existentes das somas
+        são copiados somando o total já inserido antes deles.
+        """
+        rollups = object.__new__(TimeRollups)
+        rollups.index = index
+        rollups.metrics = self.metrics
+        rollups.values = {}
+        rollups.cumulative = {}
+        for metric in self.metrics:
+            old_values, old_cumulative = self.values[metric], self.cumulative[metric]
+            value_pieces, cumulative_pieces = [], []
+            previous, inserted = 0, 0.0
+            for position, rows in insertions:
+                new_values = rows[metric].to_numpy(dtype=float)
+                value_pieces += [old_values[previous:position], new_values]
+                # Posições [previous, position) existentes, depois o início de cada linha nova
+                base = old_cumulative[position] + inserted
+                cumulative_pieces += [old_cumulative[previous:position] + inserted,
+                                      base + np.concatenate(([0.0], np.cumsum(np.nan_to_num(new_values))[:-1]))]
+                inserted += np.nansum(new_values)
+                previous = position
+            value_pieces.append(old_values[previous:])
+            cumulative_pieces.append(old_cumulative[previous:] + inserted)
+            rollups.values[metric] = np.concatenate(value_pieces)
+            rollups.cumulative[metric] = np.concatenate(cumulative_pieces)
+        return rollups
+    
+    def series(self, platform, metric, grain, start_date=None, end_date=None):
+        """Série (date, metric) da plataforma na granularidade dada"""
+        first, last = self.index.row_bounds(platform, start_date or None, end_date or None)
+        # Linhas sem data (no final da plataforma) ficam fora das séries agregadas
+        last = min(last, self.index.ranges[platform][2])
+        dates = self.index.dates[first:last]
+        if grain == 'D' or last == first:
+            return self.index.data.iloc[first:last][['date', metric]]
+        
+        # Início de cada período que toca o intervalo (o primeiro pode começar antes dele)
+        first_date = pd.Timestamp(dates[0])
+        if grain == 'W':
+            first_period = first_date.normalize() - pd.Timedelta(days=first_date.weekday())
+        else:
+            first_period = first_date.normalize().replace(day=1)
+        period_starts = pd.date_range(first_period, dates[-1], freq=GRAINS[grain]['freq']).to_numpy(dtype='datetime64[ns]')
+        bounds = first + np.searchsorted(dates, period_starts, side='left')
+        bounds = np.append(bounds, last)
+        
+        starts, ends = bounds[:-1], bounds[1:]
+        non_empty = ends > starts
+        starts, ends = starts[non_empty], ends[non_empty]
+        labels = np.maximum(period_starts[non_empty], dates[0])
+        
+        if metric in LAST_VALUE_METRICS:
+            values = self.values[metric][ends - 1]
+        else:
+            cumulative = self.cumulative[metric]
+            values = cumulative[ends] - cumulative[starts]
+        
+        return pd.DataFrame({'date': labels, metric: values})
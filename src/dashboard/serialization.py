@@ -0,0 +1,78 @@
+"""
+Serialização e compressão das respostas do dashboard
+"""
+
+import gzip
+import warnings
+import plotly.io as pio
+from flask import request
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from config import DASHBOARD_CONFIG
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Tipos de resposta que valem a pena comprimir
+COMPRESSIBLE_TYPES = ('application/json', 'text/html', 'text/plain', 'text/css',
+                      'application/javascript', 'text/javascript')
+
+def configure_json_engine(engine=None):
+    """Define o codificador JSON usado pelo Plotly/Dash nas respostas dos callbacks
+    
+    Com orjson os arrays NumPy são serializados direto em C, sem passar pelo
+    PlotlyJSONEncoder; os arrays numéricos das figuras já seguem como typed
+    arrays (base64). Sem orjson instalado, 'auto' e 'orjson' usam o módulo
+    json da biblioteca padrão.
+    """
+    engine = engine or DASHBOARD_CONFIG['json_engine']
+    if engine in ('auto', 'orjson') and orjson is None:
+        if engine == 'orjson':
+            warnings.warn("orjson não está instalado (pip install orjson); usando o codificador json padrão")
+        engine = 'json'
+    elif engine == 'auto':
+        engine = 'orjson'
+    pio.json.config.default_engine = engine
+    return engine
+
+def init_compression(server, min_bytes=None, level=None):
+    """Comprime respostas grandes com brotli (se instalado) ou gzip
+    
+    A codificação segue o Accept-Encoding do navegador; respostas menores
+    que min_bytes, já codificadas ou enviadas como arquivo são mantidas.
+    """
+    min_bytes = min_bytes if min_bytes is not None else DASHBOARD_CONFIG['compression_min_bytes']
+    level = level or DASHBOARD_CONFIG['compression_level']
+    
+    @server.after_request
+    def compress_response(response):
+        accept_encoding = request.headers.get('Accept-Encoding', '').lower()
+        if (response.status_code != 200 or response.direct_passthrough
+                or 'Content-Encoding' in response.headers
+                or response.mimetype not in COMPRESSIBLE_TYPES):
+            return response
+        
+        data = response.get_data()
+        if len(data) < min_bytes:
+            return response
+        
+        if brotli is not None and 'br' in accept_encoding:
+            body, encoding = brotli.compress(data, quality=level), 'br'
+        elif 'gzip' in accept_encoding:
+            body, encoding = gzip.compress(data, compresslevel=level), 'gzip'
+        else:
+            return response
+        
+        response.set_data(body)
+        response.headers['Content-Encoding'] = encoding
+        response.headers['Content-Length'] = len(body)
+        response.vary.add('Accept-Encoding')
+        return response
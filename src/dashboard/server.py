@@ -0,0 +1,94 @@
+"""
+Servidor de produção do dashboard (WSGI com múltiplos workers)
+"""
+
+import argparse
+import gc
+import pandas as pd
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from config import SERVING_CONFIG
+from src.dashboard.dashboard import SocialMediaDashboard
+from src.dashboard.callback_cache import CallbackCache
+
+try:
+    from gunicorn.app.base import BaseApplication
+except ImportError:
+    BaseApplication = None
+
+def load_data(data_dir=None):
+    """Carrega as tabelas usadas pelo dashboard"""
+    data_dir = data_dir or SERVING_CONFIG['data_dir']
+    post_path = os.path.join(data_dir, 'post_data.csv')
+    return {
+        'platform_data': pd.read_csv(os.path.join(data_dir, 'platform_metrics.csv')),
+        'demographic_data': pd.read_csv(os.path.join(data_dir, 'demographic_data.csv')),
+        'campaign_data': pd.read_csv(os.path.join(data_dir, 'campaign_data.csv')),
+        'post_data': pd.read_csv(post_path, parse_dates=['timestamp']) if os.path.exists(post_path) else None
+    }
+
+def create_dashboard(data_dir=None):
+    """Cria o dashboard com os dados carregados e o cache de callbacks compartilhado"""
+    callback_cache = CallbackCache(cache_dir=SERVING_CONFIG['callback_cache_dir'])
+    return SocialMediaDashboard(**load_data(data_dir), callback_cache=callback_cache)
+
+def create_server(data_dir=None):
+    """Fábrica WSGI, ex.: gunicorn "src.dashboard.server:create_server()" --preload"""
+    return create_dashboard(data_dir).app.server
+
+def run_production(dashboard=None, workers=None, threads=None, host=None, port=None):
+    """Serve o dashboard com gunicorn (workers gthread)
+    
+    Os dados são carregados e indexados uma única vez no processo mestre,
+    antes do fork: os workers compartilham essas páginas de memória
+    (copy-on-write) e as tratam como somente leitura. gc.freeze() tira os
+    objetos já carregados do coletor de lixo, que de outra forma os tocaria
+    e forçaria a cópia das páginas em cada worker. Sem gunicorn instalado,
+    usa o servidor do Flask com threads (sem debug nem reloader).
+    """
+    dashboard = dashboard or create_dashboard()
+    host = host or SERVING_CONFIG['host']
+    port = port or SERVING_CONFIG['port']
+    workers = workers or SERVING_CONFIG['workers'] or 2 * (os.cpu_count() or 1) + 1
+    threads = threads or SERVING_CONFIG['threads']
+    
+    gc.freeze()
+    
+    if BaseApplication is None:
+        print("gunicorn não está instalado (pip install gunicorn); usando o servidor do Flask com threads")
+        dashboard.app.run(host=host, port=port, debug=False, threaded=True)
+        return
+    
+    options = {
+        'bind': f'{host}:{port}',
+        'workers': workers,
+        'threads': threads,
+        'worker_class': 'gthread',
+        'timeout': SERVING_CONFIG['timeout'],
+        'preload_app': True
+    }
+    print(f"Iniciando dashboard em http://{host}:{port} ({workers} workers × {threads} threads)")
+    _gunicorn_application(dashboard.app.server, options).run()
+
+def _gunicorn_application(server, options):
+    class DashboardApplication(BaseApplication):
+        def load_config(self):
+            for key, value in options.items():
+                self.cfg.set(key, value)
+        
+        def load(self):
+            return server
+    
+    return DashboardApplication()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Servidor de produção do dashboard')
+    parser.add_argument('--workers', type=int, help='número de processos (padrão: 2 × núcleos + 1)')
+    parser.add_argument('--threads', type=int, help='threads por processo')
+    parser.add_argument('--host')
+    parser.add_argument('--port', type=int)
+    parser.add_argument('--data-dir', help='pasta com os CSVs de dados')
+    args = parser.parse_args()
+    
+    run_production(create_dashboard(args.data_dir), args.workers, args.threads, args.host, args.port)
@@ -0,0 +1,94 @@
+"""
+Armazenamento no servidor da fatia filtrada de cada sessão do dashboard
+"""
+
+import threading
+from collections import OrderedDict
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from src.dashboard.live import KpiAccumulator
+
+class FilteredView:
+    """Fatia filtrada e agregações calculadas uma única vez por interação
+    
+    Reúne tudo o que os callbacks dependentes do filtro (KPIs, gráfico
+    principal, breakdown de engajamento e tabela) precisam, para que a
+    filtragem e as agregações não sejam repetidas em cada um deles.
+    """
+    
+    def __init__(self, index, platform, start_date, end_date, version=0):
+        self.filters = {'platform': platform, 'start_date': start_date, 'end_date': end_date}
+        # Linhas recebidas ao vivo já incluídas no índice usado
+        self.version = version
+        self.data = index.slice(platform, start_date, end_date)
+        
+        # Série ordenada por data de cada plataforma (fatias do índice, sem cópia)
+        platforms = index.platforms if platform in (None, 'all') else [platform]
+        self.series = {}
+        for name in platforms:
+            if name in index.ranges:
+                series = index.slice(name, start_date, end_date)
+                if len(series):
+                    self.series[name] = series
+        
+        # KPIs e breakdown de engajamento por plataforma (totais atualizáveis no modo ao vivo)
+        self.totals = KpiAccumulator.from_frame(self.data)
+        self.kpis = self.totals.kpis()
+        self.breakdown = self.totals.breakdown()
+
+class SessionViewStore:
+    """Guarda a última FilteredView de cada sessão (LRU limitado a max_sessions)
+    
+    Apenas um identificador da sessão e os parâmetros do filtro trafegam
+    pelo navegador; a fatia fica na memória do servidor. Se a view de uma
+    sessão não estiver disponível (filtros novos, sessão expulsa do LRU ou
+    atendida por outro worker), ela é calculada a partir dos parâmetros do
+    filtro pelo primeiro callback que precisar dela; os callbacks da mesma
+    interação que chegam ao mesmo tempo esperam por esse cálculo.
+    """
+    
+    def __init__(self, max_sessions=500):
+        self.max_sessions = max_sessions
+        self._views = OrderedDict()
+        self._building = {}
+        self._lock = threading.Lock()
+    
+    def _cached(self, session_id, filters):
+        view = self._views.get(session_id)
+        if view is not None and view.filters == filters:
+            self._views.move_to_end(session_id)
+            return view
+        return None
+    
+    def get(self, session_id, filters, factory):
+        """Retorna a view da sessão para os filtros dados, calculando-a se necessário"""
+        with self._lock:
+            view = self._cached(session_id, filters)
+            if view is not None:
+                return view
+            building = self._building.setdefault(session_id, threading.Lock())
+        
+        with building:
+            with self._lock:
+                view = self._cached(session_id, filters)
+            if view is None:
+                view = factory(**filters)
+                self.put(session_id, view)
+        
+        with self._lock:
+            self._building.pop(session_id, None)
+        return view
+    
+    def put(self, session_id, view):
+        """Armazena a view atual da sessão"""
+        with self._lock:
+            self._views[session_id] = view
+            self._views.move_to_end(session_id)
+            while len(self._views) > self.max_sessions:
+                self._views.popitem(last=False)
+    
+    def clear(self):
+        """Descarta todas as views (ex.: após atualização dos dados)"""
+        with self._lock:
+            self._views.clear()
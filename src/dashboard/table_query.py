@@ -0,0 +1,117 @@
+"""
+Paginação, ordenação e filtragem da tabela do dashboard no servidor
+"""
+
+import operator
+import pandas as pd
+import numpy as np
+
+# Comparações suportadas pelo filtro da tabela
+COMPARISONS = {
+    'ge': operator.ge, 'le': operator.le, 'lt': operator.lt,
+    'gt': operator.gt, 'ne': operator.ne, 'eq': operator.eq
+}
+
+# Operadores da sintaxe de filtro do DataTable (forma textual e simbólica)
+FILTER_OPERATORS = [
+    ['ge ', '>='],
+    ['le ', '<='],
+    ['lt ', '<'],
+    ['gt ', '>'],
+    ['ne ', '!='],
+    ['eq ', '='],
+    ['contains '],
+    ['datestartswith ']
+]
+
+def split_filter_part(filter_part):
+    """Converte um trecho '{coluna} op valor' em (coluna, operador, valor)"""
+    for operator_type in FILTER_OPERATORS:
+        for symbol in operator_type:
+            if symbol in filter_part:
+                name_part, value_part = filter_part.split(symbol, 1)
+                name = name_part[name_part.find('{') + 1:name_part.rfind('}')]
+                value_part = value_part.strip()
+                if not value_part:
+                    return None, None, None
+                
+                quote = value_part[0]
+                if quote == value_part[-1] and quote in ("'", '"', '`') and len(value_part) > 1:
+                    value = value_part[1:-1].replace('\\' + quote, quote)
+                else:
+                    try:
+                        value = float(value_part)
+                    except ValueError:
+                        value = value_part
+                return name, operator_type[0].strip(), value
+    return None, None, None
+
+def _filter_mask(column, operator_name, value):
+    """Máscara booleana de uma condição de filtro sobre uma coluna"""
+    if pd.api.types.is_datetime64_any_dtype(column):
+        if operator_name in ('contains', 'datestartswith'):
+            # Datas exibidas como dd/mm/aaaa; aceitar também o formato ISO ('2024' chega como número)
+            text = str(int(value)) if isinstance(value, float) and value.is_integer() else str(value)
+            formatted = [column.dt.strftime('%d/%m/%Y'), column.dt.strftime('%Y-%m-%d')]
+            if operator_name == 'contains':
+                # Trecho em qualquer posição: '03/2024' ou '2024-03' para um mês
+                return formatted[0].str.contains(text, regex=False) | formatted[1].str.contains(text, regex=False)
+            return formatted[0].str.startswith(text) | formatted[1].str.startswith(text)
+        value = pd.to_datetime(str(value), dayfirst=True, errors='coerce')
+        if pd.isna(value):
+            return np.zeros(len(column), dtype=bool)
+    elif operator_name in ('contains', 'datestartswith'):
+        return column.astype(str).str.contains(str(value), case=False, regex=False)
+    elif pd.api.types.is_numeric_dtype(column) and isinstance(value, str):
+        return np.zeros(len(column), dtype=bool)
+    elif not pd.api.types.is_numeric_dtype(column):
+        value = str(value)
+    
+    return COMPARISONS[operator_name](column, value)
+
+def apply_filter_query(df, filter_query):
+    """Aplica um filter_query do DataTable ('{a} > 1 && {b} contains x')"""
+    if not filter_query:
+        return df
+    
+    mask = np.ones(len(df), dtype=bool)
+    for filter_part in filter_query.split(' && '):
+        name, operator_name, value = split_filter_part(filter_part)
+        if name in df.columns and operator_name is not None:
+            mask &= np.asarray(_filter_mask(df[name], operator_name, value), dtype=bool)
+    return df[mask]
+
+def query_table(df, page_current=0, page_size=10, sort_by=None, filter_query=None):
+    """Retorna (linhas da página solicitada, total de linhas após o filtro)
+    
+    Sem ordenação a página é uma fatia direta das linhas; com ordenação por
+    uma única coluna são selecionadas apenas as primeiras linhas até o fim
+    da página (nlargest/nsmallest), sem ordenar a tabela inteira.
+    """
+    df = apply_filter_query(df, filter_query)
+    total = len(df)
+    page_current = page_current or 0
+    start = page_current * page_size
+    end = start + page_size
+    
+    sort_by = [sort for sort in (sort_by or []) if sort.get('column_id') in df.columns]
+    if not sort_by:
+        return df.iloc[start:end], total
+    
+    column = sort_by[0]['column_id']
+    partial = len(sort_by) == 1 and not df[column].hasnans and (
+        pd.api.types.is_numeric_dtype(df[column]) or pd.api.types.is_datetime64_any_dtype(df[column])
+    )
+    if partial:
+        if sort_by[0]['direction'] == 'desc':
+            top = df.nlargest(end, column, keep='first')
+        else:
+            top = df.nsmallest(end, column, keep='first')
+        return top.iloc[start:end], total
+    
+    ordered = df.sort_values(
+        [sort['column_id'] for sort in sort_by],
+        ascending=[sort['direction'] == 'asc' for sort in sort_by],
+        kind='stable'
+    )
+    return ordered.iloc[start:end], total
@@ -133,6 +133,39 @@ class SocialMediaDataGenerator:
         
         return pd.DataFrame(data)
     
+    def generate_post_data(self, platform_name, dates, posts_per_day=3):
+        """Gera dados de posts individuais com horário de publicação"""
+        platform_config = PLATFORMS[platform_name]
+        data = []
+        
+        base_engagement = random.randint(500, 3000)
+        
+        # Picos de engajamento no almoço e no início da noite
+        hour_factors = {hour: 1.0 for hour in range(6, 24)}
+        hour_factors.update({12: 1.3, 13: 1.25, 18: 1.3, 19: 1.45, 20: 1.5, 21: 1.35})
+        
+        for date in dates:
+            for hour in random.sample(sorted(hour_factors), posts_per_day):
+                timestamp = date + timedelta(hours=hour, minutes=random.randint(0, 59))
+                weekend_factor = 1.2 if date.weekday() >= 5 else 1.0
+                random_factor = random.uniform(0.7, 1.3)
+                
+                data.append({
+                    'timestamp': timestamp,
+                    'platform': platform_config['name'],
+                    'engagement': int(base_engagement * hour_factors[hour] * weekend_factor * random_factor)
+                })
+        
+        return pd.DataFrame(data)
+    
+    def generate_all_post_data(self):
+        """Gera os dados de posts de todas as plataformas"""
+        dates = self.generate_date_range()
+        return pd.concat([
+            self.generate_post_data('instagram', dates),
+            self.generate_post_data('facebook', dates)
+        ], ignore_index=True)
+    
     def generate_all_data(self):
         """Gera todos os dados necessários para o projeto"""
         print("Gerando dados de mídias sociais...")
@@ -171,5 +204,6 @@ if __name__ == "__main__":
     platform_data.to_csv('data/platform_metrics.csv', index=False)
     demographic_data.to_csv('data/demographic_data.csv', index=False)
     campaign_data.to_csv('data/campaign_data.csv', index=False)
+    generator.generate_all_post_data().to_csv('data/post_data.csv', index=False)
     
     print("\nDados salvos em arquivos CSV na pasta 'data/'")
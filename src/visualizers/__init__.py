@@ -3,6 +3,6 @@ Módulos de visualização de dados
 """
 
 from .visualizations import SocialMediaVisualizer
+from .render_cache import RenderCache
 
-__all__ = ['SocialMediaVisualizer']
-
+__all__ = ['SocialMediaVisualizer', 'RenderCache']
@@ -0,0 +1,73 @@
+"""
+Renderização de dispersões grandes como raster de densidade (histograma 2D)
+"""
+
+import base64
+from io import BytesIO
+import pandas as pd
+import numpy as np
+from matplotlib.colors import to_rgb
+from PIL import Image
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from config import VISUALIZATION_CONFIG
+
+def use_density(n_points):
+    """Indica se a dispersão deve ser desenhada como raster de densidade"""
+    return n_points > VISUALIZATION_CONFIG['density_threshold']
+
+def density_counts(df, x_column, y_column, group_column, bins=None):
+    """Conta os pontos de cada grupo em uma grade bins = (colunas, linhas)
+    
+    Todos os grupos são binados em uma única chamada de np.bincount sobre a
+    chave (grupo, linha, coluna). Retorna (grupos, contagens com forma
+    grupos × linhas × colunas, (x_min, x_max, y_min, y_max)); a linha 0 da
+    grade corresponde ao menor y.
+    """
+    width, height = bins or VISUALIZATION_CONFIG['density_bins']
+    x = df[x_column].to_numpy(dtype=np.float64)
+    y = df[y_column].to_numpy(dtype=np.float64)
+    codes, groups = pd.factorize(df[group_column])
+    valid = np.isfinite(x) & np.isfinite(y) & (codes >= 0)
+    x, y, codes = x[valid], y[valid], codes[valid]
+    
+    if len(x) == 0:
+        return list(groups), np.zeros((len(groups), height, width), dtype=np.int64), (0.0, 1.0, 0.0, 1.0)
+    
+    extent = (x.min(), x.max(), y.min(), y.max())
+    x_span = (extent[1] - extent[0]) or 1.0
+    y_span = (extent[3] - extent[2]) or 1.0
+    columns = np.minimum(((x - extent[0]) / x_span * width).astype(np.int64), width - 1)
+    rows = np.minimum(((y - extent[2]) / y_span * height).astype(np.int64), height - 1)
+    
+    keys = (codes * height + rows) * width + columns
+    counts = np.bincount(keys, minlength=len(groups) * height * width)
+    return list(groups), counts.reshape(len(groups), height, width), extent
+
+def density_image(counts, colors):
+    """Combina as contagens por grupo em uma imagem RGBA (uint8)
+    
+    A cor de cada pixel é a média das cores dos grupos ponderada pelas
+    contagens (um canal de cor por plataforma) e a opacidade cresce com o
+    logaritmo do total de pontos no pixel. A linha 0 da imagem é o topo.
+    """
+    palette = np.array([to_rgb(color) for color in colors])
+    total = counts.sum(axis=0).astype(np.float64)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rgb = np.einsum('ghw,gc->hwc', counts, palette) / total[..., None]
+    rgb = np.nan_to_num(rgb, nan=1.0)
+    
+    max_total = total.max()
+    alpha = np.log1p(total) / np.log1p(max_total) if max_total > 0 else total
+    alpha = np.where(total > 0, 0.25 + 0.75 * alpha, 0.0)
+    
+    image = np.concatenate([rgb, alpha[..., None]], axis=2)
+    return (np.flipud(image) * 255).round().astype(np.uint8)
+
+def image_data_uri(image):
+    """Codifica uma imagem RGBA como PNG em data URI (para imagens de layout do Plotly)"""
+    buffer = BytesIO()
+    Image.fromarray(image).save(buffer, format='PNG')
+    return 'data:image/png;base64,' + base64.b64encode(buffer.getvalue()).decode('ascii')
@@ -0,0 +1,78 @@
+"""
+Redução de pontos de séries temporais para gráficos (Largest-Triangle-Three-Buckets)
+"""
+
+import numpy as np
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from config import VISUALIZATION_CONFIG
+
+def _numeric_axis(x):
+    """Converte o eixo x (datas ou números) em float para o cálculo das áreas"""
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype('datetime64[ns]').astype(np.int64).astype(np.float64)
+    return x.astype(np.float64)
+
+def lttb_indices(x, y, n_out):
+    """Seleciona os índices de n_out pontos que preservam a forma da série
+    
+    O primeiro e o último ponto são mantidos; os demais são divididos em
+    n_out - 2 baldes e, em cada balde, é escolhido o ponto que forma o maior
+    triângulo com o ponto escolhido no balde anterior e a média do próximo.
+    A série deve estar ordenada por x.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    
+    x = _numeric_axis(x)
+    y = np.asarray(y, dtype=np.float64)
+    
+    # Limites dos baldes intermediários (o primeiro e o último ponto ficam fora)
+    bounds = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    
+    # Médias de cada balde via somas acumuladas (o último "balde" é o ponto final)
+    cum_x = np.concatenate(([0.0], np.cumsum(x)))
+    cum_y = np.concatenate(([0.0], np.cumsum(y)))
+    sizes = np.maximum(bounds[1:] - bounds[:-1], 1)
+    mean_x = np.append((cum_x[bounds[1:]] - cum_x[bounds[:-1]]) / sizes, x[-1])
+    mean_y = np.append((cum_y[bounds[1:]] - cum_y[bounds[:-1]]) / sizes, y[-1])
+    
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    previous = 0
+    for i in range(n_out - 2):
+        start, end = bounds[i], max(bounds[i + 1], bounds[i] + 1)
+        bucket_x = x[start:end]
+        bucket_y = y[start:end]
+        # Dobro da área do triângulo (ponto anterior, candidato, média do próximo balde)
+        areas = np.abs(
+            (x[previous] - mean_x[i + 1]) * (bucket_y - y[previous])
+            - (x[previous] - bucket_x) * (mean_y[i + 1] - y[previous])
+        )
+        previous = start + int(np.argmax(areas))
+        selected[i + 1] = previous
+    
+    return selected
+
+def downsample_frame(df, x_column, y_column, max_points=None):
+    """Reduz um DataFrame ordenado por x_column a no máximo max_points linhas
+    
+    Linhas com valor ausente em y_column são descartadas antes da seleção.
+    Retorna o próprio DataFrame quando ele já está dentro do limite.
+    """
+    max_points = max_points or VISUALIZATION_CONFIG['max_points_per_trace']
+    if len(df) <= max_points:
+        return df
+    
+    df = df[df[y_column].notna()]
+    indices = lttb_indices(df[x_column].to_numpy(), df[y_column].to_numpy(), max_points)
+    return df.iloc[indices]
+
+def line_mode(original_size, max_points=None):
+    """Modo do traço Plotly: marcadores só fazem sentido em séries curtas"""
+    max_points = max_points or VISUALIZATION_CONFIG['max_points_per_trace']
+    return 'lines+markers' if original_size <= max_points else 'lines'
@@ -0,0 +1,97 @@
+"""
+Cache de renderização de gráficos endereçado pelo conteúdo dos dados de entrada
+"""
+
+import hashlib
+import shutil
+import pandas as pd
+import numpy as np
+import matplotlib
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from config import RENDER_CACHE_CONFIG, VISUALIZATION_CONFIG, PLATFORMS
+
+def hash_inputs(*objects):
+    """Calcula um hash estável para DataFrames, Series, arrays e valores simples"""
+    hasher = hashlib.sha1()
+    for obj in objects:
+        if isinstance(obj, pd.DataFrame):
+            hasher.update(repr((list(obj.columns), [str(dtype) for dtype in obj.dtypes])).encode('utf-8'))
+            hasher.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+        elif isinstance(obj, pd.Series):
+            hasher.update(repr((obj.name, str(obj.dtype))).encode('utf-8'))
+            hasher.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+        elif isinstance(obj, np.ndarray):
+            hasher.update(repr((obj.dtype.str, obj.shape)).encode('utf-8'))
+            hasher.update(np.ascontiguousarray(obj).tobytes())
+        else:
+            hasher.update(repr(obj).encode('utf-8'))
+    return hasher.hexdigest()
+
+def render_settings():
+    """Configurações que alteram a aparência dos gráficos (entram na chave do cache)"""
+    return (
+        RENDER_CACHE_CONFIG['version'],
+        matplotlib.__version__,
+        sorted((key, repr(value)) for key, value in VISUALIZATION_CONFIG.items()),
+        sorted((name, platform['color']) for name, platform in PLATFORMS.items())
+    )
+
+class RenderCache:
+    """Armazena artefatos renderizados (PNG/HTML) indexados por hash
+    
+    A chave combina o nome do gráfico, o hash dos dados de entrada e as
+    configurações de estilo/DPI. Um artefato já existente é copiado para o
+    destino em vez de renderizado novamente. O diretório do cache é limitado
+    a max_bytes, removendo os artefatos usados há mais tempo (LRU pela data
+    de modificação, atualizada a cada uso).
+    """
+    
+    def __init__(self, cache_dir=None, max_bytes=None):
+        self.cache_dir = cache_dir or RENDER_CACHE_CONFIG['cache_dir']
+        self.max_bytes = max_bytes or RENDER_CACHE_CONFIG['max_bytes']
+        os.makedirs(self.cache_dir, exist_ok=True)
+    
+    def key(self, chart_name, *inputs, settings=None):
+        """Chave do artefato a partir do nome, dos dados de entrada e das configurações"""
+        return hash_inputs(chart_name, render_settings(), settings, *inputs)
+    
+    def _path(self, key, extension):
+        return os.path.join(self.cache_dir, f'{key}{extension}')
+    
+    def fetch(self, key, destination):
+        """Copia o artefato do cache para o destino; retorna False se não existir"""
+        cached_path = self._path(key, os.path.splitext(destination)[1])
+        try:
+            shutil.copyfile(cached_path, destination)
+            os.utime(cached_path)
+        except FileNotFoundError:
+            return False
+        return True
+    
+    def store(self, key, source):
+        """Adiciona um artefato recém-renderizado ao cache"""
+        cached_path = self._path(key, os.path.splitext(source)[1])
+        tmp_path = f'{cached_path}.{os.getpid()}.tmp'
+        shutil.copyfile(source, tmp_path)
+        os.replace(tmp_path, cached_path)
+        self.evict()
+    
+    def evict(self):
+        """Remove os artefatos menos usados até o cache caber em max_bytes"""
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file() and not entry.name.endswith('.tmp'):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
@@ -9,27 +9,123 @@ import seaborn as sns
 import plotly.graph_objects as go
 import plotly.express as px
 from plotly.subplots import make_subplots
+from plotly.offline import get_plotlyjs
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import matplotlib
 import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
-from config import VISUALIZATION_CONFIG, PLATFORMS
+from config import VISUALIZATION_CONFIG, PLATFORMS, RENDER_CACHE_CONFIG
+from src.analyzers.posting_time import PostingTimeMatrix
+from src.analyzers.aggregates import AggregateProvider
+from src.analyzers.correlation import CORRELATION_COLUMNS, build_correlation_accumulators, update_correlation_accumulators
+from src.visualizers.render_cache import RenderCache
+from src.visualizers.downsampling import downsample_frame, line_mode
+from src.visualizers.density import use_density, density_counts, density_image, image_data_uri
+from matplotlib.patches import Patch
 
 # Configurar matplotlib para português
 plt.rcParams['font.family'] = 'DejaVu Sans'
 plt.rcParams['figure.figsize'] = VISUALIZATION_CONFIG['figure_size']
 plt.rcParams['figure.dpi'] = VISUALIZATION_CONFIG['dpi']
 
+# Visualizador de cada processo de renderização (criado uma vez por worker)
+_worker_visualizer = None
+
+def _init_render_worker(platform_data, demographic_data, campaign_data, post_data):
+    """Inicializa um processo de renderização com backend Agg e dados próprios"""
+    global _worker_visualizer
+    matplotlib.use('Agg')
+    _worker_visualizer = SocialMediaVisualizer(platform_data, demographic_data, campaign_data, post_data)
+
+def _render_chart(method, path, dpi):
+    """Cria e salva um gráfico estático dentro de um processo de renderização"""
+    fig = getattr(_worker_visualizer, method)()
+    fig.savefig(path, dpi=dpi, bbox_inches='tight')
+    plt.close(fig)
+    return path
+
+def ensure_plotlyjs(directory, include_plotlyjs=None):
+    """Garante o plotly.min.js compartilhado na pasta (modo 'directory')"""
+    include_plotlyjs = include_plotlyjs if include_plotlyjs is not None else VISUALIZATION_CONFIG['plotlyjs']
+    bundle_path = os.path.join(directory or '.', 'plotly.min.js')
+    if include_plotlyjs == 'directory' and not os.path.exists(bundle_path):
+        with open(bundle_path, 'w', encoding='utf-8') as f:
+            f.write(get_plotlyjs())
+
+def scatter_trace_type(n_points):
+    """Usa traços WebGL (Scattergl) acima do limite de pontos configurado"""
+    return go.Scattergl if n_points > VISUALIZATION_CONFIG['webgl_threshold'] else go.Scatter
+
+def date_values(dates):
+    """Converte datas em milissegundos desde a época (float64)
+    
+    Arrays float64 são serializados pelo Plotly em base64 (typed arrays), bem
+    menores que as datas em texto ISO; o eixo correspondente deve ser do
+    tipo 'date'.
+    """
+    return pd.to_datetime(dates).to_numpy(dtype='datetime64[ms]').astype(np.int64).astype(np.float64)
+
 class SocialMediaVisualizer:
-    def __init__(self, platform_data, demographic_data, campaign_data):
+    # Gráficos estáticos salvos por save_all_visualizations (nome do arquivo -> método)
+    STATIC_CHARTS = {
+        'crescimento_seguidores': 'create_followers_growth_chart',
+        'comparacao_engajamento': 'create_engagement_comparison',
+        'analise_demografica': 'create_demographic_analysis',
+        'performance_campanhas': 'create_campaign_performance_chart',
+        'correlacao_metricas': 'create_heatmap_correlation'
+    }
+    
+    # Colunas lidas por cada gráfico (definem a chave no cache de renderização)
+    CHART_INPUTS = {
+        'crescimento_seguidores': {'platform_data': ['platform', 'date', 'followers']},
+        'comparacao_engajamento': {'platform_data': ['platform', 'engagement', 'reach']},
+        'analise_demografica': {'demographic_data': ['platform', 'age_group', 'gender', 'city', 'interest', 'engagement_rate']},
+        'performance_campanhas': {'campaign_data': ['platform', 'campaign_type', 'roi', 'cost', 'conversions']},
+        'correlacao_metricas': {'platform_data': ['platform', 'followers', 'impressions', 'reach', 'engagement',
+                                                  'likes', 'comments', 'shares']},
+        'horarios_postagem': {'post_data': ['timestamp', 'engagement']},
+        'dashboard_interativo': {
+            'platform_data': ['platform', 'date', 'followers', 'engagement', 'reach'],
+            'demographic_data': ['platform', 'age_group', 'city', 'engagement_rate'],
+            'campaign_data': ['platform', 'campaign_type', 'roi', 'cost', 'conversions']
+        }
+    }
+    
+    def __init__(self, platform_data, demographic_data, campaign_data, post_data=None, render_cache=None,
+                 aggregates=None):
         self.platform_data = platform_data
         self.demographic_data = demographic_data
         self.campaign_data = campaign_data
+        self.post_data = post_data
+        self.render_cache = render_cache
+        
+        # Agregações compartilhadas (a mesma instância pode ser usada por insights, relatório e dashboard)
+        self.aggregates = aggregates or AggregateProvider(platform_data, demographic_data, campaign_data)
+        self.aggregates.sync(platform_data=platform_data, demographic_data=demographic_data, campaign_data=campaign_data)
+        self.correlation_accumulators = None
         
         # Converter colunas de data
         self.platform_data['date'] = pd.to_datetime(self.platform_data['date'])
         self.campaign_data['date'] = pd.to_datetime(self.campaign_data['date'])
     
+    def get_correlation_accumulators(self):
+        """Acumuladores de covariância por plataforma (calculados uma única vez)"""
+        if self.correlation_accumulators is None:
+            self.correlation_accumulators = build_correlation_accumulators(self.platform_data, CORRELATION_COLUMNS)
+        return self.correlation_accumulators
+    
+    def append_platform_data(self, new_rows):
+        """Adiciona novas linhas de métricas, atualizando as correlações em O(novas linhas)"""
+        new_rows = new_rows.copy()
+        new_rows['date'] = pd.to_datetime(new_rows['date'])
+        self.platform_data = pd.concat([self.platform_data, new_rows], ignore_index=True)
+        self.aggregates.update_data(platform_data=self.platform_data)
+        if self.correlation_accumulators is not None:
+            update_correlation_accumulators(self.correlation_accumulators, new_rows, CORRELATION_COLUMNS)
+    
     def create_followers_growth_chart(self):
         """Cria gráfico de crescimento de seguidores"""
         fig, ax = plt.subplots(figsize=(12, 6))
@@ -37,10 +133,12 @@ class SocialMediaVisualizer:
         for platform in self.platform_data['platform'].unique():
             platform_data = self.platform_data[self.platform_data['platform'] == platform]
             platform_data = platform_data.sort_values('date')
+            marker = 'o' if line_mode(len(platform_data)) == 'lines+markers' else None
+            platform_data = downsample_frame(platform_data, 'date', 'followers')
             
             color = PLATFORMS[platform.lower()]['color']
             ax.plot(platform_data['date'], platform_data['followers'], 
-                   label=platform, color=color, linewidth=2, marker='o', markersize=4)
+                   label=platform, color=color, linewidth=2, marker=marker, markersize=4)
         
         ax.set_title('Crescimento de Seguidores por Plataforma', fontsize=16, fontweight='bold')
         ax.set_xlabel('Data', fontsize=12)
@@ -59,7 +157,8 @@ class SocialMediaVisualizer:
         fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
         
         # Gráfico 1: Engajamento total por plataforma
-        engagement_by_platform = self.platform_data.groupby('platform')['engagement'].sum()
+        platform_engagement = self.aggregates.get('platform_engagement')
+        engagement_by_platform = platform_engagement['engagement']
         colors = [PLATFORMS[platform.lower()]['color'] for platform in engagement_by_platform.index]
         
         bars1 = ax1.bar(engagement_by_platform.index, engagement_by_platform.values, color=colors)
@@ -73,13 +172,7 @@ class SocialMediaVisualizer:
                     f'{height:,.0f}', ha='center', va='bottom')
         
         # Gráfico 2: Taxa de engajamento média
-        platform_data_grouped = self.platform_data.groupby('platform').agg({
-            'engagement': 'sum',
-            'reach': 'sum'
-        })
-        platform_data_grouped['engagement_rate'] = (platform_data_grouped['engagement'] / platform_data_grouped['reach']) * 100
-        
-        bars2 = ax2.bar(platform_data_grouped.index, platform_data_grouped['engagement_rate'], color=colors)
+        bars2 = ax2.bar(platform_engagement.index, platform_engagement['engagement_rate'], color=colors)
         ax2.set_title('Taxa de Engajamento Média por Plataforma', fontsize=14, fontweight='bold')
         ax2.set_ylabel('Taxa de Engajamento (%)')
         
@@ -97,7 +190,7 @@ class SocialMediaVisualizer:
         fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(16, 12))
         
         # 1. Distribuição por faixa etária
-        age_dist = self.demographic_data.groupby(['platform', 'age_group']).size().unstack(fill_value=0)
+        age_dist = self.aggregates.get('age_by_platform')
         age_dist.plot(kind='bar', ax=ax1, color=['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFEAA7', '#DDA0DD'])
         ax1.set_title('Distribuição do Público por Faixa Etária', fontsize=14, fontweight='bold')
         ax1.set_xlabel('Plataforma')
@@ -106,7 +199,7 @@ class SocialMediaVisualizer:
         ax1.tick_params(axis='x', rotation=45)
         
         # 2. Distribuição por gênero
-        gender_dist = self.demographic_data.groupby(['platform', 'gender']).size().unstack(fill_value=0)
+        gender_dist = self.aggregates.get('gender_by_platform')
         gender_dist.plot(kind='bar', ax=ax2, color=['#FF6B6B', '#4ECDC4', '#45B7D1'])
         ax2.set_title('Distribuição do Público por Gênero', fontsize=14, fontweight='bold')
         ax2.set_xlabel('Plataforma')
@@ -115,13 +208,13 @@ class SocialMediaVisualizer:
         ax2.tick_params(axis='x', rotation=45)
         
         # 3. Top 10 cidades com maior engajamento
-        city_engagement = self.demographic_data.groupby('city')['engagement_rate'].mean().sort_values(ascending=True).tail(10)
+        city_engagement = self.aggregates.get('city_engagement').sort_values(ascending=True).tail(10)
         city_engagement.plot(kind='barh', ax=ax3, color='#96CEB4')
         ax3.set_title('Top 10 Cidades por Taxa de Engajamento', fontsize=14, fontweight='bold')
         ax3.set_xlabel('Taxa de Engajamento (%)')
         
         # 4. Top 10 interesses com maior engajamento
-        interest_engagement = self.demographic_data.groupby('interest')['engagement_rate'].mean().sort_values(ascending=True).tail(10)
+        interest_engagement = self.aggregates.get('interest_engagement').sort_values(ascending=True).tail(10)
         interest_engagement.plot(kind='barh', ax=ax4, color='#FFEAA7')
         ax4.set_title('Top 10 Interesses por Taxa de Engajamento', fontsize=14, fontweight='bold')
         ax4.set_xlabel('Taxa de Engajamento (%)')
@@ -134,7 +227,7 @@ class SocialMediaVisualizer:
         fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
         
         # Gráfico 1: ROI por tipo de campanha
-        campaign_roi = self.campaign_data.groupby(['platform', 'campaign_type'])['roi'].mean().unstack(fill_value=0)
+        campaign_roi = self.aggregates.get('roi_by_platform_and_type')
         campaign_roi.plot(kind='bar', ax=ax1, color=['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFEAA7'])
         ax1.set_title('ROI Médio por Tipo de Campanha', fontsize=14, fontweight='bold')
         ax1.set_xlabel('Plataforma')
@@ -143,21 +236,33 @@ class SocialMediaVisualizer:
         ax1.tick_params(axis='x', rotation=45)
         
         # Gráfico 2: Custo vs Conversões
-        for platform in self.campaign_data['platform'].unique():
-            platform_campaigns = self.campaign_data[self.campaign_data['platform'] == platform]
-            color = PLATFORMS[platform.lower()]['color']
-            ax2.scatter(platform_campaigns['cost'], platform_campaigns['conversions'], 
-                       label=platform, color=color, alpha=0.7, s=100)
+        if use_density(len(self.campaign_data)):
+            # Muitas campanhas: raster de densidade com uma cor por plataforma
+            platforms, colors, image, extent = self.campaign_density()
+            ax2.imshow(image, extent=extent, origin='upper', aspect='auto', interpolation='nearest')
+            ax2.legend(handles=[Patch(color=color, label=platform) for platform, color in zip(platforms, colors)])
+        else:
+            for platform in self.campaign_data['platform'].unique():
+                platform_campaigns = self.campaign_data[self.campaign_data['platform'] == platform]
+                color = PLATFORMS[platform.lower()]['color']
+                ax2.scatter(platform_campaigns['cost'], platform_campaigns['conversions'], 
+                           label=platform, color=color, alpha=0.7, s=100)
+            ax2.legend()
         
         ax2.set_title('Custo vs Conversões por Plataforma', fontsize=14, fontweight='bold')
         ax2.set_xlabel('Custo da Campanha (R$)')
         ax2.set_ylabel('Número de Conversões')
-        ax2.legend()
         ax2.grid(True, alpha=0.3)
         
         plt.tight_layout()
         return fig
     
+    def campaign_density(self):
+        """Raster de densidade de custo × conversões com um canal de cor por plataforma"""
+        platforms, counts, extent = density_counts(self.campaign_data, 'cost', 'conversions', 'platform')
+        colors = [PLATFORMS[platform.lower()]['color'] for platform in platforms]
+        return platforms, colors, density_image(counts, colors), extent
+    
     def create_interactive_dashboard(self):
         """Cria dashboard interativo com Plotly"""
         # Criar subplots
@@ -175,20 +280,20 @@ class SocialMediaVisualizer:
         for platform in self.platform_data['platform'].unique():
             platform_data = self.platform_data[self.platform_data['platform'] == platform]
             platform_data = platform_data.sort_values('date')
+            mode = line_mode(len(platform_data))
+            platform_data = downsample_frame(platform_data, 'date', 'followers')
             color = PLATFORMS[platform.lower()]['color']
             
+            scatter = scatter_trace_type(len(platform_data))
             fig.add_trace(
-                go.Scatter(x=platform_data['date'], y=platform_data['followers'],
-                          mode='lines+markers', name=platform, line=dict(color=color)),
+                scatter(x=date_values(platform_data['date']), y=platform_data['followers'].to_numpy(),
+                        mode=mode, name=platform, line=dict(color=color)),
                 row=1, col=1
             )
+        fig.update_xaxes(type='date', row=1, col=1)
         
         # 2. Taxa de engajamento
-        platform_engagement = self.platform_data.groupby('platform').agg({
-            'engagement': 'sum',
-            'reach': 'sum'
-        })
-        platform_engagement['engagement_rate'] = (platform_engagement['engagement'] / platform_engagement['reach']) * 100
+        platform_engagement = self.aggregates.get('platform_engagement')
         
         colors = [PLATFORMS[platform.lower()]['color'] for platform in platform_engagement.index]
         fig.add_trace(
@@ -198,7 +303,7 @@ class SocialMediaVisualizer:
         )
         
         # 3. Distribuição por idade
-        age_dist = self.demographic_data.groupby(['platform', 'age_group']).size().unstack(fill_value=0)
+        age_dist = self.aggregates.get('age_by_platform')
         for age_group in age_dist.columns:
             fig.add_trace(
                 go.Bar(x=age_dist.index, y=age_dist[age_group], name=age_group),
@@ -206,19 +311,39 @@ class SocialMediaVisualizer:
             )
         
         # 4. Performance de campanhas (Custo vs Conversões)
-        for platform in self.campaign_data['platform'].unique():
-            platform_campaigns = self.campaign_data[self.campaign_data['platform'] == platform]
-            color = PLATFORMS[platform.lower()]['color']
-            
-            fig.add_trace(
-                go.Scatter(x=platform_campaigns['cost'], y=platform_campaigns['conversions'],
-                          mode='markers', name=f'{platform} Campanhas', 
-                          marker=dict(color=color, size=10)),
+        if use_density(len(self.campaign_data)):
+            # Raster de densidade como imagem PNG: o tamanho depende dos pixels, não das linhas
+            platforms, colors, image, (x_min, x_max, y_min, y_max) = self.campaign_density()
+            fig.add_layout_image(
+                source=image_data_uri(image), x=x_min, y=y_max, sizex=x_max - x_min, sizey=y_max - y_min,
+                xanchor='left', yanchor='top', sizing='stretch', layer='below',
                 row=2, col=2
             )
+            fig.update_xaxes(range=[x_min, x_max], row=2, col=2)
+            fig.update_yaxes(range=[y_min, y_max], row=2, col=2)
+            
+            # Traços vazios apenas para a legenda
+            for platform, color in zip(platforms, colors):
+                fig.add_trace(
+                    go.Scatter(x=[None], y=[None], mode='markers', name=f'{platform} Campanhas',
+                              marker=dict(color=color, size=10, symbol='square')),
+                    row=2, col=2
+                )
+        else:
+            for platform in self.campaign_data['platform'].unique():
+                platform_campaigns = self.campaign_data[self.campaign_data['platform'] == platform]
+                color = PLATFORMS[platform.lower()]['color']
+                
+                scatter = scatter_trace_type(len(platform_campaigns))
+                fig.add_trace(
+                    scatter(x=platform_campaigns['cost'].to_numpy(), y=platform_campaigns['conversions'].to_numpy(),
+                            mode='markers', name=f'{platform} Campanhas', 
+                            marker=dict(color=color, size=10)),
+                    row=2, col=2
+                )
         
         # 5. Top cidades
-        city_engagement = self.demographic_data.groupby('city')['engagement_rate'].mean().sort_values(ascending=True).tail(10)
+        city_engagement = self.aggregates.get('city_engagement').sort_values(ascending=True).tail(10)
         fig.add_trace(
             go.Bar(y=city_engagement.index, x=city_engagement.values, orientation='h',
                   name='Top Cidades', marker_color='#96CEB4'),
@@ -226,7 +351,7 @@ class SocialMediaVisualizer:
         )
         
         # 6. ROI por tipo de campanha
-        campaign_roi = self.campaign_data.groupby('campaign_type')['roi'].mean().sort_values(ascending=True)
+        campaign_roi = self.aggregates.get('roi_by_campaign_type').sort_values(ascending=True)
         fig.add_trace(
             go.Bar(y=campaign_roi.index, x=campaign_roi.values, orientation='h',
                   name='ROI por Tipo', marker_color='#FFEAA7'),
@@ -243,47 +368,134 @@ class SocialMediaVisualizer:
         
         return fig
     
+    def save_interactive_dashboard(self, path, include_plotlyjs=None):
+        """Salva o dashboard interativo em HTML
+        
+        Com include_plotlyjs='directory' (padrão da configuração) o HTML
+        referencia um único plotly.min.js na mesma pasta, copiado apenas na
+        primeira exportação, em vez de embutir a biblioteca em cada arquivo.
+        """
+        include_plotlyjs = include_plotlyjs if include_plotlyjs is not None else VISUALIZATION_CONFIG['plotlyjs']
+        self.create_interactive_dashboard().write_html(path, include_plotlyjs=include_plotlyjs)
+        ensure_plotlyjs(os.path.dirname(path), include_plotlyjs)
+    
     def create_heatmap_correlation(self):
-        """Cria mapa de calor de correlação entre métricas"""
-        # Selecionar apenas colunas numéricas
-        numeric_columns = ['followers', 'impressions', 'reach', 'engagement', 'likes', 'comments', 'shares']
+        """Cria mapa de calor de correlação entre métricas (um painel por plataforma)"""
+        accumulators = self.get_correlation_accumulators()
         
-        # Calcular correlação por plataforma
-        fig, axes = plt.subplots(1, 2, figsize=(15, 6))
+        # Grade com até 3 painéis por linha
+        n_cols = max(min(len(accumulators), 3), 1)
+        n_rows = max(-(-len(accumulators) // n_cols), 1)
+        fig, axes = plt.subplots(n_rows, n_cols, figsize=(7.5 * n_cols, 6 * n_rows), squeeze=False)
+        axes = axes.ravel()
         
-        for i, platform in enumerate(self.platform_data['platform'].unique()):
-            platform_data = self.platform_data[self.platform_data['platform'] == platform]
-            correlation_matrix = platform_data[numeric_columns].corr()
-            
-            sns.heatmap(correlation_matrix, annot=True, cmap='coolwarm', center=0,
+        for i, (platform, accumulator) in enumerate(accumulators.items()):
+            sns.heatmap(accumulator.correlation(), annot=True, cmap='coolwarm', center=0,
                        square=True, ax=axes[i], cbar_kws={'shrink': 0.8})
             axes[i].set_title(f'Correlação de Métricas - {platform}', fontsize=14, fontweight='bold')
         
+        # Ocultar painéis sobrando na última linha
+        for ax in axes[len(accumulators):]:
+            ax.set_visible(False)
+        
         plt.tight_layout()
         return fig
     
-    def save_all_visualizations(self, output_dir='visualizations'):
-        """Salva todas as visualizações em arquivos"""
-        import os
+    def create_posting_time_heatmap(self):
+        """Cria mapa de calor do engajamento médio por dia da semana × hora"""
+        matrix = PostingTimeMatrix.from_frame(self.post_data).to_frame()
+        
+        fig, ax = plt.subplots(figsize=(16, 5))
+        sns.heatmap(matrix, cmap='YlOrRd', ax=ax, cbar_kws={'label': 'Engajamento Médio por Post'})
+        ax.set_title('Engajamento Médio por Dia da Semana e Horário', fontsize=16, fontweight='bold')
+        ax.set_xlabel('Hora do Dia', fontsize=12)
+        ax.set_ylabel('')
+        
+        plt.tight_layout()
+        return fig
+    
+    def chart_cache_key(self, name, cache):
+        """Chave de um gráfico no cache a partir das colunas que ele lê"""
+        inputs = []
+        for table, columns in self.CHART_INPUTS[name].items():
+            df = getattr(self, table)
+            inputs.append((table, df[[column for column in columns if column in df.columns]]))
+        return cache.key(name, *inputs)
+    
+    def save_all_visualizations(self, output_dir='visualizations', parallel=None, max_workers=None, use_cache=None):
+        """Salva todas as visualizações em arquivos
+        
+        Com parallel=True cada gráfico estático é renderizado em um processo
+        próprio (backend Agg, sem estado do pyplot compartilhado) enquanto o
+        dashboard interativo é escrito no processo principal. Com o cache de
+        renderização ativo, gráficos cujos dados de entrada e configurações
+        não mudaram são copiados do cache em vez de renderizados.
+        """
         os.makedirs(output_dir, exist_ok=True)
         
-        # Criar e salvar visualizações estáticas
-        charts = {
-            'crescimento_seguidores': self.create_followers_growth_chart(),
-            'comparacao_engajamento': self.create_engagement_comparison(),
-            'analise_demografica': self.create_demographic_analysis(),
-            'performance_campanhas': self.create_campaign_performance_chart(),
-            'correlacao_metricas': self.create_heatmap_correlation()
-        }
+        if parallel is None:
+            parallel = VISUALIZATION_CONFIG['parallel_rendering']
+        if use_cache is None:
+            use_cache = RENDER_CACHE_CONFIG['enabled']
+        dpi = VISUALIZATION_CONFIG['dpi']
+        
+        charts = dict(self.STATIC_CHARTS)
+        if self.post_data is not None:
+            charts['horarios_postagem'] = 'create_posting_time_heatmap'
+        
+        paths = {name: f'{output_dir}/{name}.png' for name in charts}
+        paths['dashboard_interativo'] = f'{output_dir}/dashboard_interativo.html'
+        
+        keys = {}
+        if use_cache:
+            if self.render_cache is None:
+                self.render_cache = RenderCache()
+            for name, path in paths.items():
+                key = self.chart_cache_key(name, self.render_cache)
+                if not self.render_cache.fetch(key, path):
+                    keys[name] = key
+            charts = {name: method for name, method in charts.items() if name in keys}
+            write_dashboard = 'dashboard_interativo' in keys
+        else:
+            write_dashboard = True
+        
+        if parallel and charts:
+            # 'spawn' garante processos limpos, sem herdar figuras abertas do pyplot
+            with ProcessPoolExecutor(
+                max_workers=max_workers or VISUALIZATION_CONFIG['render_workers'] or min(len(charts), os.cpu_count() or 1),
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_render_worker,
+                initargs=(self.platform_data, self.demographic_data, self.campaign_data, self.post_data)
+            ) as executor:
+                futures = [executor.submit(_render_chart, method, paths[name], dpi)
+                           for name, method in charts.items()]
+                
+                # Salvar dashboard interativo enquanto os gráficos são renderizados
+                if write_dashboard:
+                    self.save_interactive_dashboard(paths['dashboard_interativo'])
+                
+                for future in futures:
+                    future.result()
+        else:
+            # Criar e salvar visualizações estáticas
+            for name, method in charts.items():
+                fig = getattr(self, method)()
+                fig.savefig(paths[name], dpi=dpi, bbox_inches='tight')
+                plt.close(fig)
+            
+            # Salvar dashboard interativo
+            if write_dashboard:
+                self.save_interactive_dashboard(paths['dashboard_interativo'])
         
-        for name, fig in charts.items():
-            fig.savefig(f'{output_dir}/{name}.png', dpi=300, bbox_inches='tight')
-            plt.close(fig)
+        # HTML reaproveitado do cache também precisa do plotly.min.js compartilhado
+        ensure_plotlyjs(output_dir)
         
-        # Salvar dashboard interativo
-        interactive_dashboard = self.create_interactive_dashboard()
-        interactive_dashboard.write_html(f'{output_dir}/dashboard_interativo.html')
+        # Guardar no cache os artefatos recém-renderizados
+        for name, key in keys.items():
+            self.render_cache.store(key, paths[name])
         
+        if use_cache:
+            print(f"Gráficos reaproveitados do cache: {len(paths) - len(keys)}/{len(paths)}")
         print(f"Visualizações salvas na pasta '{output_dir}/'")
 
 if __name__ == "__main__":
@@ -291,9 +503,10 @@ if __name__ == "__main__":
     platform_data = pd.read_csv('data/platform_metrics.csv')
     demographic_data = pd.read_csv('data/demographic_data.csv')
     campaign_data = pd.read_csv('data/campaign_data.csv')
+    post_data = pd.read_csv('data/post_data.csv', parse_dates=['timestamp']) if os.path.exists('data/post_data.csv') else None
     
     # Criar visualizador
-    visualizer = SocialMediaVisualizer(platform_data, demographic_data, campaign_data)
+    visualizer = SocialMediaVisualizer(platform_data, demographic_data, campaign_data, post_data)
     
     # Salvar todas as visualizações
     visualizer.save_all_visualizations()
@@ -0,0 +1,84 @@
+"""
+Testes do modo de filtragem no navegador: mesmo resultado que o servidor
+"""
+
+import subprocess
+import shutil
+import json
+import pandas as pd
+import pytest
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.dashboard.dashboard import SocialMediaDashboard
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+CLIENTSIDE_JS = os.path.join(ROOT, 'src', 'dashboard', 'assets', 'clientside.js')
+
+# Carrega assets/clientside.js em um 'window' mínimo e chama os callbacks com a entrada do stdin
+NODE_RUNNER = """
+const fs = require('fs');
+global.window = {dash_clientside: {no_update: null}};
+eval(fs.readFileSync(process.argv[1], 'utf8'));
+const input = JSON.parse(fs.readFileSync(0, 'utf8'));
+const callbacks = window.dash_clientside.dashboard;
+const filters = callbacks.filter_state(input.platform, input.start_date, input.end_date);
+process.stdout.write(JSON.stringify({
+    kpis: callbacks.kpi_cards(filters, input.client_data),
+    breakdown: callbacks.engagement_breakdown(filters, input.client_data).data,
+    table: callbacks.data_table(filters, input.client_data)
+}));
+"""
+
+FILTERS = [
+    ('all', '2024-02-01', '2024-05-31'),
+    ('all', None, None),
+    ('Facebook', '2024-03-15', '2024-03-20')
+]
+
+def _load_data():
+    return [pd.read_csv(os.path.join(ROOT, 'data', filename))
+            for filename in ('platform_metrics.csv', 'demographic_data.csv', 'campaign_data.csv')]
+
+def _callback(dashboard, output):
+    """Função original do callback do servidor que tem a saída 'id.prop'"""
+    for key, value in dashboard.app.callback_map.items():
+        if output in key:
+            return value['callback'].__wrapped__
+    raise KeyError(output)
+
+def _run_client(dashboard, platform, start_date, end_date):
+    payload = {'platform': platform, 'start_date': start_date, 'end_date': end_date,
+               'client_data': dashboard.client_data}
+    output = subprocess.run(['node', '-e', NODE_RUNNER, CLIENTSIDE_JS], input=json.dumps(payload),
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output)
+
+def _run_server(dashboard, platform, start_date, end_date):
+    filters = _callback(dashboard, 'filter-state.data')(platform, start_date, end_date, 'teste')
+    kpis = _callback(dashboard, 'total-followers.children')(filters, 'teste')
+    breakdown = _callback(dashboard, 'engagement-breakdown.figure')(filters, 'teste')
+    table, _, _ = _callback(dashboard, 'data-table.page_count')(filters, 0, 100_000, [], '', 'teste')
+    # Mesma serialização que segue para o navegador
+    return json.loads(json.dumps({
+        'kpis': kpis,
+        'breakdown': [{'x': list(trace.x), 'y': list(trace.y), 'name': trace.name} for trace in breakdown.data],
+        'table': table
+    }, default=lambda value: value.item()))
+
+@pytest.fixture(scope='module')
+def dashboards():
+    server = SocialMediaDashboard(*_load_data(), filter_mode='server')
+    client = SocialMediaDashboard(*_load_data(), filter_mode='client')
+    return server, client
+
+@pytest.mark.skipif(shutil.which('node') is None, reason='node não instalado')
+@pytest.mark.parametrize('platform,start_date,end_date', FILTERS)
+def test_client_matches_server(dashboards, platform, start_date, end_date):
+    server, client = dashboards
+    expected = _run_server(server, platform, start_date, end_date)
+    result = _run_client(client, platform, start_date, end_date)
+
+    assert result['kpis'] == expected['kpis']
+    assert [{key: trace[key] for key in ('x', 'y', 'name')} for trace in result['breakdown']] == expected['breakdown']
+    assert result['table'] == expected['table']
@@ -0,0 +1,70 @@
+"""
+Testes do cache incremental de insights
+"""
+
+import pandas as pd
+import pickle
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from config import INSIGHTS_CONFIG
+from src.analyzers.insight_cache import InsightCache
+from src.analyzers.insights_generator import InsightsGenerator
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+
+def _load_data():
+    return {
+        'platform_data': pd.read_csv(os.path.join(ROOT, 'data', 'platform_metrics.csv')),
+        'demographic_data': pd.read_csv(os.path.join(ROOT, 'data', 'demographic_data.csv')),
+        'campaign_data': pd.read_csv(os.path.join(ROOT, 'data', 'campaign_data.csv')),
+        'post_data': pd.read_csv(os.path.join(ROOT, 'data', 'post_data.csv'), parse_dates=['timestamp'])
+    }
+
+def test_cache_is_picklable_after_generation():
+    cache = InsightCache()
+    InsightsGenerator(**_load_data(), cache=cache).generate_all_insights(parallel=False)
+    restored = pickle.loads(pickle.dumps(cache))
+    assert restored._fingerprints == cache._fingerprints
+
+def test_process_executor_with_cache(monkeypatch):
+    monkeypatch.setitem(INSIGHTS_CONFIG, 'executor', 'process')
+    expected = InsightsGenerator(**_load_data()).generate_all_insights(parallel=False)
+
+    generator = InsightsGenerator(**_load_data(), cache=InsightCache())
+    assert generator.generate_all_insights(parallel=True, max_workers=2) == expected
+
+    # Segunda execução: tabelas inalteradas, tudo vem do cache
+    assert generator.generate_all_insights(parallel=True, max_workers=2) == expected
+    assert generator.cache_report['recomputed'] == []
+
+def test_old_partition_change_keeps_recent_family():
+    generator = InsightsGenerator(**_load_data(), cache=InsightCache())
+    generator.generate_all_insights()
+
+    # Correção em um mês antigo: só as famílias que leem a tabela inteira são recalculadas
+    platform_data = generator.platform_data.copy()
+    platform_data.loc[platform_data['date'] == '2024-03-10', 'engagement'] += 500
+    generator.platform_data = platform_data
+    generator.generate_all_insights()
+    assert generator.cache_report['changed_partitions'] == {'platform_data': ['2024-03']}
+    assert 'recent' in generator.cache_report['reused']
+    assert {'performance', 'trend', 'content', 'rules'} <= set(generator.cache_report['recomputed'])
+    assert {'demographic', 'campaign', 'audience'} <= set(generator.cache_report['reused'])
+
+    # Dia novo no último mês: a família do período recente também é recalculada
+    platform_data = platform_data.copy()
+    platform_data.loc[platform_data['date'] == '2024-12-31', 'engagement'] += 500
+    generator.platform_data = platform_data
+    generator.generate_all_insights()
+    assert 'recent' in generator.cache_report['recomputed']
+
+def test_in_place_edit_is_detected():
+    generator = InsightsGenerator(**_load_data(), cache=InsightCache())
+    generator.generate_all_insights()
+
+    # Mesmo objeto e mesma versão: o checksum barato detecta a alteração
+    generator.platform_data.loc[generator.platform_data['date'] >= '2024-12-01', 'engagement'] //= 2
+    insights = generator.generate_all_insights()
+    assert generator.cache_report['changed_partitions'] == {'platform_data': ['2024-12']}
+    assert insights == InsightsGenerator(**{**_load_data(), 'platform_data': generator.platform_data.copy()}).generate_all_insights()
@@ -0,0 +1,40 @@
+"""
+Testes da matriz de horários de postagem
+"""
+
+import pandas as pd
+import numpy as np
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.analyzers.posting_time import PostingTimeMatrix, build_posting_matrices
+
+def _posts():
+    return pd.DataFrame({
+        'platform': ['Instagram', 'Instagram', 'Facebook', 'Facebook', 'Instagram'],
+        'timestamp': pd.to_datetime(['2024-10-07 09:15', None, '2024-10-08 18:40', '2024-10-07 09:50', '2024-10-13 23:05']),
+        'engagement': [100.0, 5000.0, 40.0, np.nan, 70.0]
+    })
+
+def test_nat_rows_are_skipped():
+    posts = _posts()
+    matrix = PostingTimeMatrix.from_frame(posts)
+
+    # Mesmo resultado do groupby, que descarta datas ausentes e engajamento vazio
+    expected = posts.groupby([posts['timestamp'].dt.dayofweek, posts['timestamp'].dt.hour])['engagement'].mean().dropna()
+    assert matrix.counts.sum() == len(expected)
+    means = matrix.mean_matrix()
+    for (day, hour), value in expected.items():
+        assert means[int(day), int(hour)] == value
+    assert matrix.best_slot() == ('Segunda', 9, 100.0)
+
+def test_unparsable_dates_are_skipped():
+    matrix = PostingTimeMatrix().update(pd.Series(['2024-10-07 09:15', 'sem data']), [10.0, 20.0])
+    assert matrix.counts.sum() == 1
+    assert matrix.best_hour() == (9, 10.0)
+
+def test_build_posting_matrices_with_nat():
+    matrices = build_posting_matrices(_posts())
+    assert matrices['all'].counts.sum() == 3
+    assert matrices['Instagram'].counts.sum() == 2
+    assert matrices['Facebook'].counts.sum() == 1